@@ -1,7 +1,5 @@
 """Budget app to track expenses and income."""
-import logging
 import os
-import time
 
 from kivymd.app import MDApp
 from kivymd.uix.bottomnavigation import MDBottomNavigation
@@ -12,23 +10,24 @@ from core.data_manager import DataManager
 from core.overview_panel import OverviewPage
 from core.settings_panel import SettingsPage
 from core.transactions_panel import TransactionPage
+from core.utils.lazy_tab import prewarm
+from core.utils.tracing import span, traced
 
 DATA_PATH = os.path.abspath("./data/")
 
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-
 
 class MyBudgetApp(MDApp):
     """Creates an app to track expenses and income."""
 
+    @traced
     def build(self):
-        logger.info("App: %s:  build", time.time())
         self.theme_cls.theme_style = "Dark"
         self.theme_cls.primary_palette = "Orange"
         self.theme_cls.material_style = "M2"
 
-        self.data_manager = DataManager(data_folder=DATA_PATH)  # pylint: disable=W0201
+        self.data_manager = DataManager(  # pylint: disable=W0201
+            data_folder=DATA_PATH, write_behind=True, window_months=12
+        )
 
         self.data_manager.initialize_data()
 
@@ -47,25 +46,37 @@ class MyBudgetApp(MDApp):
 
         return self.build_main_screen()
 
+    @traced
+    def on_stop(self):
+        """Write the pending changes before the app exits."""
+        self.data_manager.close()
+
+    @traced
     def build_main_screen(self):
         """Function to create the main screen of the app.
 
+        Only the Dashboard is built before the first frame, the other pages are
+        built when first shown or once the app is idle.
+
         Returns:
             MDScreen: screen with a bottom navbar and multiple pages.
         """
-        logger.info("App: %s:  build_main_screen", time.time())
-        navbar = MDBottomNavigation(
-            self.overview_page.build_page(),
+        lazy_pages = [
             self.account_page.build_page(),
             self.transaction_page.build_page(),
             self.settings_page.build_page(),
+        ]
+        navbar = MDBottomNavigation(
+            self.overview_page.build_page(),
+            *lazy_pages,
             selected_color_background="orange",
             text_color_active="lightgrey",
         )
+        prewarm(lazy_pages)
 
         return MDScreen(navbar)
 
 
 if __name__ == "__main__":
-    logger.info("App: %s:  Start app", time.time())
-    MyBudgetApp().run()
+    with span("App.run"):
+        MyBudgetApp().run()
@@ -1,8 +1,6 @@
 """Module to define the account page to insert in the bottom navbar of the app."""
-import logging
-import time
 
-from kivymd.uix.bottomnavigation import MDBottomNavigationItem
+from kivy.clock import Clock
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.button import MDFloatingActionButton
 from kivymd.uix.label import MDLabel
@@ -17,8 +15,8 @@ from kivymd.uix.textfield import MDTextField
 
 from .data_manager import DataManager
 from .utils.dialogbox import DialogBuilder
-
-logger = logging.getLogger(__name__)
+from .utils.lazy_tab import LazyNavigationItem
+from .utils.tracing import traced
 
 
 class AccountPage:
@@ -27,23 +25,41 @@ class AccountPage:
     and any functionality to add and remove accounts.
     """
 
+    @traced
     def __init__(self, data_manager: DataManager):
-        logger.info("AccountPage: %s:  __init__", time.time())
         self.data_manager = data_manager
         self.accounts_list = MDList()
         self.accounts = self.data_manager.accounts
+        self.account_widgets = {}
         self.base = MDBoxLayout()
         self.save_dialog = None
         self.delete_dialog = None
+        self.data_manager.add_listener(self.on_transactions_changed)
 
+    @traced
     def build_page(self):
-        """Builds a page using a bottom navbar item and
-        calls a function to generate the content of the page.
+        """Builds a page using a bottom navbar item,
+        its content is generated when the page is first shown.
+
+        Returns:
+            LazyNavigationItem: Bottom navbar item.
+        """
+        return LazyNavigationItem(
+            self.build_content,
+            name="accounts",
+            text="Accounts",
+            icon="bank",
+            badge_icon="numeric-3",
+        )
+
+    @traced
+    def build_content(self):
+        """Generates the content of the page: the accounts list and a button
+        to add an account.
 
         Returns:
-            MDBottomNavigationItem: Bottom navbar item.
+            MDBoxLayout: page content.
         """
-        logger.info("AccountPage: %s:  build_page", time.time())
         self.base.add_widget(self.generate_account_list())
         self.base.add_widget(
             MDFloatingActionButton(
@@ -52,14 +68,9 @@ class AccountPage:
                 on_release=self.get_dialog_text_input,
             )
         )
-        return MDBottomNavigationItem(
-            self.base,
-            name="accounts",
-            text="Accounts",
-            icon="bank",
-            badge_icon="numeric-3",
-        )
+        return self.base
 
+    @traced
     def single_account_widget(self, account, description):
         """Generate a single widget to hold account name and balance.
 
@@ -70,8 +81,7 @@ class AccountPage:
         Returns:
             OneLineAvatarIconListItem: widget with icon, description and delete button.
         """
-        logger.info("AccountPage: %s:  single_account_widget", time.time())
-        return OneLineAvatarIconListItem(
+        self.account_widgets[account] = OneLineAvatarIconListItem(
             IconLeftWidget(icon="bank"),
             IconRightWidget(
                 icon="delete",
@@ -83,66 +93,98 @@ class AccountPage:
             text=description,
             id=account,
         )
+        return self.account_widgets[account]
+
+    def account_description(self, account):
+        """Text of an account widget.
 
+        Args:
+            account (str): account name
+
+        Returns:
+            str: account name and balance.
+        """
+        balance = self.data_manager.get_account_balance(account=account)
+        return f"{account} | Balance: {balance}$"
+
+    @traced
+    def on_transactions_changed(self, operation, transactions):  # pylint: disable=W0613
+        """Refresh the balance of the accounts touched by added/removed transactions.
+
+        Args:
+            operation (str): "add" or "remove".
+            transactions (list): list of transaction dicts.
+        """
+        accounts = {transaction["account"] for transaction in transactions}
+        # widgets must be updated from the main thread
+        Clock.schedule_once(lambda dt: self.refresh_balances(accounts))
+
+    @traced
+    def refresh_balances(self, accounts):
+        """Update the text of some account widgets with the current balances.
+
+        Args:
+            accounts (set): account names.
+        """
+        for account in accounts:
+            if account in self.account_widgets:
+                self.account_widgets[account].text = self.account_description(account)
+
+    @traced
     def generate_account_list(self):
         """Generate a list of widgets to hold each account name and balance.
 
         Returns:
             MDScrollView: list widget with all account names and balances.
         """
-        logger.info("AccountPage: %s:  generate_account_list", time.time())
         for account in self.accounts:
-            description = f"{account} |\
-                 Balance: {self.data_manager.get_account_balance(account=account)}$"
-
             self.accounts_list.add_widget(
-                self.single_account_widget(account=account, description=description)
+                self.single_account_widget(
+                    account=account, description=self.account_description(account)
+                )
             )
 
         return MDScrollView(self.accounts_list)
 
+    @traced
     def add_new_account(self, account_name):
         """Add new account element to the list of accounts.
 
         Args:
             account_name (str): new account name.
         """
-        logger.info("AccountPage: %s:  add_new_account", time.time())
         account_name = account_name.text
         # add new account to data manager
         self.data_manager.add_account(account=account_name)
-        # define string to hold account name and balance
-        description = f"{account_name} |\
-             Balance: {self.data_manager.get_account_balance(account=account_name)}$"
         # add account to list
         self.accounts_list.add_widget(
-            self.single_account_widget(account=account_name, description=description)
+            self.single_account_widget(
+                account=account_name,
+                description=self.account_description(account_name),
+            )
         )
         # dismiss input dialog
         self.save_dialog.dismiss()
 
+    @traced
     def delete_account(self, account_label):
         """Delete account element from the list of accounts.
 
         Args:
             input_list (list): list of two elements: account name and description.
         """
-        logger.info("AccountPage: %s:  delete_account", time.time())
         account = account_label.text
         # description = input_list[1]
-        # Remove the corresponding widget from the layout
-        widget_to_remove = next(
-            widget for widget in self.accounts_list.children if widget.id == account
-        )
-        self.accounts_list.remove_widget(widget_to_remove)
         self.data_manager.remove_account(account=account)
+        # Remove the corresponding widget from the layout
+        self.accounts_list.remove_widget(self.account_widgets.pop(account))
 
         # dismiss input dialog
         self.delete_dialog.dismiss()
 
+    @traced
     def get_dialog_text_input(self, instance):  # pylint: disable=W0613
         """Opens Pop-up box with a text field to insert new account name."""
-        logger.info("AccountPage: %s:  get_dialog_text_input", time.time())
         if not self.save_dialog:
             # create text input
             text_input = MDTextField(hint_text="Enter a new account")
@@ -155,9 +197,9 @@ class AccountPage:
 
         self.save_dialog.open()
 
+    @traced
     def get_confirmation_dialog(self, item):
         """Opens Pop-up box with a text field to delete an account."""
-        logger.info("AccountPage: %s:  get_confirmation_dialog", time.time())
         if not self.delete_dialog:
             # create text input
             display_text = MDLabel(text=item[0])
@@ -4,6 +4,10 @@ Data manager module
 data files:
     - main data -> csv file with all transactions
     - additional info -> json file with accounts names, categories and subcategories.
+    - (optional) binary snapshot of the csv file -> data.arrow, loaded when newer.
+    - history folder -> deltas to go back to the last versions of the csv/json files.
+    or, with storage="sqlite":
+    - data.db -> sqlite database with transactions and metadata tables.
 
 operations:
     - create data files if not present
@@ -12,107 +16,497 @@ operations:
     - export data files
     - load only the necessary data statistics
 
-"""
-
-import json
-import logging
-import os
-import time
-
-import pandas as pd
-
-from .utils.dummy_data import EXAMPLE_DATA, EXAMPLE_METADATA
-from .utils.validator import is_used, validate_input, validate_transaction
+transactions are kept in memory in a columnar store (one numpy array per field),
+the panels access them through a list-like view of dicts (DataManager.transactions).
 
-DATA_CSV = "data.csv"
-METADATA_JSON = "metadata.json"
+with window_months=N only the transactions of the last N months are loaded on startup,
+the older ones are loaded on demand (see ensure_loaded); balances and usage counters
+always cover all the transactions.
 
-logger = logging.getLogger(__name__)
+with write_behind=True changes are not written right away: they are queued and
+written by a background thread after a quiet period (or enough changes), by an
+explicit flush() and on close().
 
+DataManager.query finds transactions by date range, fields, amount and text through
+a date index, postings lists and an inverted index of the words, built on first use.
 
-class DataManager:
+"""
+# pylint: disable=C0302
+
+import datetime
+import threading
+from collections import deque
+
+from .utils.csv_storage import (  # pylint: disable=W0611
+    DATA_CSV,
+    DATA_JOURNAL,
+    JOURNAL_SIZE_LIMIT,
+    METADATA_JSON,
+    CsvStorage,
+)
+from .utils.cube import AggregateCube
+from .utils.dates import normalize_date, to_day
+from .utils.dummy_data import EXAMPLE_DATA, EXAMPLE_METADATA
+from .utils.fenwick import FenwickIndex
+from .utils.history import HISTORY_SIZE
+from .utils.partitioned_storage import PartitionedStorage
+from .utils.query_index import QueryIndex
+from .utils.scheduler import FLUSH_DELAY, FLUSH_OPERATIONS, WriteBehindScheduler
+from .utils.sqlite_storage import DATA_DB, SqliteStorage  # pylint: disable=W0611
+from .utils.text_index import TextIndex
+from .utils.tracing import traced
+from .utils.transaction_store import (
+    ID_FIELD,
+    METADATA_FIELDS,
+    TRANSACTION_FIELDS,
+    TransactionList,
+    TransactionView,
+    month_key,
+    signed_amount,
+)
+from .utils.validator import validate_input, validate_transaction
+
+STORAGES = {"csv", "sqlite", "partitioned"}
+EXPORT_CHUNK_SIZE = 10000
+# months of older transactions loaded at once when a list reaches its end
+OLDER_MONTHS = 3
+# transaction fields referencing the metadata
+USAGE_KEYS = METADATA_FIELDS
+# fields with day trees of the amounts (balance at a date, spend in a date range)
+FENWICK_FIELDS = ("account", "category")
+
+
+class DataManager:  # pylint: disable=R0902,R0904
     """Data manager to handle the data loading, saving and updating."""
 
-    def __init__(self, data_folder: str = "../data"):
-        logger.info("DataManager: %s:  Init", time.time())
+    @traced
+    def __init__(  # pylint: disable=R0913
+        self,
+        data_folder: str = "../data",
+        storage: str = "csv",
+        journal_size_limit=JOURNAL_SIZE_LIMIT,
+        snapshot=False,
+        write_behind=False,
+        flush_delay=FLUSH_DELAY,
+        flush_operations=FLUSH_OPERATIONS,
+        history_size=HISTORY_SIZE,
+        window_months=None,
+    ):
         # TODO check if it's a folder path # pylint: disable=W0511
+        if storage not in STORAGES:
+            raise ValueError(
+                "Mode Error: Storage can only be 'csv', 'sqlite' or 'partitioned'!"
+            )
         self.data_folder = data_folder
+        self.window_months = window_months
+        if storage == "sqlite":
+            self.storage = SqliteStorage(data_folder)
+        elif storage == "partitioned":
+            self.storage = PartitionedStorage(data_folder)
+        else:
+            self.storage = CsvStorage(
+                data_folder, journal_size_limit, snapshot, history_size
+            )
+        self._lock = threading.RLock()
         self.balances = None
+        self.usage = None
         self.accounts = None
         self.categories = None
         self.sub_categories = None
+        # hashed copies of the metadata lists, for O(1) validation
+        self.metadata_sets = None
+        self.store = None
+        self._cube = None  # built on first use
+        self._fenwick = None  # built on first use
+        self._query_index = None  # built on first use
+        self._text_index = None  # built on first use
         self.transactions = None
         self.metadata = None
-
+        self.listeners = []
+        # changes waiting to be written (write-behind mode only)
+        self._pending = deque()
+        self._metadata_dirty = False
+        self.scheduler = None
+        if write_behind:
+            self.scheduler = WriteBehindScheduler(
+                self.flush, delay=flush_delay, max_operations=flush_operations
+            )
+
+    @traced
     def initialize_data(self):
         """Initialize all data, by either loading it or generating a dummy example."""
-        logger.info("DataManager: %s:  Init data", time.time())
         if self.is_empty_data_folder():
-            self.create_data_file()
+            legacy_storage = CsvStorage(self.data_folder)
+            if (
+                not isinstance(self.storage, CsvStorage)
+                and not legacy_storage.is_empty()
+            ):
+                # one-shot migration from the csv/json files
+                self.storage.migrate(legacy_storage)
+            else:
+                self.create_data_file()
 
         self.load_metadata()
         self.load_transactions()
         # if no data is found the files are populated with some example data
-        # TODO: for now all data is loaded  # pylint: disable=W0511
-        # if performance becomes a problem explore other solutions
         self.accounts = self.metadata["accounts"]
         self.categories = self.metadata["categories"]
         self.sub_categories = self.metadata["subcategories"]
+        self.metadata_sets = {
+            "account": set(self.accounts),
+            "category": set(self.categories),
+            "subcategory": set(self.sub_categories),
+        }
 
+    @traced
     def is_empty_data_folder(self):
         """Utility function that checks if the data folder is empty.
-        logger.info("DataManager: %s:  is_empty_data_folder", time.time())
 
         Returns:
             bool: checks if the data folder is empty.
         """
-        for file_name in os.listdir(self.data_folder):
-            # TODO manage case in which only one of the two files is present # pylint: disable=W0511
-            if file_name in {DATA_CSV, METADATA_JSON}:
-                return False
-        return True
+        return self.storage.is_empty()
 
+    @traced
     def create_data_file(self):
         """Utility function that creates dummy data files."""
-        logger.info("DataManager: %s:  create_data_file", time.time())
-        csv_file_path = os.path.join(self.data_folder, DATA_CSV)
-        json_file_path = os.path.join(self.data_folder, METADATA_JSON)
+        self.storage.create(transactions=EXAMPLE_DATA, metadata=EXAMPLE_METADATA)
 
-        # Convert the list of dictionaries to a DataFrame
-        df = pd.DataFrame(EXAMPLE_DATA)
+    @traced
+    def load_transactions(self):
+        """Load transactins from the storage."""
+        since = None
+        if self.window_months is not None:
+            since = window_start(datetime.date.today(), self.window_months)
+        with self._lock:
+            self.store = self.storage.load_transactions(since=since)
+            self.transactions = TransactionList(self.store)
+            self._cube = None
+            self._fenwick = None
+            self._query_index = None
+            self._text_index = None
+            # all balances and usage counters in one pass (on top of the precomputed
+            # ones of the months not loaded), then kept up to date on add/remove
+            opening = self.storage.opening()
+            self.balances = _merge_counts(
+                opening["balances"], self.store.sum_by("account")
+            )
+            self.usage = {
+                key: _merge_counts(opening["usage"][key], self.store.count_by(key))
+                for key in USAGE_KEYS
+            }
+
+    @traced
+    def ensure_loaded(self, start_date=None, end_date=None):
+        """Load the older transactions not loaded on startup.
 
-        # Use the to_csv() method to export the DataFrame to a CSV file
-        df.to_csv(csv_file_path, index=False)
-        with open(json_file_path, "w", encoding="utf8") as jsonfile:
-            json.dump(EXAMPLE_METADATA, jsonfile, indent=4)
+        Args:
+            start_date (str, optional): load the transactions from this date on.
+                Defaults to None (all).
+            end_date (str, optional): load the transactions up to this date.
+                Defaults to None (all).
+        """
+        with self._lock:
+            self._load_months(self._unloaded_months(start_date, end_date))
 
-    def load_transactions(self):
-        """Load transactins from csv file."""
-        logger.info("DataManager: %s:  load_transactions", time.time())
-        data_df = self.load_csv()
-        df_cleaned = data_df.fillna("")
+    @traced
+    def load_older_months(self, count=OLDER_MONTHS):
+        """Load the latest months of transactions not loaded yet (e.g. when the
+        transaction list is scrolled to its end).
+
+        Args:
+            count (int, optional): number of months to load. Defaults to OLDER_MONTHS.
+
+        Returns:
+            list: loaded months ("YYYYMM"), empty if all the months are loaded.
+        """
+        with self._lock:
+            months = sorted(self.storage.unloaded_months())[-count:]
+            self._load_months(months)
+            return months
+
+    def _unloaded_months(self, start_date=None, end_date=None):
+        """Months not loaded yet in a date range.
+
+        Args:
+            start_date (str, optional): first date. Defaults to None (all).
+            end_date (str, optional): last date. Defaults to None (all).
+
+        Returns:
+            list: sorted months ("YYYYMM").
+        """
+        months = self.storage.unloaded_months()
+        if start_date is not None:
+            months = [month for month in months if month >= month_key(start_date)]
+        if end_date is not None:
+            months = [month for month in months if month <= month_key(end_date)]
+        return months
+
+    def _load_months(self, months):
+        """Load some months of transactions, if not loaded yet.
+
+        Args:
+            months (iterable): months to load ("YYYYMM").
+        """
+        size = self.store.size
+        self.storage.load_months(months)
+        if self.store.size != size:
+            # rebuilt with the new transactions on next use
+            self._cube = None
+            self._fenwick = None
+            self._query_index = None
+            self._text_index = None
+
+    @property
+    def cube(self):
+        """Sums and counts of the loaded transactions by month, category,
+        subcategory and account (see AggregateCube), kept up to date on add/remove.
+
+        Returns:
+            AggregateCube: aggregates of the loaded transactions.
+        """
+        with self._lock:
+            if self._cube is None:
+                self._cube = AggregateCube.from_store(self.store)
+            return self._cube
+
+    @property
+    def fenwick(self):
+        """Day trees of the amounts of the loaded transactions for each account
+        and category (see FenwickIndex), kept up to date on add/remove.
+
+        Returns:
+            dict: field name -> FenwickIndex.
+        """
+        with self._lock:
+            if self._fenwick is None:
+                self._fenwick = {
+                    field: FenwickIndex.from_store(self.store, field)
+                    for field in FENWICK_FIELDS
+                }
+            return self._fenwick
+
+    @property
+    def query_index(self):
+        """Date index and postings lists of the loaded transactions
+        (see QueryIndex), kept up to date on add/remove.
+
+        Returns:
+            QueryIndex: index of the loaded transactions.
+        """
+        with self._lock:
+            if self._query_index is None:
+                self._query_index = QueryIndex(self.store)
+            return self._query_index
+
+    @property
+    def text_index(self):
+        """Inverted index of the words of the notes, categories and subcategories
+        of the loaded transactions (see TextIndex).
+
+        Returns:
+            TextIndex: index of the loaded transactions.
+        """
+        with self._lock:
+            if self._text_index is None:
+                self._text_index = TextIndex(self.store)
+            return self._text_index
+
+    @traced
+    def query(  # pylint: disable=R0913
+        self,
+        start_date=None,
+        end_date=None,
+        accounts=None,
+        categories=None,
+        subcategories=None,
+        types=None,
+        min_amount=None,
+        max_amount=None,
+        text=None,
+        sort="date",
+        descending=False,
+        offset=0,
+        limit=None,
+    ):
+        """Transactions matching some filters, sorted and sliced for display.
+
+        Only the matching row positions are computed; the rows are returned as
+        lightweight views decoded when read. Without start_date only the loaded
+        transactions are searched (the months of the window and the ones loaded
+        since, see load_older_months); with it the older months from start_date
+        on are loaded first.
+
+        Args:
+            start_date (str, optional): first date ("YYYY-MM-DD" or "YYYY/MM/DD").
+                Defaults to None.
+            end_date (str, optional): last date ("YYYY-MM-DD" or "YYYY/MM/DD").
+                Defaults to None.
+            accounts (list, optional): accounts to keep. Defaults to None (all).
+            categories (list, optional): categories to keep. Defaults to None (all).
+            subcategories (list, optional): subcategories to keep.
+                Defaults to None (all).
+            types (list, optional): transaction types to keep. Defaults to None (all).
+            min_amount (float, optional): lowest amount. Defaults to None.
+            max_amount (float, optional): highest amount. Defaults to None.
+            text (str, optional): words that must start a word of the note,
+                category or subcategory (e.g. "pen gro"). Defaults to None.
+            sort (str, optional): "date", "amount" or "id". Defaults to "date".
+            descending (bool, optional): reverse order. Defaults to False.
+            offset (int, optional): number of matching transactions to skip.
+                Defaults to 0.
+            limit (int, optional): maximum number of transactions.
+                Defaults to None (all).
+
+        Raises:
+            ValueError: Query Error: if the sort key is unknown.
+
+        Returns:
+            list: TransactionView of each matching transaction.
+        """
+        with self._lock:
+            positions = self._query_positions(
+                start_date=start_date,
+                end_date=end_date,
+                accounts=accounts,
+                categories=categories,
+                subcategories=subcategories,
+                types=types,
+                min_amount=min_amount,
+                max_amount=max_amount,
+                text=text,
+                sort=sort,
+                descending=descending,
+                offset=offset,
+                limit=limit,
+            )
+            return [
+                TransactionView(self.store, int(position)) for position in positions
+            ]
+
+    @traced
+    def query_ids(self, **filters):
+        """Ids of the transactions matching some filters, in the order of query.
+
+        No row is decoded, so long lists (e.g. a whole page of the app) are cheap.
+
+        Args:
+            **filters: arguments of query.
+
+        Returns:
+            list: transaction ids.
+        """
+        with self._lock:
+            return self.store.ids[self._query_positions(**filters)].tolist()
+
+    def _query_positions(  # pylint: disable=R0913
+        self,
+        start_date=None,
+        end_date=None,
+        accounts=None,
+        categories=None,
+        subcategories=None,
+        types=None,
+        text=None,
+        **options,
+    ):
+        """Row positions of the transactions matching the filters of query.
+
+        Returns:
+            numpy.ndarray: row positions.
+        """
+        filters = {
+            field: values
+            for field, values in (
+                ("account", accounts),
+                ("category", categories),
+                ("subcategory", subcategories),
+                ("type", types),
+            )
+            if values is not None
+        }
+        if start_date is not None:
+            # never the whole ledger: an open range stays in the loaded months
+            self.ensure_loaded(start_date, end_date)
+        return self.query_index.query(
+            start_date=start_date,
+            end_date=end_date,
+            filters=filters,
+            matches=self.text_index.match(text) if text else None,
+            **options,
+        )
+
+    @traced
+    def balance_at(self, account, date):
+        """Balance of an account at the end of a day.
+
+        Args:
+            account (str): account name.
+            date (str): date ("YYYY-MM-DD" or "YYYY/MM/DD").
+
+        Returns:
+            float: balance of the account.
+        """
+        with self._lock:
+            # the months before the one of the date are summed up by the storage
+            # without loading them, only the month of the date is loaded for its
+            # days and the later months do not count
+            month = month_key(normalize_date(date))
+            self._load_months([month])
+            opening = self.storage.opening(before=month)["balances"].get(account, 0)
+            return round(
+                opening + self.fenwick["account"].prefix_sum(account, to_day(date)), 2
+            )
+
+    @traced
+    def balance_history(self, account, dates):
+        """Balance of an account at the end of some days (e.g. to draw a curve).
+
+        Args:
+            account (str): account name.
+            dates (list): dates ("YYYY-MM-DD" or "YYYY/MM/DD").
+
+        Returns:
+            list: balance of the account at each date.
+        """
+        return [self.balance_at(account, date) for date in dates]
+
+    @traced
+    def category_total(self, category, start_date, end_date):
+        """Sum of the amounts of a category between two dates (both included).
 
-        self.transactions = df_cleaned.to_dict(orient="records")
+        Args:
+            category (str): category name.
+            start_date (str): first date ("YYYY-MM-DD" or "YYYY/MM/DD").
+            end_date (str): last date ("YYYY-MM-DD" or "YYYY/MM/DD").
 
+        Returns:
+            float: sum of the amounts (negative for expenses).
+        """
+        with self._lock:
+            self.ensure_loaded(start_date, end_date)
+            return round(
+                self.fenwick["category"].range_sum(
+                    category, to_day(start_date), to_day(end_date)
+                ),
+                2,
+            )
+
+    @traced
     def load_csv(self):
         """Load csv data file.
 
         Returns:
             pandas.DataFrame: return a pandas dataframe of the csv file.
         """
-        logger.info("DataManager: %s:  load_csv", time.time())
-        data_df = pd.read_csv(os.path.join(self.data_folder, DATA_CSV))
-        return data_df
+        return CsvStorage(self.data_folder).load_csv()
 
+    @traced
     def load_metadata(self):
-        """Load metadata json file."""
-        logger.info("DataManager: %s:  load_metadata", time.time())
-        with open(
-            os.path.join(self.data_folder, METADATA_JSON), "r", encoding="utf8"
-        ) as file:
-            json_data = json.load(file)
-        self.metadata = json_data
+        """Load metadata from the storage."""
+        self.metadata = self.storage.load_metadata()
 
+    @traced
     def get_account_balance(self, account):
         """Get the balance value of a certain account.
 
@@ -122,135 +516,411 @@ class DataManager:
         Returns:
             float: balance value for the requested account.
         """
-        logger.info("DataManager: %s:  get_account_balance", time.time())
-        if self.balances is not None:
-            if account in self.balances:
-                return self.balances[account]
+        if self.balances is None or account not in self.balances:
+            # generate balance
+            self.update_balance(account)
 
-        # generate balance
-        self.update_balance(account)
-        return self.balances[account]
+        return round(self.balances[account], 2)
 
+    @traced
     def update_balance(self, account):
-        """update balances for each account.
+        """recompute the balance of an account from all its transactions.
 
         Args:
             account (str): account name.
         """
-        logger.info("DataManager: %s:  update_balance", time.time())
-        new_balance = 0
         if self.balances is None:
             self.balances = {}
 
-        for transaction in self.transactions:
-            if transaction["account"] == account:
-                new_balance += transaction["amount"]
+        self.balances[account] = self.storage.balance(account)
+
+    @traced
+    def iter_transactions(  # pylint: disable=R0913
+        self,
+        chunk_size=EXPORT_CHUNK_SIZE,
+        start_date=None,
+        end_date=None,
+        accounts=None,
+        categories=None,
+    ):
+        """Iterate over the transactions in chunks, optionally filtered.
+
+        The months not loaded are read from the storage one at a time and are
+        not loaded, so the startup window is kept. At most one month of
+        transaction dicts is in memory and the data is locked only while a chunk
+        (or a month) is read, so it can run in a background thread.
+
+        Args:
+            chunk_size (int, optional): rows per chunk.
+                Defaults to EXPORT_CHUNK_SIZE.
+            start_date (str, optional): first date ("YYYY-MM-DD" or "YYYY/MM/DD").
+                Defaults to None.
+            end_date (str, optional): last date ("YYYY-MM-DD" or "YYYY/MM/DD").
+                Defaults to None.
+            accounts (list, optional): accounts to keep. Defaults to None (all).
+            categories (list, optional): categories to keep. Defaults to None (all).
+
+        Yields:
+            list: transaction dicts of a chunk.
+        """
+        date_range = None
+        if start_date is not None or end_date is not None:
+            date_range = (start_date, end_date)
+        values = {}
+        if accounts is not None:
+            values["account"] = accounts
+        if categories is not None:
+            values["category"] = categories
+
+        with self._lock:
+            size = self.store.size
+            months = self._unloaded_months(start_date, end_date)
+
+        for start in range(0, size, chunk_size):
+            with self._lock:
+                positions = self.store.select(
+                    start, min(start + chunk_size, size), date_range, values
+                )
+                transactions = [self.store.row(position) for position in positions]
+            if transactions:
+                yield transactions
+
+        for month in months:
+            with self._lock:
+                if month in self.storage.unloaded_months():
+                    store, start = self.storage.read_months([month]), 0
+                else:
+                    # loaded by a change since the export started
+                    store, start = self.store, size
+                transactions = [
+                    store.row(position)
+                    for position in store.select(start, None, date_range, values)
+                ]
+            transactions = [
+                transaction
+                for transaction in transactions
+                if month_key(transaction["date"]) == month
+            ]
+            for start in range(0, len(transactions), chunk_size):
+                yield transactions[start : start + chunk_size]
+
+    def get_usage_count(self, key, item):
+        """Number of transactions using an account, category or subcategory.
+
+        Args:
+            key (str): "account", "category" or "subcategory".
+            item (str): item name.
+
+        Returns:
+            int: number of transactions.
+        """
+        return self.usage[key].get(item, 0)
+
+    def add_listener(self, callback):
+        """Register a function called after transactions are added or removed.
+
+        Args:
+            callback (function): called with the operation ("add" or "remove")
+                and the list of transaction dicts.
+        """
+        self.listeners.append(callback)
+
+    def _apply_change(self, operation, transactions):
+        """Update the in-memory aggregates and notify the listeners.
+
+        Args:
+            operation (str): "add" or "remove".
+            transactions (list): list of transaction dicts.
+        """
+        sign = 1 if operation == "add" else -1
+        for transaction in transactions:
+            account = transaction["account"]
+            self.balances[account] = (
+                self.balances.get(account, 0) + sign * transaction["amount"]
+            )
+            for key in USAGE_KEYS:
+                counter = self.usage[key]
+                counter[transaction[key]] = counter.get(transaction[key], 0) + sign
+        if self._cube is not None:
+            self._cube.update(operation, transactions)
+        if self._fenwick is not None:
+            days = [to_day(transaction["date"]) for transaction in transactions]
+            for index in self._fenwick.values():
+                index.update(operation, days, transactions)
+        if self._query_index is not None:
+            if operation == "add":
+                for transaction in transactions:
+                    self._query_index.add(self.store.index[transaction[ID_FIELD]])
+            elif self._query_index.remove(len(transactions)):
+                # too many removed rows in the postings, rebuilt on next use
+                self._query_index = None
+        # the text index tokenizes the new values on the next search and
+        # filters the removed rows with the alive mask of the store
+
+        for callback in self.listeners:
+            callback(operation, transactions)
+
+    @traced
+    def close(self):
+        """Write the pending changes, wait for pending writes and release the storage."""
+        if self.scheduler is not None:
+            self.scheduler.close()
+        with self._lock:
+            self.flush()
+            self.storage.close()
+
+    @traced
+    def flush(self):
+        """Write the changes queued in write-behind mode to the storage.
+
+        Changes are removed from the queue only once written,
+        so a failed flush is retried by the next one.
+        """
+        with self._lock:
+            while self._pending:
+                operation, transactions = self._pending[0]
+                self.storage.record(operation, transactions)
+                self._pending.popleft()
+            if self._metadata_dirty:
+                self.storage.save_metadata(self.metadata)
+                self._metadata_dirty = False
+
+    def _load_months_of(self, transactions):
+        """Load the months of a batch of transactions, if not loaded yet.
+
+        Args:
+            transactions (list): list of transaction dicts.
+        """
+        self._load_months(
+            {
+                month_key(transaction["date"])
+                for transaction in transactions
+                if isinstance(transaction, dict)
+                and isinstance(transaction.get("date"), str)
+            }
+        )
+
+    def _record(self, operation, transactions):
+        """Persist added or removed transactions, or queue them in write-behind mode.
 
-        self.balances[account] = round(new_balance, 2)
+        Args:
+            operation (str): "add" or "remove".
+            transactions (list): list of transaction dicts.
+        """
+        if self.scheduler is None:
+            self.storage.record(operation, transactions)
+            return
+        if self._pending and self._pending[-1][0] == operation:
+            # consecutive changes of the same kind are written as one record
+            self._pending[-1][1].extend(transactions)
+        else:
+            self._pending.append((operation, list(transactions)))
+        self.scheduler.mark()
 
+    @traced
     def save_metadata(self):
-        """save metadata in a json file."""
-        logger.info("DataManager: %s:  save_metadata", time.time())
-        # TODO keep last n version of a file # pylint: disable=W0511
+        """save metadata in the storage."""
         # update metadata
         self.metadata["accounts"] = self.accounts
         self.metadata["categories"] = self.categories
         self.metadata["subcategories"] = self.sub_categories
 
-        with open(
-            os.path.join(self.data_folder, METADATA_JSON), "w", encoding="utf8"
-        ) as file:
-            json.dump(self.metadata, file, indent=4)
+        if self.scheduler is None:
+            self.storage.save_metadata(self.metadata)
+            return
+        with self._lock:
+            self._metadata_dirty = True
+        self.scheduler.mark()
 
+    @traced
     def save_transactions(self):
-        """save transactions in a csv file."""
-        logger.info("DataManager: %s:  save_transactions", time.time())
-        # TODO keep last n version of a file # pylint: disable=W0511
-        csv_file_path = os.path.join(self.data_folder, DATA_CSV)
-        # Convert the list of dictionaries to a DataFrame
-        df = pd.DataFrame(self.transactions)
-
-        # Use the to_csv() method to export the DataFrame to a CSV file
-        df.to_csv(csv_file_path, index=False)
+        """save all transactions in the storage."""
+        with self._lock:
+            # queued changes are written first, so they are part of the history
+            self.flush()
+            self.storage.save_transactions(self.store)
 
+    @traced
     def add_category(self, category):
         """Add a new category to the metadata.
 
         Args:
             category (str): category name.
         """
-        logger.info("DataManager: %s:  add_category", time.time())
         validate_input(
-            item=category, item_list=self.categories, item_type=str, mode="add"
+            item=category,
+            item_list=self.metadata_sets["category"],
+            item_type=str,
+            mode="add",
         )
 
         # add category
         self.categories.append(category)
+        self.metadata_sets["category"].add(category)
 
         # save new metadata
         self.save_metadata()
 
+    @traced
     def add_subcategory(self, subcategory):
         """Add a new subcategory to the metadata.
 
         Args:
             subcategory (str): subcategory name.
         """
-        logger.info("DataManager: %s:  add_subcategory", time.time())
         validate_input(
-            item=subcategory, item_list=self.sub_categories, item_type=str, mode="add"
+            item=subcategory,
+            item_list=self.metadata_sets["subcategory"],
+            item_type=str,
+            mode="add",
         )
 
         # add category
         self.sub_categories.append(subcategory)
+        self.metadata_sets["subcategory"].add(subcategory)
 
         # save new metadata
         self.save_metadata()
 
+    @traced
     def add_account(self, account):
         """Add a new account to the metadata.
 
         Args:
             account (str): account name.
         """
-        logger.info("DataManager: %s:  add_account", time.time())
-        validate_input(item=account, item_list=self.accounts, item_type=str, mode="add")
+        validate_input(
+            item=account,
+            item_list=self.metadata_sets["account"],
+            item_type=str,
+            mode="add",
+        )
 
         # add category
         self.accounts.append(account)
+        self.metadata_sets["account"].add(account)
 
         # save new metadata
         self.save_metadata()
 
+    @traced
     def add_transaction(self, transaction):
         """Add a new transaction to the data.
 
         Args:
             transaction (dict): transaction dict.
         """
-        logger.info("DataManager: %s:  add_transaction", time.time())
-        validate_input(
-            item=transaction, item_list=self.transactions, item_type=dict, mode="add"
-        )
+        self.add_transactions(transactions=[transaction])
 
-        validate_transaction(
-            item=transaction,
-            accounts=self.accounts,
-            categories=self.categories,
-            sub_categories=self.sub_categories,
-        )
+    @traced
+    def add_transactions(self, transactions):
+        """Add a batch of new transactions to the data.
 
-        if transaction["type"] in {"income", "deposit"}:
-            transaction["amount"] = int(transaction["amount"])
-        else:
-            transaction["amount"] = -abs(int(transaction["amount"]))
+        The whole batch is validated first, then added and persisted at once:
+        either all the transactions are added or none.
+
+        Args:
+            transactions (iterable): transaction dicts.
+
+        Raises:
+            ValueError: if any transaction of the batch is not valid.
+        """
+        transactions = list(transactions)
+        if not transactions:
+            return
+
+        with self._lock:
+            self._load_months_of(transactions)
+            batch_keys = set()
+            batch = []
+            for transaction in transactions:
+                validate_input(
+                    item=transaction,
+                    item_list=self.transactions,
+                    item_type=dict,
+                    mode="add",
+                )
+                validate_transaction(
+                    item=transaction,
+                    accounts=self.metadata_sets["account"],
+                    categories=self.metadata_sets["category"],
+                    sub_categories=self.metadata_sets["subcategory"],
+                )
+                # the caller's dicts are only updated once the whole batch is added,
+                # dates are stored in the "YYYY-MM-DD" format and amounts are kept
+                # signed to the cent (e.g. "12.75" from an input dialog)
+                transaction = dict(
+                    transaction,
+                    date=normalize_date(transaction["date"]),
+                    amount=signed_amount(transaction["type"], transaction["amount"]),
+                )
+                # duplicates inside the batch, ids already in use and stored rows
+                # (compared with the amount converted, as it is stored)
+                if ID_FIELD in transaction:
+                    key = transaction[ID_FIELD]
+                    used = key in self.store.index
+                else:
+                    key = _content_key(transaction)
+                    used = self.store.find(transaction) >= 0
+                if used or key in batch_keys:
+                    raise ValueError(
+                        f"Integrity Error: Item: {transaction} already exists!"
+                    )
+                batch_keys.add(key)
+                batch.append(transaction)
+
+            # add and save the transactions, the store is rolled back if saving fails
+            positions = []
+            try:
+                for transaction in batch:
+                    positions.append(self.store.append(transaction))
+                self._record("add", batch)
+            except BaseException:
+                for position in positions:
+                    self.store.remove_at(position)
+                raise
+
+            # new ids, dates and signed amounts
+            for transaction, added in zip(transactions, batch):
+                transaction.update(added)
+            self._apply_change("add", batch)
+
+    @traced
+    def add_transfer(  # pylint: disable=R0913
+        self, date, amount, from_account, to_account, note=""
+    ):
+        """Add a transfer between two accounts as a linked pair of transactions.
 
-        # add transaction
-        self.transactions.append(transaction)
+        Args:
+            date (str): transfer date.
+            amount (str, int): transferred amount.
+            from_account (str): account the money is taken from.
+            to_account (str): account the money goes to.
+            note (str, optional): transfer note. Defaults to "".
 
-        # save new data
-        self.save_transactions()
+        Raises:
+            ValueError: if the accounts are the same or a transaction is not valid.
 
+        Returns:
+            tuple: withdraw and deposit transaction dicts.
+        """
+        if from_account == to_account:
+            raise ValueError("Accounts must be different!")
+
+        transfer = {
+            "date": date,
+            "amount": amount,
+            "category": "banktransfer",
+            "subcategory": "banktransfer",
+            "note": note,
+        }
+        transaction_from = {**transfer, "type": "withdraw", "account": from_account}
+        transaction_to = {**transfer, "type": "deposit", "account": to_account}
+
+        self.add_transactions(transactions=[transaction_from, transaction_to])
+        return transaction_from, transaction_to
+
+    @traced
     def remove_category(self, category):
         """Remove a category from the metadata.
 
@@ -260,21 +930,25 @@ class DataManager:
         Raises:
             ValueError: If category is still used.
         """
-        logger.info("DataManager: %s:  remove_category", time.time())
         validate_input(
-            item=category, item_list=self.categories, item_type=str, mode="remove"
+            item=category,
+            item_list=self.metadata_sets["category"],
+            item_type=str,
+            mode="remove",
         )
 
         # check if item is used
-        if is_used(item=category, key="category", my_dict_list=self.transactions):
+        if self.get_usage_count("category", category) > 0:
             raise ValueError(f"Integrity Error: Item: {category} is still in use!")
 
         # remove category
         self.categories.remove(category)
+        self.metadata_sets["category"].discard(category)
 
         # save new metadata
         self.save_metadata()
 
+    @traced
     def remove_subcategory(self, subcategory):
         """Remove a subcategory from the metadata.
 
@@ -284,24 +958,25 @@ class DataManager:
         Raises:
             ValueError: If subcategory is still used.
         """
-        logger.info("DataManager: %s:  remove_subcategory", time.time())
         validate_input(
             item=subcategory,
-            item_list=self.sub_categories,
+            item_list=self.metadata_sets["subcategory"],
             item_type=str,
             mode="remove",
         )
 
         # check if item is used
-        if is_used(item=subcategory, key="subcategory", my_dict_list=self.transactions):
+        if self.get_usage_count("subcategory", subcategory) > 0:
             raise ValueError(f"Integrity Error: Item: {subcategory} is still in use!")
 
         # remove subcategory
         self.sub_categories.remove(subcategory)
+        self.metadata_sets["subcategory"].discard(subcategory)
 
         # save new metadata
         self.save_metadata()
 
+    @traced
     def remove_account(self, account):
         """Remove a account from the metadata.
 
@@ -311,34 +986,125 @@ class DataManager:
         Raises:
             ValueError: If account is still used.
         """
-        logger.info("DataManager: %s:  remove_account", time.time())
         validate_input(
-            item=account, item_list=self.accounts, item_type=str, mode="remove"
+            item=account,
+            item_list=self.metadata_sets["account"],
+            item_type=str,
+            mode="remove",
         )
 
         # check if item is used
-        if is_used(item=account, key="account", my_dict_list=self.transactions):
+        if self.get_usage_count("account", account) > 0:
             raise ValueError(f"Integrity Error: Item: {account} is still in use!")
 
         # remove account
         self.accounts.remove(account)
+        self.metadata_sets["account"].discard(account)
 
         # save new metadata
         self.save_metadata()
 
+    def get_transaction(self, transaction_id):
+        """Get a transaction from its id.
+
+        Args:
+            transaction_id (int): transaction id.
+
+        Raises:
+            ValueError: If the id is unknown.
+
+        Returns:
+            dict: transaction dict.
+        """
+        position = self.store.index.get(transaction_id)
+        if position is None:
+            raise ValueError(f"404 Error: Transaction id: {transaction_id} not found!")
+        return self.store.row(position)
+
+    @traced
     def remove_transaction(self, transaction):
-        """Remove a transaction to the data.
+        """Remove a transaction from the data.
+
+        The transaction is looked up by id if the dict has one.
 
         Args:
             transaction (dict): transaction dict.
         """
-        logger.info("DataManager: %s:  remove_transaction", time.time())
-        validate_input(
-            item=transaction, item_list=self.transactions, item_type=dict, mode="remove"
-        )
+        self.remove_transactions(transactions=[transaction])
 
-        # remove transaction
-        self.transactions.remove(transaction)
+    @traced
+    def remove_transactions(self, transactions):
+        """Remove a batch of transactions from the data.
 
-        # save new metadata
-        self.save_transactions()
+        The whole batch is validated first, then removed and persisted at once:
+        either all the transactions are removed or none.
+
+        Args:
+            transactions (iterable): transaction dicts.
+
+        Raises:
+            ValueError: if any transaction of the batch is not found.
+        """
+        transactions = list(transactions)
+        if not transactions:
+            return
+
+        with self._lock:
+            self._load_months_of(transactions)
+            positions = []
+            found = set()
+            for transaction in transactions:
+                validate_input(
+                    item=transaction,
+                    item_list=self.transactions,
+                    item_type=dict,
+                    mode="remove",
+                )
+                position = self.store.find(transaction)
+                if position in found:
+                    raise ValueError(f"404 Error: Item: {transaction} not found!")
+                found.add(position)
+                positions.append(position)
+
+            # remove and save the transactions, the store is rolled back if saving
+            # fails
+            removed = [self.store.row(position) for position in positions]
+            done = []
+            try:
+                for position in positions:
+                    self.store.remove_at(position)
+                    done.append(position)
+                self._record("remove", removed)
+            except BaseException:
+                for position in done:
+                    self.store.restore_at(position)
+                raise
+
+            self._apply_change("remove", removed)
+
+
+def _content_key(transaction):
+    """Hashable key of the transaction fields (used to find duplicates)."""
+    return tuple(str(transaction[field]) for field in TRANSACTION_FIELDS)
+
+
+def window_start(today, months):
+    """First month of a window of months ending with the current one.
+
+    Args:
+        today (datetime.date): current date.
+        months (int): number of months of the window.
+
+    Returns:
+        str: month key ("YYYYMM").
+    """
+    month_index = today.year * 12 + today.month - months
+    return f"{month_index // 12:04d}{month_index % 12 + 1:02d}"
+
+
+def _merge_counts(first, second):
+    """Sum two dicts of numbers key by key."""
+    merged = dict(first)
+    for key, value in second.items():
+        merged[key] = merged.get(key, 0) + value
+    return merged
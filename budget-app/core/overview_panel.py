@@ -1,25 +1,35 @@
 """Module to define the overview page to insert in the bottom navbar of the app."""
-import logging
-import time
+import datetime
 
+from kivy.clock import Clock
 from kivymd.uix.bottomnavigation import MDBottomNavigationItem
+from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.label import MDLabel
+from kivymd.uix.list import MDList, OneLineListItem
+from kivymd.uix.scrollview import MDScrollView
 
 from .data_manager import DataManager
-
-logger = logging.getLogger(__name__)
+from .utils.tracing import traced
+from .utils.transaction_store import month_key
 
 
 class OverviewPage:
     """
     Class to define the App page that holds an overview of
     transactions and accounts balances.
+
+    The figures come from the aggregate cube of the data manager, so the page
+    is refreshed without scanning the transactions.
     """
 
+    @traced
     def __init__(self, data_manager: DataManager):
-        logger.info("OverviewPage: %s:  __init__", time.time())
         self.data_manager = data_manager
+        self.summary_label = MDLabel(text="Dashboard", halign="center")
+        self.categories_list = MDList()
+        self.data_manager.add_listener(self.on_transactions_changed)
 
+    @traced
     def build_page(self):
         """Builds a page using a bottom navbar item and
         calls a function to generate the content of the page.
@@ -27,7 +37,6 @@ class OverviewPage:
         Returns:
             MDBottomNavigationItem: Bottom navbar item.
         """
-        logger.info("OverviewPage: %s:  build_page", time.time())
         return MDBottomNavigationItem(
             self.generate_overview(),
             name="dashboard",
@@ -35,14 +44,47 @@ class OverviewPage:
             icon="chart-pie",
         )
 
+    @traced
     def generate_overview(self):
-        """Generates the overview page content.
+        """Generates the overview page content: the total of the current month
+        and its breakdown by category.
 
         Returns:
-            MDLabel: page content
+            MDBoxLayout: page content
         """
-        logger.info("OverviewPage: %s:  generate_overview", time.time())
-        return MDLabel(
-            text="Dashboard",
-            halign="center",
+        self.refresh_overview()
+        return MDBoxLayout(
+            self.summary_label,
+            MDScrollView(self.categories_list),
+            orientation="vertical",
         )
+
+    @traced
+    def on_transactions_changed(self, operation, transactions):  # pylint: disable=W0613
+        """Refresh the overview after transactions are added or removed.
+
+        Args:
+            operation (str): "add" or "remove".
+            transactions (list): list of transaction dicts.
+        """
+        # widgets must be updated from the main thread
+        Clock.schedule_once(lambda dt: self.refresh_overview())
+
+    @traced
+    def refresh_overview(self):
+        """Update the overview widgets from the aggregate cube."""
+        month = month_key(datetime.date.today().isoformat())
+        cube = self.data_manager.cube
+        total, count = cube.total(month=month)
+        self.summary_label.text = (
+            f"This month: {round(total, 2)}$ ({count} transactions)"
+        )
+
+        self.categories_list.clear_widgets()
+        breakdown = cube.breakdown("category", month=month)
+        for category, (category_total, _) in sorted(
+            breakdown.items(), key=lambda item: item[1][0]
+        ):
+            self.categories_list.add_widget(
+                OneLineListItem(text=f"{category} | {round(category_total, 2)}$")
+            )
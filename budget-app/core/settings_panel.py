@@ -1,9 +1,9 @@
 """Module to define the settings page to insert in the bottom navbar of the app."""
-import logging
-import time
+import os
 
-from kivymd.uix.bottomnavigation import MDBottomNavigationItem
+from kivy.clock import Clock
 from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.filemanager import MDFileManager
 from kivymd.uix.gridlayout import MDGridLayout
 from kivymd.uix.label import MDLabel
 from kivymd.uix.list import IconLeftWidget, OneLineAvatarIconListItem
@@ -11,33 +11,44 @@ from kivymd.uix.selectioncontrol import MDSwitch
 
 from .data_manager import DataManager
 from .utils.category_settings import CategoryWidget
+from .utils.exporter import DataExporter
+from .utils.importer import CsvImporter
+from .utils.lazy_tab import LazyNavigationItem
 from .utils.subcategory_settings import SubcategoryWidget
+from .utils.tracing import traced
 
-logger = logging.getLogger(__name__)
+DOWNLOAD_TEXT = "Download data (csv file)"
+EXPORT_FILE = "budget-export.csv"
+UPLOAD_TEXT = "Upload data (csv file)"
 
 
-class SettingsPage:
+class SettingsPage:  # pylint: disable=R0902
     """
     Class to define the App page that holds all the settings
     and any functionality related to them.
     """
 
+    @traced
     def __init__(self, data_manager: DataManager):
-        logger.info("SettingsPage: %s:  __init__", time.time())
         self.data_manager = data_manager
         self.category_settings = CategoryWidget(self.data_manager)
         self.subcategory_settings = SubcategoryWidget(self.data_manager)
+        self.download_button = None
+        self.upload_button = None
+        self.file_manager = None
+        self.exporter = None
+        self.importer = None
 
+    @traced
     def build_page(self):
-        """Builds a page using a bottom navbar item and
-        calls a function to generate the content of the page.
+        """Builds a page using a bottom navbar item,
+        its content is generated when the page is first shown.
 
         Returns:
-            MDBottomNavigationItem: Bottom navbar item.
+            LazyNavigationItem: Bottom navbar item.
         """
-        logger.info("SettingsPage: %s:  build_page", time.time())
-        return MDBottomNavigationItem(
-            self.build_settings(),
+        return LazyNavigationItem(
+            self.build_settings,
             name="settings",
             text="Settings",
             icon="cog",
@@ -57,13 +68,13 @@ class SettingsPage:
         # else:
         #     self.theme_cls.theme_style = "Dark"
 
+    @traced
     def build_settings(self):
         """Generates the settings page content.
 
         Returns:
             MDGridLayout: settings page content
         """
-        logger.info("SettingsPage: %s:  build_settings", time.time())
         switch_layout = MDBoxLayout(orientation="horizontal", padding=20, spacing=10)
 
         label = MDLabel(text="Toggle Switch")
@@ -83,56 +94,157 @@ class SettingsPage:
 
         return grid_layout
 
+    @traced
     def get_download_button(self):
         """Returns a one line settings button to download the data.
 
         Returns:
             OneLineAvatarIconListItem: Settings button.
         """
-        logger.info("SettingsPage: %s:  get_download_button", time.time())
-        return OneLineAvatarIconListItem(
+        self.download_button = OneLineAvatarIconListItem(
             IconLeftWidget(icon="github"),
-            text="Download data (csv file)",
-            on_release=lambda x: print(
-                "Downloading data!"
-            ),  # TODO # pylint: disable=W0511
+            text=DOWNLOAD_TEXT,
+            on_release=self.on_download_release,
         )
+        return self.download_button
+
+    @traced
+    def on_download_release(self, instance):  # pylint: disable=W0613
+        """Opens the file manager to select the folder to download the data to,
+        or cancels the download if one is running.
+        """
+        if self.exporter is not None and self.exporter.is_running():
+            self.exporter.cancel()
+            self.download_button.text = f"{DOWNLOAD_TEXT}: cancelled"
+            return
+
+        self.open_file_manager(select_path=self.download_data)
 
+    @traced
+    def download_data(self, path):
+        """Exports all the transactions in a background thread.
+
+        Args:
+            path (str): selected folder (or file in the folder).
+        """
+        self.close_file_manager()
+        folder = path if os.path.isdir(path) else os.path.dirname(path)
+        self.exporter = DataExporter(
+            self.data_manager,
+            os.path.join(folder, EXPORT_FILE),
+            on_progress=lambda exported: Clock.schedule_once(
+                lambda dt: self.show_download_progress(exported)
+            ),
+        )
+        self.exporter.start()
+
+    def show_download_progress(self, exported):
+        """Shows the download progress in the download button.
+
+        Args:
+            exported (int): number of exported transactions.
+        """
+        self.download_button.text = (
+            f"{DOWNLOAD_TEXT}: {exported}/{len(self.data_manager.transactions)}"
+        )
+
+    @traced
     def get_upload_button(self):
         """Returns a one line settings button to upload data.
 
         Returns:
             OneLineAvatarIconListItem: Settings button.
         """
-        logger.info("SettingsPage: %s:  get_upload_button", time.time())
-        return OneLineAvatarIconListItem(
+        self.upload_button = OneLineAvatarIconListItem(
             IconLeftWidget(icon="github"),
-            text="Upload data (csv file)",
-            on_release=lambda x: print(
-                "Uploading data!"
-            ),  # TODO # pylint: disable=W0511
+            text=UPLOAD_TEXT,
+            on_release=self.on_upload_release,
         )
+        return self.upload_button
 
+    @traced
+    def on_upload_release(self, instance):  # pylint: disable=W0613
+        """Opens the file manager to select the csv file to upload,
+        or cancels the upload if one is running.
+        """
+        if self.importer is not None and self.importer.is_running():
+            self.importer.cancel()
+            self.upload_button.text = f"{UPLOAD_TEXT}: cancelled"
+            return
+
+        self.open_file_manager(select_path=self.upload_data)
+
+    @traced
+    def open_file_manager(self, select_path):
+        """Opens the file manager in the home folder.
+
+        Args:
+            select_path (function): called with the selected path.
+        """
+        if not self.file_manager:
+            self.file_manager = MDFileManager(
+                exit_manager=self.close_file_manager, ext=[".csv"]
+            )
+        self.file_manager.select_path = select_path
+        self.file_manager.show(os.path.expanduser("~"))
+
+    @traced
+    def close_file_manager(self, *args):  # pylint: disable=W0613
+        """Closes the file manager."""
+        self.file_manager.close()
+
+    @traced
+    def upload_data(self, path):
+        """Imports the transactions of a csv file in a background thread.
+
+        Args:
+            path (str): csv file path.
+        """
+        self.close_file_manager()
+        self.importer = CsvImporter(
+            self.data_manager,
+            path,
+            on_progress=lambda imported, rejected, progress: Clock.schedule_once(
+                lambda dt: self.show_upload_progress(imported, rejected, progress)
+            ),
+        )
+        self.importer.start()
+
+    def show_upload_progress(self, imported, rejected, progress):
+        """Shows the upload progress in the upload button.
+
+        Args:
+            imported (int): number of imported transactions.
+            rejected (int): number of rejected rows.
+            progress (float): fraction of the file already read.
+        """
+        if progress < 1:
+            self.upload_button.text = f"Uploading data: {progress:.0%} (tap to cancel)"
+        else:
+            self.upload_button.text = (
+                f"{UPLOAD_TEXT}: {imported} imported, {rejected} rejected"
+            )
+
+    @traced
     def get_category_settings(self):
         """Returns a one line settings button to add/remove categories.
 
         Returns:
             OneLineAvatarIconListItem: Settings button.
         """
-        logger.info("SettingsPage: %s:  get_category_settings", time.time())
         return OneLineAvatarIconListItem(
             IconLeftWidget(icon="github"),
             text="Categories",
             on_release=self.category_settings.get_category_dialog,
         )
 
+    @traced
     def get_subcategory_settings(self):
         """Returns a one line settings button to add/remove subcategories.
 
         Returns:
             OneLineAvatarIconListItem: Settings button.
         """
-        logger.info("SettingsPage: %s:  get_subcategory_settings", time.time())
         return OneLineAvatarIconListItem(
             IconLeftWidget(icon="github"),
             text="SubCategories",
@@ -1,54 +1,65 @@
 """Module to define the transaction page to insert in the bottom navbar of the app."""
-import logging
-import time
 from datetime import datetime
 
-from kivymd.uix.bottomnavigation import MDBottomNavigationItem
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.button import MDFloatingActionButton
 from kivymd.uix.label import MDLabel
-from kivymd.uix.list import (
-    IconLeftWidget,
-    IconRightWidget,
-    MDList,
-    OneLineAvatarIconListItem,
-)
-from kivymd.uix.scrollview import MDScrollView
 from kivymd.uix.textfield import MDTextField
 
 from .data_manager import DataManager
 from .utils.dialogbox import DialogBuilder
 from .utils.dropdown_list import DropdownBuilder
-from .utils.utils import dict2str, str2dict
-from .utils.validator import validate_transaction
+from .utils.lazy_tab import LazyNavigationItem
+from .utils.recycle_list import TransactionListView
+from .utils.tracing import traced
+from .utils.utils import dict2str
 
-logger = logging.getLogger(__name__)
 
-
-class TransactionPage:
+class TransactionPage:  # pylint: disable=R0902
     """
     Class to define the App page that holds all the transactions
     and any functionality to add and remove transactions.
     """
 
+    @traced
     def __init__(self, data_manager: DataManager):
-        logger.info("TransactionPage: %s:  __init__", time.time())
         self.data_manager = data_manager
-        self.transaction_list = MDList()
-        self.transactions = self.data_manager.transactions
+        # only the visible rows are widgets, whatever the number of transactions
+        self.transaction_list = TransactionListView(
+            data_manager=self.data_manager,
+            on_delete=self.on_delete_transaction,
+            on_end=self.load_older_transactions,
+        )
+        # filters of DataManager.query for the transactions shown
+        self.filters = {}
         self.base = MDBoxLayout()
         self.save_dialog = None
         self.delete_dialog = None
         self.transfer_dialog = None
 
+    @traced
     def build_page(self):
-        """Builds a page using a bottom navbar item and
-        calls a function to generate the transactions list.
+        """Builds a page using a bottom navbar item,
+        the transactions list is generated when the page is first shown.
 
         Returns:
-            MDBottomNavigationItem: Bottom navbar item.
+            LazyNavigationItem: Bottom navbar item.
+        """
+        return LazyNavigationItem(
+            self.build_content,
+            name="transactions",
+            text="Transactions",
+            icon="format-list-bulleted",
+        )
+
+    @traced
+    def build_content(self):
+        """Generates the content of the page: the transactions list and the
+        buttons to add a transaction or a transfer.
+
+        Returns:
+            MDBoxLayout: page content.
         """
-        logger.info("TransactionPage: %s:  build_page", time.time())
         self.base.add_widget(self.generate_transactions_list())
         # pylint: disable=R0801
         self.base.add_widget(  # pylint: disable=R0801
@@ -66,77 +77,91 @@ class TransactionPage:
             )
         )
         # pylint: enable=R0801
-        return MDBottomNavigationItem(
-            self.base,
-            name="transactions",
-            text="Transactions",
-            icon="format-list-bulleted",
-        )
+        return self.base
 
+    @traced
     def generate_transactions_list(self):
-        """Gets the list of transactions from the data manager
-        and returns a list of widgets holding each transaction information.
+        """Gets the transactions matching the filters from the data manager
+        (newest first) and returns a virtualized list showing each transaction
+        information.
 
         Returns:
-            MDScrollView: List of widget with transactions information.
+            MDBoxLayout: search field and list of the transactions.
         """
-        logger.info("TransactionPage: %s:  generate_transactions_list", time.time())
-        for transaction in self.transactions:
-            self.transaction_list.add_widget(
-                self.single_transaction_widget(transaction=transaction)
-            )
-        return MDScrollView(self.transaction_list)
+        self.filter_transactions(**self.filters)
+        search_input = MDTextField(
+            hint_text="Search notes, categories and subcategories",
+            size_hint_y=None,
+        )
+        search_input.bind(text=lambda instance, text: self.search_transactions(text))
+        return MDBoxLayout(
+            search_input,
+            self.transaction_list,
+            orientation="vertical",
+        )
 
-    def single_transaction_widget(self, transaction):
-        """Generate a single widget to hold the transaction details.
+    @traced
+    def filter_transactions(self, **filters):
+        """Show only the transactions matching some filters.
 
         Args:
-            transaction (dict): transaction dictionary.
-
-        Returns:
-            OneLineAvatarIconListItem: widget with icon, details and delete button.
+            **filters: filters of DataManager.query (e.g. start_date, accounts).
         """
-        logger.info("TransactionPage: %s:  single_transaction_widget", time.time())
-        description = dict2str(transaction)
-
-        return OneLineAvatarIconListItem(
-            IconLeftWidget(icon="swap-horizontal"),
-            IconRightWidget(
-                icon="delete",
-                on_release=lambda x, item=transaction: self.get_confirmation_dialog(
-                    item
-                ),
-            ),
-            text=description,
+        self.filters = filters
+        self.transaction_list.show(
+            self.data_manager.query_ids(descending=True, **filters)
         )
 
-    def delete_transaction(self, transaction_label):
+    @traced
+    def refresh_transactions(self):
+        """Show the transactions matching the current filters again."""
+        self.filter_transactions(**self.filters)
+
+    @traced
+    def load_older_transactions(self):
+        """Load the next older months (only the window of the data manager is
+        loaded on startup) and show their transactions below the current ones."""
+        if self.data_manager.load_older_months():
+            self.refresh_transactions()
+
+    @traced
+    def search_transactions(self, text):
+        """Show only the transactions with words starting with the searched ones
+        (on top of the other filters).
+
+        Args:
+            text (str): searched words (e.g. "pen gro").
+        """
+        self.filter_transactions(**{**self.filters, "text": text})
+
+    @traced
+    def on_delete_transaction(self, transaction_id):
+        """Ask to confirm the deletion of a transaction of the list.
+
+        Args:
+            transaction_id (int): transaction id.
+        """
+        self.get_confirmation_dialog(self.data_manager.get_transaction(transaction_id))
+
+    @traced
+    def delete_transaction(self, transaction):
         """Delete transaction element from the list of transactions.
 
         Args:
-            input_list (list): list of two elements: transaction dict and description.
+            transaction (Mapping): transaction dict or view (with its id).
         """
-        logger.info("TransactionPage: %s:  delete_transaction", time.time())
-        transaction_text = transaction_label.text
-        transaction = str2dict(transaction_label.text)
-        # Remove the corresponding widget from the layout
-        widget_to_remove = next(
-            widget
-            for widget in self.transaction_list.children
-            if widget.text == transaction_text
-        )
-        self.transaction_list.remove_widget(widget_to_remove)
-        self.data_manager.remove_transaction(transaction=transaction)
+        self.data_manager.remove_transaction(transaction=dict(transaction))
+        self.refresh_transactions()
 
         self.delete_dialog.dismiss()
 
+    @traced
     def add_new_transaction(self, box):
         """Add new transaction element to the list of transactions.
 
         Args:
             transaction (dict): new transaction dict.
         """
-        logger.info("TransactionPage: %s:  add_new_transaction", time.time())
         transaction = {
             "date": box.ids["date"].text,
             "type": box.ids["type"].text,
@@ -149,16 +174,14 @@ class TransactionPage:
 
         # add new transaction to data manager
         self.data_manager.add_transaction(transaction=transaction)
-        # add transaction to list
-        self.transaction_list.add_widget(
-            self.single_transaction_widget(transaction=transaction)
-        )
+        # show the transaction at its place in the list
+        self.refresh_transactions()
         # dismiss input dialog
         self.save_dialog.dismiss()
 
+    @traced
     def get_dialog_transaction_input(self, instance):  # pylint: disable=W0613
         """Opens Pop-up box with a text field to insert new transaction name."""
-        logger.info("TransactionPage: %s:  get_dialog_transaction_input", time.time())
         if not self.save_dialog:
             # create text input for each field
             date_input = MDTextField(
@@ -215,23 +238,25 @@ class TransactionPage:
 
         self.save_dialog.open()
 
+    @traced
     def get_confirmation_dialog(self, item):
         """Opens Pop-up box with a text field to delete a transaction."""
-        logger.info("TransactionPage: %s:  get_confirmation_dialog", time.time())
         # create text input
         display_text = MDLabel(text=dict2str(item))
         # create dialog button
         self.delete_dialog = DialogBuilder().build_save_dialog(
             title="Delete this transaction?",
             content=display_text,
-            on_release_function=self.delete_transaction,
+            on_release_function=lambda content, transaction=item: (
+                self.delete_transaction(transaction)
+            ),
         )
 
         self.delete_dialog.open()
 
+    @traced
     def get_dialog_transfer_input(self, instance):  # pylint: disable=W0613
         """Opens Pop-up box with a text field to insert new transfer."""
-        logger.info("TransactionPage: %s:  get_dialog_transfer_input", time.time())
         if not self.transfer_dialog:
             # create text input for each field
             date_input = MDTextField(
@@ -278,68 +303,31 @@ class TransactionPage:
 
         self.transfer_dialog.open()
 
+    @traced
     def transfer_funds(self, box):
         """Add new transfer between two accounts to the list of transactions.
 
         Args:
             box (dict): widget with the inputs of the dialog box.
         """
-        logger.info("TransactionPage: %s:  transfer_funds", time.time())
-
         date = box.ids["date"].text
         amount = box.ids["amount"].text
         from_account = box.ids["from-account"].text
         to_account = box.ids["to-account"].text
         note = box.ids["note"].text
 
-        if from_account == to_account:
-            raise ValueError("Accounts must be different!")
-
         if "(FROM)" in from_account or "(TO)" in to_account:
             raise ValueError("You must select an account!")
 
-        transaction_from = {
-            "date": date,
-            "type": "withdraw",
-            "amount": amount,
-            "account": from_account,
-            "category": "banktransfer",
-            "subcategory": "banktransfer",
-            "note": note,
-        }
-        transaction_to = {
-            "date": date,
-            "type": "deposit",
-            "amount": amount,
-            "account": to_account,
-            "category": "banktransfer",
-            "subcategory": "banktransfer",
-            "note": note,
-        }
-
-        # check that both accounts exist
-        validate_transaction(
-            item=transaction_from,
-            accounts=self.data_manager.accounts,
-            categories=self.data_manager.categories,
-            sub_categories=self.data_manager.sub_categories,
-        )
-        validate_transaction(
-            item=transaction_to,
-            accounts=self.data_manager.accounts,
-            categories=self.data_manager.categories,
-            sub_categories=self.data_manager.sub_categories,
-        )
-
-        # add new transactions to data manager
-        self.data_manager.add_transaction(transaction=transaction_from)
-        self.data_manager.add_transaction(transaction=transaction_to)
-        # add transactions to list
-        self.transaction_list.add_widget(
-            self.single_transaction_widget(transaction=transaction_from)
-        )
-        self.transaction_list.add_widget(
-            self.single_transaction_widget(transaction=transaction_to)
+        # both transactions are validated and saved together
+        self.data_manager.add_transfer(
+            date=date,
+            amount=amount,
+            from_account=from_account,
+            to_account=to_account,
+            note=note,
         )
+        # show the transactions at their place in the list
+        self.refresh_transactions()
         # dismiss input dialog
         self.transfer_dialog.dismiss()
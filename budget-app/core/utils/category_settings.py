@@ -1,38 +1,39 @@
 """Module to define the categories settings to insert in the settings page of the app."""
-import logging
-import time
 
+from kivy.clock import Clock
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.list import (
     IconLeftWidget,
     IconRightWidget,
     MDList,
     OneLineAvatarIconListItem,
+    TwoLineAvatarIconListItem,
 )
 from kivymd.uix.scrollview import MDScrollView
 from kivymd.uix.textfield import MDTextField
 
 from .dialogbox import DialogBuilder
-
-logger = logging.getLogger(__name__)
+from .tracing import traced
 
 
 class CategoryWidget:
     """Category widget to add and remove categories."""
 
+    @traced
     def __init__(self, data_manager):
-        logger.info("CategoryWidget: %s:  __init__", time.time())
         self.data_manager = data_manager
         self.category_list = MDList()
+        self.category_widgets = {}
         self.category_dialog = None
+        self.data_manager.add_listener(self.on_transactions_changed)
 
+    @traced
     def generate_category_list(self):
         """Generate a list of widgets to hold each category name.
 
         Returns:
             MDScrollView: list widget with all categories.
         """
-        logger.info("CategoryWidget: %s:  generate_category_list", time.time())
         for category in self.data_manager.categories:
             self.category_list.add_widget(self.single_category_list(category=category))
 
@@ -47,6 +48,7 @@ class CategoryWidget:
 
         return MDScrollView(self.category_list)
 
+    @traced
     def single_category_list(self, category):
         """Generate a single widget to hold the category name.
 
@@ -54,37 +56,73 @@ class CategoryWidget:
             category (str): category name.
 
         Returns:
-            OneLineAvatarIconListItem: widget with icon, description and delete button.
+            TwoLineAvatarIconListItem: widget with icon, description, usage
+                and delete button.
         """
-        logger.info("CategoryWidget: %s:  single_category_list", time.time())
-        return OneLineAvatarIconListItem(
+        self.category_widgets[category] = TwoLineAvatarIconListItem(
             IconLeftWidget(icon="bank"),
             IconRightWidget(
                 icon="delete",
                 on_release=lambda x, item=category: self.delete_category(item),
             ),
             text=category,
+            secondary_text=self.usage_description(category),
             id=category,
         )
+        return self.category_widgets[category]
+
+    def usage_description(self, category):
+        """Text with the number of transactions using a category.
+
+        Args:
+            category (str): category name.
 
+        Returns:
+            str: usage description.
+        """
+        count = self.data_manager.get_usage_count("category", category)
+        return f"used by {count} transactions"
+
+    @traced
+    def on_transactions_changed(self, operation, transactions):  # pylint: disable=W0613
+        """Refresh the usage of the categories touched by added/removed transactions.
+
+        Args:
+            operation (str): "add" or "remove".
+            transactions (list): list of transaction dicts.
+        """
+        items = {transaction["category"] for transaction in transactions}
+        # widgets must be updated from the main thread
+        Clock.schedule_once(lambda dt: self.refresh_usage(items))
+
+    @traced
+    def refresh_usage(self, items):
+        """Update the usage text of some category widgets.
+
+        Args:
+            items (set): category names.
+        """
+        for item in items:
+            if item in self.category_widgets:
+                self.category_widgets[item].secondary_text = self.usage_description(
+                    item
+                )
+
+    @traced
     def delete_category(self, category):
         """Remove a category from the list.
 
         Args:
             category (str): category name.
         """
-        logger.info("CategoryWidget: %s: delete_category", time.time())
-        # Remove the corresponding widget from the layout
-        widget_to_remove = next(
-            widget for widget in self.category_list.children if widget.id == category
-        )
-        self.category_list.remove_widget(widget_to_remove)
         self.data_manager.remove_category(category=category)
+        # Remove the corresponding widget from the layout
+        self.category_list.remove_widget(self.category_widgets.pop(category))
 
+    @traced
     def get_category_name(self, instance):
         """Get a new category name."""
 
-        logger.info("CategoryWidget: %s:  get_category_name", time.time())
         # initialize new input widget
         text_input = MDTextField(hint_text="Enter a new category")
         text_input.on_text_validate = lambda: self.add_category(
@@ -95,6 +133,7 @@ class CategoryWidget:
         # add text input to collect new account name
         self.category_list.add_widget(text_input)
 
+    @traced
     def add_category(self, input_widget, category):
         """Add a new category to the list.
 
@@ -102,7 +141,6 @@ class CategoryWidget:
             input_widget (widget): widget to remove.
             category (str): category name.
         """
-        logger.info("CategoryWidget: %s:  add_category", time.time())
         # remove text input widget (not needed anymore)
         self.category_list.remove_widget(input_widget)
         # add new account to data manager
@@ -118,9 +156,9 @@ class CategoryWidget:
             )
         )
 
+    @traced
     def get_category_dialog(self, instance):  # pylint: disable=W0613
         """Opens Pop-up box with a list of all categories."""
-        logger.info("CategoryWidget: %s:  get_category_dialog", time.time())
         if not self.category_dialog:
             # create dialog button
             self.category_dialog = DialogBuilder().build_confirmation_dialog(
@@ -0,0 +1,105 @@
+"""Atomic commit of several files of the data folder at once.
+
+All the files are first written next to their final path (``<path>.tmp``) and flushed
+to disk. Then a commit marker listing them is written, which is the commit point:
+the temporary files are moved in place and the marker is removed. If the app stops
+in between, the marker is found on the next start and the commit is completed
+(rolled forward); temporary files without a marker are discarded.
+"""
+import json
+import logging
+import os
+
+from .tracing import traced
+
+COMMIT_MARKER = "commit.json"
+TMP_SUFFIX = ".tmp"
+
+logger = logging.getLogger(__name__)
+
+
+@traced
+def atomic_commit(data_folder, writers):
+    """Write several files so that either all or none of them are updated.
+
+    Args:
+        data_folder (str): data folder path.
+        writers (dict): file path relative to the data folder -> function writing
+            the file content to an open text file.
+    """
+    for path, write in writers.items():
+        with open(
+            os.path.join(data_folder, path) + TMP_SUFFIX,
+            "w",
+            encoding="utf8",
+            newline="",
+        ) as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+
+    marker_path = os.path.join(data_folder, COMMIT_MARKER)
+    with open(marker_path + TMP_SUFFIX, "w", encoding="utf8") as file:
+        json.dump(list(writers), file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(marker_path + TMP_SUFFIX, marker_path)
+    fsync_folder(data_folder)
+
+    roll_forward(data_folder)
+
+
+@traced
+def roll_forward(data_folder):
+    """Complete an interrupted commit, if any.
+
+    Args:
+        data_folder (str): data folder path.
+
+    Returns:
+        bool: True if a commit was completed.
+    """
+    marker_path = os.path.join(data_folder, COMMIT_MARKER)
+    if not os.path.exists(marker_path):
+        return False
+
+    with open(marker_path, "r", encoding="utf8") as file:
+        paths = json.load(file)
+    for path in paths:
+        full_path = os.path.join(data_folder, path)
+        if os.path.exists(full_path + TMP_SUFFIX):
+            os.replace(full_path + TMP_SUFFIX, full_path)
+    for folder in {os.path.dirname(os.path.join(data_folder, path)) for path in paths}:
+        fsync_folder(folder)
+    os.remove(marker_path)
+    return True
+
+
+def discard_incomplete(data_folder, paths):
+    """Remove the temporary files left over by a commit that never reached its
+    commit point.
+
+    Args:
+        data_folder (str): data folder path.
+        paths (iterable): file paths relative to the data folder.
+    """
+    for path in [COMMIT_MARKER, *paths]:
+        tmp_path = os.path.join(data_folder, path) + TMP_SUFFIX
+        if os.path.exists(tmp_path):
+            logger.warning("commit: discarding incomplete file %s", tmp_path)
+            os.remove(tmp_path)
+
+
+def fsync_folder(folder):
+    """Flush a folder entry to disk, so that renames inside it are durable.
+
+    Args:
+        folder (str): folder path.
+    """
+    if not hasattr(os, "O_DIRECTORY"):  # e.g. on windows
+        return
+    descriptor = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
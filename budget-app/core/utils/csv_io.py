@@ -0,0 +1,126 @@
+"""Lean csv reader and writer of the transactions, built on the csv module.
+
+Startup only needs to parse the csv files into the transaction store, so it
+does not go through pandas (whose import alone costs hundreds of milliseconds):
+columns are parsed as strings, the ids and amounts converted to numbers and the
+other fields dictionary-encoded by TransactionStore.from_columns.
+"""
+import csv
+import math
+
+import numpy as np
+
+from .tracing import traced
+from .transaction_store import ID_FIELD, TransactionStore
+
+
+def read_columns(file, header=None):
+    """Parse csv rows into one list of values per column.
+
+    Args:
+        file: csv file (or iterable of lines) open in text mode.
+        header (list, optional): column names if the rows have no header line.
+            Defaults to None (first line).
+
+    Raises:
+        ValueError: Csv Error: if a row has more values than the header.
+
+    Returns:
+        dict: column name -> values (ids as int, amounts as float, others as str),
+            empty if the file has no header.
+    """
+    reader = csv.reader(file)
+    if header is None:
+        header = next(reader, None)
+        if header is None:
+            return {}
+    width = len(header)
+    rows = []
+    for row in reader:
+        if len(row) != width:
+            if not row:
+                # blank line
+                continue
+            if len(row) > width:
+                raise ValueError(
+                    f"Csv Error: line {reader.line_num} has {len(row)} values, "
+                    f"expected {width}."
+                )
+            # missing trailing values (e.g. an empty note) are empty strings
+            row += [""] * (width - len(row))
+        rows.append(row)
+    columns = {name: [] for name in header}
+    for name, values in zip(header, zip(*rows)):
+        columns[name] = list(values)
+    if ID_FIELD in columns:
+        columns[ID_FIELD] = [int(value) for value in columns[ID_FIELD]]
+    if "amount" in columns:
+        columns["amount"] = [
+            float(value) if value else math.nan for value in columns["amount"]
+        ]
+    return columns
+
+
+@traced
+def read_store(path):
+    """Read a csv file of transactions into a store.
+
+    Args:
+        path (str): csv file path.
+
+    Returns:
+        TransactionStore: store with the transactions of the file.
+    """
+    with open(path, "r", encoding="utf8", newline="") as file:
+        columns = read_columns(file)
+    return TransactionStore.from_columns(columns) if columns else TransactionStore()
+
+
+def concat_columns(parts, header):
+    """Concatenate the columns of several csv files.
+
+    Args:
+        parts (list): dicts of column name -> values.
+        header (list): column names.
+
+    Returns:
+        dict: column name -> values of all the parts.
+    """
+    return {
+        name: [value for part in parts for value in part.get(name, ())]
+        for name in header
+    }
+
+
+def iter_rows(columns):
+    """Iterate over the rows of some columns as dicts.
+
+    Args:
+        columns (dict): column name -> values.
+
+    Yields:
+        dict: values of a row.
+    """
+    for values in zip(*columns.values()):
+        yield dict(zip(columns, values))
+
+
+def write_columns(file, columns, header=True):
+    """Write columns of values as csv rows.
+
+    Args:
+        file: file open for writing (text mode, no newline translation).
+        columns (dict): column name -> values (lists or numpy arrays).
+        header (bool, optional): write the column names first. Defaults to True.
+    """
+    writer = csv.writer(file, lineterminator="\n")
+    if header:
+        writer.writerow(list(columns))
+    writer.writerows(
+        zip(
+            *(
+                values.tolist() if isinstance(values, np.ndarray) else values
+                for values in columns.values()
+            )
+        )
+    )
@@ -0,0 +1,411 @@
+"""Storage of the data in a csv file (transactions) and a json file (metadata).
+
+Transaction changes are appended to a journal file (data.journal) and merged
+into the csv file in the background once the journal grows past a size limit.
+
+Optionally a binary snapshot (data.arrow) is written together with the csv file
+and loaded instead of it when it is newer.
+
+The csv and json files are only replaced through atomic commits (see commit.py),
+each one recording a delta to the previous version in the history folder.
+
+The csv rows are sorted by month and indexed in data.index.json (see month_index.py),
+so that only the recent months can be loaded, the older ones being loaded on demand.
+"""
+import json
+import os
+import threading
+
+from .commit import atomic_commit, discard_incomplete, roll_forward
+from .csv_io import iter_rows, read_store, write_columns
+from .history import HISTORY_SIZE, VersionHistory
+from .journal import TransactionJournal
+from .month_index import (
+    DATA_INDEX,
+    read_index,
+    read_months,
+    sum_months,
+    write_csv_by_month,
+)
+from .snapshot import (
+    DATA_SNAPSHOT,
+    check_snapshot_support,
+    read_snapshot,
+    write_snapshot,
+)
+from .tracing import span, traced
+from .transaction_store import (
+    ID_FIELD,
+    TRANSACTION_FIELDS,
+    TransactionList,
+    TransactionStore,
+    month_key,
+)
+
+DATA_CSV = "data.csv"
+METADATA_JSON = "metadata.json"
+DATA_JOURNAL = "data.journal"
+# size (bytes) after which the journal is merged into the csv file
+JOURNAL_SIZE_LIMIT = 1024 * 1024
+
+
+class CsvStorage:  # pylint: disable=R0902,R0904
+    """Storage backend using data.csv, data.journal and metadata.json.
+
+    Mutating calls are expected to be serialized by the data manager.
+    """
+
+    @traced
+    def __init__(
+        self,
+        data_folder: str,
+        journal_size_limit=JOURNAL_SIZE_LIMIT,
+        snapshot=False,
+        history_size=HISTORY_SIZE,
+    ):
+        self.data_folder = data_folder
+        self.csv_path = os.path.join(data_folder, DATA_CSV)
+        self.json_path = os.path.join(data_folder, METADATA_JSON)
+        self.index_path = os.path.join(data_folder, DATA_INDEX)
+        self.journal = TransactionJournal(os.path.join(data_folder, DATA_JOURNAL))
+        self.journal_size_limit = journal_size_limit
+        self.history = VersionHistory(data_folder, history_size)
+        self._commit_lock = threading.Lock()
+        self.snapshot_path = None
+        if snapshot:
+            check_snapshot_support()
+            self.snapshot_path = os.path.join(data_folder, DATA_SNAPSHOT)
+        self.store = None
+        self.months_index = None
+        self.loaded_months = None  # None if all the months are loaded
+        self._compaction = None
+
+    @traced
+    def recover(self):
+        """Complete or discard a commit interrupted by a crash (done on startup)."""
+        if not roll_forward(self.data_folder):
+            discard_incomplete(self.data_folder, [DATA_CSV, DATA_INDEX, METADATA_JSON])
+
+    def is_empty(self):
+        """Checks if the data folder holds no data files.
+
+        Returns:
+            bool: True if no data file is found.
+        """
+        self.recover()
+        for file_name in os.listdir(self.data_folder):
+            # TODO manage case in which only one of the two files is present # pylint: disable=W0511
+            if file_name in {DATA_CSV, METADATA_JSON}:
+                return False
+        return True
+
+    @traced
+    def create(self, transactions, metadata):
+        """Create the data files.
+
+        Args:
+            transactions (list): list of transaction dicts.
+            metadata (dict): accounts, categories and subcategories.
+        """
+        fields = (
+            list(transactions[0]) if transactions else [ID_FIELD, *TRANSACTION_FIELDS]
+        )
+        columns = {
+            field: [transaction.get(field, "") for transaction in transactions]
+            for field in fields
+        }
+
+        atomic_commit(
+            self.data_folder,
+            {
+                DATA_CSV: lambda file: write_columns(file, columns),
+                METADATA_JSON: lambda file: json.dump(metadata, file, indent=4),
+            },
+        )
+
+    @traced
+    def load_csv(self):
+        """Load csv data file.
+
+        pandas is only imported here, the app loads the transactions
+        with the lean csv reader (see load_transactions).
+
+        Returns:
+            pandas.DataFrame: return a pandas dataframe of the csv file.
+        """
+        import pandas as pd  # pylint: disable=C0415
+
+        return pd.read_csv(self.csv_path)
+
+    @traced
+    def load_metadata(self):
+        """Load metadata json file.
+
+        Returns:
+            dict: accounts, categories and subcategories.
+        """
+        with open(self.json_path, "r", encoding="utf8") as file:
+            return json.load(file)
+
+    @traced
+    def save_metadata(self, metadata):
+        """Save metadata in the json file.
+
+        Args:
+            metadata (dict): accounts, categories and subcategories.
+        """
+        with self._commit_lock:
+            writers = {METADATA_JSON: lambda file: json.dump(metadata, file, indent=4)}
+            if os.path.exists(self.json_path):
+                writers.update(self.history.next_delta(metadata=self.load_metadata()))
+            atomic_commit(self.data_folder, writers)
+            self.history.prune()
+
+    @traced
+    def load_transactions(self, since=None):
+        """Load the transactions from the csv file and replay the journal on top.
+
+        Args:
+            since (str, optional): first month to load ("YYYYMM"), the older ones
+                are loaded on demand (see load_months). Defaults to None (all).
+
+        Returns:
+            TransactionStore: store with the loaded transactions.
+        """
+        self.wait()
+        self.recover()
+        self.months_index = read_index(self.index_path, self.csv_path)
+        self.loaded_months = None
+        if since is not None and self.months_index is not None:
+            window = {month for month in self.months_index["months"] if month >= since}
+            self.store = TransactionStore.from_columns(
+                read_months(self.csv_path, self.months_index, window)
+            )
+            # ids of the months not loaded are not reused
+            self.store.next_id = max(self.store.next_id, self.months_index["next_id"])
+            self.loaded_months = window
+        elif self.is_snapshot_newer():
+            self.store = read_snapshot(self.snapshot_path)
+        else:
+            self.store = read_store(self.csv_path)
+        self.replay_journal()
+
+        if self.journal.has_rotated():
+            # the last save did not complete, write the recovered data now
+            self.save_transactions(self.store)
+        elif self.journal.size() > self.journal_size_limit or (
+            since is not None and self.months_index is None
+        ):
+            # the month index is written with the csv file
+            self.compact()
+        return self.store
+
+    def unloaded_months(self, before=None):
+        """Months of the csv file that are not loaded yet.
+
+        Args:
+            before (str, optional): only the months before this one ("YYYYMM").
+                Defaults to None (all).
+
+        Returns:
+            list: sorted months ("YYYYMM").
+        """
+        if self.loaded_months is None:
+            return []
+        months = sorted(set(self.months_index["months"]) - self.loaded_months)
+        return (
+            months if before is None else [month for month in months if month < before]
+        )
+
+    def load_months(self, months):
+        """Add the transactions of some months to the loaded ones.
+
+        Args:
+            months (iterable): months to load ("YYYYMM"), loaded ones are skipped.
+        """
+        if self.loaded_months is None:
+            return
+        with self._commit_lock:
+            months = set(months) - self.loaded_months
+            if not months:
+                return
+            with span("CsvStorage.load_months", months=len(months)):
+                columns = read_months(self.csv_path, self.months_index, months)
+                for transaction in iter_rows(columns):
+                    self.store.append(transaction)
+            self.loaded_months |= months
+
+    def read_months(self, months):
+        """Read the transactions of some months without loading them.
+
+        Args:
+            months (iterable): months to read ("YYYYMM").
+
+        Returns:
+            TransactionStore: store with the transactions of the months.
+        """
+        with self._commit_lock:
+            return TransactionStore.from_columns(
+                read_months(self.csv_path, self.months_index, months)
+            )
+
+    def opening(self, before=None):
+        """Aggregates of the transactions not loaded.
+
+        Args:
+            before (str, optional): only the months before this one ("YYYYMM").
+                Defaults to None (all).
+
+        Returns:
+            dict: balance per account and usage counters per metadata field.
+        """
+        if self.loaded_months is None:
+            return sum_months({}, [])
+        return sum_months(self.months_index, self.unloaded_months(before))
+
+    def is_snapshot_newer(self):
+        """Checks if the snapshot is enabled and at least as recent as the csv file.
+
+        Returns:
+            bool: True if the snapshot should be loaded.
+        """
+        return (
+            self.snapshot_path is not None
+            and os.path.exists(self.snapshot_path)
+            and os.path.getmtime(self.snapshot_path) >= os.path.getmtime(self.csv_path)
+        )
+
+    @traced
+    def replay_journal(self):
+        """Apply the changes stored in the journal on top of the loaded transactions.
+
+        Records may already be part of the csv file (e.g. a rotated journal left over
+        by an interrupted save, or changes queued in write-behind mode while the
+        journal was compacted), so they are only applied if not present yet.
+        """
+        transactions = TransactionList(self.store)
+        for rotated in (True, False):
+            for operation, transaction in self.journal.replay(rotated=rotated):
+                # the month of the change needs to be loaded to apply it
+                self.load_months([month_key(transaction["date"])])
+                if operation == "add":
+                    if transaction not in transactions:
+                        transactions.append(transaction)
+                elif transaction in transactions:
+                    transactions.remove(transaction)
+
+    @traced
+    def save_transactions(self, store):
+        """Rewrite the csv file with all the transactions.
+
+        Args:
+            store (TransactionStore): store with all the transactions.
+        """
+        self.wait()
+        self.store = store
+        self.journal.rotate()
+        self.write_transactions(store, self.loaded_months)
+
+    @traced
+    def write_transactions(self, store, loaded_months=None):
+        """Write the transactions to the csv file (and snapshot)
+        and discard the rotated journal they include.
+
+        Args:
+            store (TransactionStore): transactions to write.
+            loaded_months (set, optional): months in the store, the other ones are
+                copied from the current csv file. Defaults to None (all).
+        """
+        columns = store.to_columns()
+
+        with self._commit_lock:
+            old_csv = None
+            if loaded_months is not None:
+                copy_months = set(self.months_index["months"]) - loaded_months
+                old_csv = (self.csv_path, self.months_index, copy_months)
+            months_index = {}
+            writers = {
+                DATA_CSV: lambda file: months_index.update(
+                    write_csv_by_month(file, columns, store.next_id, old_csv)
+                ),
+                DATA_INDEX: lambda file: json.dump(months_index, file),
+            }
+            # the rotated journal holds the changes since the previous version
+            writers.update(
+                self.history.next_delta(records=self.journal.replay(rotated=True))
+            )
+            atomic_commit(self.data_folder, writers)
+            self.months_index = months_index
+            self.history.prune()
+        if self.snapshot_path is not None and loaded_months is None:
+            write_snapshot(store, self.snapshot_path)
+        self.journal.discard_rotated()
+
+    @traced
+    def record(self, operation, transactions):
+        """Persist added or removed transactions by appending them to the journal.
+
+        Args:
+            operation (str): "add" or "remove".
+            transactions (list): list of transaction dicts.
+        """
+        self.journal.append(operation, transactions)
+        if self.journal.size() > self.journal_size_limit:
+            self.compact()
+
+    @traced
+    def compact(self):
+        """Merge the journal into the csv file in a background thread."""
+        if self._compaction is not None and self._compaction.is_alive():
+            return
+        self.journal.rotate()
+        self._compaction = threading.Thread(
+            target=self.write_transactions,
+            args=(
+                self.store.copy(),
+                None if self.loaded_months is None else set(self.loaded_months),
+            ),
+            daemon=True,
+        )
+        self._compaction.start()
+
+    def wait(self):
+        """Block until the running journal compaction (if any) is done."""
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+
+    @traced
+    def load_version(self, version):
+        """Load an older committed version of the data from the history.
+
+        Changes still in the journal are not part of any version.
+
+        Args:
+            version (int): version number (see history.versions()).
+
+        Returns:
+            tuple: TransactionStore and metadata dict of the version.
+        """
+        with self._commit_lock:
+            store = read_store(self.csv_path)
+            metadata = self.history.restore(store, self.load_metadata(), version)
+        return store, metadata
+
+    def balance(self, account):
+        """Sum of the amounts of an account.
+
+        Args:
+            account (str): account name.
+
+        Returns:
+            float: account balance.
+        """
+        return self.store.sum_amount("account", account) + self.opening()[
+            "balances"
+        ].get(account, 0)
+
+    def close(self):
+        """Wait for pending writes and close the journal."""
+        self.wait()
+        self.journal.close()
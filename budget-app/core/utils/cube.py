@@ -0,0 +1,212 @@
+"""Materialized aggregates of the transactions for the dashboard.
+
+The cube holds the sum of the amounts and the number of transactions for every
+combination of month, category, subcategory and account, plus one rollup for each
+subset of those dimensions (e.g. month x category, account alone, grand total).
+It is built by grouping the dictionary codes of the store with numpy (the rollups
+from the cells, not the rows) and every added or removed transaction updates
+one cell per rollup, so totals for any filter are a dict lookup.
+"""
+import itertools
+
+import numpy as np
+
+from .tracing import traced
+from .transaction_store import factorize, month_key
+
+DIMENSIONS = ("month", "category", "subcategory", "account")
+# every subset of the dimensions, in the DIMENSIONS order
+ROLLUPS = tuple(
+    subset
+    for size in range(len(DIMENSIONS) + 1)
+    for subset in itertools.combinations(DIMENSIONS, size)
+)
+
+
+class AggregateCube:
+    """Sums and counts of the transactions by month, category, subcategory and
+    account.
+    """
+
+    @traced
+    def __init__(self):
+        # rollup dimensions -> dimension values -> [sum, count]
+        self.rollups = {rollup: {} for rollup in ROLLUPS}
+
+    @classmethod
+    @traced
+    def from_store(cls, store):  # pylint: disable=R0914
+        """Build the cube of the alive transactions of a store.
+
+        Args:
+            store (TransactionStore): transactions.
+
+        Returns:
+            AggregateCube: cube of the transactions.
+        """
+        cube = cls()
+        positions = store.positions()
+        # only the distinct dates are converted to months
+        month_codes, months = factorize(
+            month_key(str(date)) for date in store.levels["date"]
+        )
+        codes = {"month": month_codes[store.codes["date"][positions]]}
+        levels = {"month": months}
+        for dimension in DIMENSIONS[1:]:
+            codes[dimension] = store.codes[dimension][positions]
+            levels[dimension] = store.levels[dimension]
+        amounts = store.amount[positions]
+        counts = np.ones(len(positions), dtype=np.int64)
+
+        # cells of all the dimensions from the rows, the rollups from the cells
+        cell_codes, cell_sums, cell_counts = _group(
+            codes, levels, DIMENSIONS, amounts, counts
+        )
+        for rollup in ROLLUPS:
+            rollup_codes, sums, numbers = _group(
+                cell_codes, levels, rollup, cell_sums, cell_counts
+            )
+            keys = zip(
+                *(
+                    _decode(levels[dimension], rollup_codes[dimension])
+                    for dimension in rollup
+                )
+            )
+            if not rollup:
+                keys = [()] * len(sums)
+            cube.rollups[rollup] = {
+                key: [total, number]
+                for key, total, number in zip(keys, sums.tolist(), numbers.tolist())
+                if number
+            }
+        return cube
+
+    def update(self, operation, transactions):
+        """Add or remove transactions from the cube.
+
+        Args:
+            operation (str): "add" or "remove".
+            transactions (list): list of transaction dicts.
+        """
+        sign = 1 if operation == "add" else -1
+        for transaction in transactions:
+            values = {
+                "month": month_key(transaction["date"]),
+                "category": transaction["category"],
+                "subcategory": transaction["subcategory"],
+                "account": transaction["account"],
+            }
+            for rollup, cells in self.rollups.items():
+                key = tuple(values[dimension] for dimension in rollup)
+                cell = cells.setdefault(key, [0.0, 0])
+                cell[0] += sign * transaction["amount"]
+                cell[1] += sign
+                if cell[1] == 0:
+                    del cells[key]
+
+    def total(self, **filters):
+        """Sum and number of the transactions matching some dimension values.
+
+        Args:
+            **filters: dimension name -> value (e.g. month="202401", account="N26").
+
+        Raises:
+            ValueError: Cube Error: Unknown dimension.
+
+        Returns:
+            tuple: sum of the amounts and number of transactions.
+        """
+        rollup = _rollup_of(filters)
+        cell = self.rollups[rollup].get(
+            tuple(filters[dimension] for dimension in rollup)
+        )
+        return (cell[0], cell[1]) if cell else (0.0, 0)
+
+    def breakdown(self, by, **filters):
+        """Sums and numbers of the transactions matching some dimension values,
+        for each value of another dimension.
+
+        Args:
+            by (str): dimension to break down (e.g. "category").
+            **filters: dimension name -> value (e.g. month="202401").
+
+        Raises:
+            ValueError: Cube Error: Unknown dimension.
+
+        Returns:
+            dict: value of the dimension -> (sum of the amounts, number).
+        """
+        rollup = _rollup_of({**filters, by: None})
+        position = rollup.index(by)
+        fixed = [
+            (index, filters[dimension])
+            for index, dimension in enumerate(rollup)
+            if dimension != by
+        ]
+        return {
+            key[position]: (cell[0], cell[1])
+            for key, cell in self.rollups[rollup].items()
+            if all(key[index] == value for index, value in fixed)
+        }
+
+
+def _rollup_of(dimensions):
+    """Rollup holding some dimensions.
+
+    Args:
+        dimensions (iterable): dimension names.
+
+    Raises:
+        ValueError: Cube Error: Unknown dimension.
+
+    Returns:
+        tuple: dimension names, in the DIMENSIONS order.
+    """
+    unknown = set(dimensions) - set(DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Cube Error: Unknown dimension: {sorted(unknown)}.")
+    return tuple(dimension for dimension in DIMENSIONS if dimension in dimensions)
+
+
+def _decode(levels, codes):
+    """Values of some codes.
+
+    Args:
+        levels (list): distinct values.
+        codes (numpy.ndarray): codes.
+
+    Returns:
+        list: value of each code.
+    """
+    values = np.empty(len(levels), dtype=object)
+    values[:] = levels
+    return values[codes].tolist()
+
+
+def _group(codes, levels, dimensions, sums, counts):
+    """Sum some values by the combined codes of some dimensions.
+
+    Args:
+        codes (dict): dimension -> array of codes.
+        levels (dict): dimension -> distinct values of the codes.
+        dimensions (tuple): dimensions to group by.
+        sums (numpy.ndarray): amounts to sum.
+        counts (numpy.ndarray): numbers of transactions to sum.
+
+    Returns:
+        tuple: codes of each group (dimension -> array), sum of the amounts and
+            number of transactions of each group.
+    """
+    # one integer key per combination of codes
+    keys = np.zeros(len(sums), dtype=np.int64)
+    for dimension in dimensions:
+        keys = keys * len(levels[dimension]) + codes[dimension]
+    groups, inverse = np.unique(keys, return_inverse=True)
+    group_codes = {}
+    for dimension in reversed(dimensions):
+        groups, group_codes[dimension] = np.divmod(groups, len(levels[dimension]))
+    return (
+        group_codes,
+        np.bincount(inverse, weights=sums, minlength=len(groups)),
+        np.bincount(inverse, weights=counts, minlength=len(groups)).astype(np.int64),
+    )
@@ -0,0 +1,96 @@
+"""Date model of the transactions.
+
+Dates are accepted as "YYYY-MM-DD" or "YYYY/MM/DD" strings (or date objects) and
+normalized once, when loaded or added, to the canonical "YYYY-MM-DD" format used
+in memory and in the files. The transaction store also keeps each date as a day
+number (days since 1970-01-01), so range filters and sorting compare integers.
+"""
+import datetime
+
+import numpy as np
+
+ISO_FORMAT = "%Y-%m-%d"
+DATE_FORMATS = (ISO_FORMAT, "%Y/%m/%d")
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+DATE_ERROR = (
+    "Transaction Error: Invalid date format. "
+    f"Must be in {' or '.join(DATE_FORMATS)}."
+)
+# day number of the dates that can not be parsed
+INVALID_DAY = np.iinfo(np.int32).min
+
+
+def normalize_date(date):
+    """Convert a date to the canonical "YYYY-MM-DD" format.
+
+    Args:
+        date (str, datetime.date): "YYYY-MM-DD" or "YYYY/MM/DD" date.
+
+    Raises:
+        ValueError: Transaction Error: Invalid date format.
+
+    Returns:
+        str: date in the "YYYY-MM-DD" format.
+    """
+    if isinstance(date, datetime.date):
+        return date.strftime(ISO_FORMAT)
+    if isinstance(date, str):
+        for date_format in DATE_FORMATS:
+            try:
+                return datetime.datetime.strptime(date, date_format).strftime(
+                    ISO_FORMAT
+                )
+            except ValueError:
+                continue
+    raise ValueError(DATE_ERROR)
+
+
+def is_date(date):
+    """Checks if a value is a date in one of the accepted formats.
+
+    Args:
+        date: value to check.
+
+    Returns:
+        bool: True if the value can be normalized.
+    """
+    try:
+        normalize_date(date)
+    except ValueError:
+        return False
+    return True
+
+
+def to_day(date):
+    """Day number of a date.
+
+    Args:
+        date (str): "YYYY-MM-DD" or "YYYY/MM/DD" date.
+
+    Raises:
+        ValueError: Transaction Error: Invalid date format.
+
+    Returns:
+        int: days since 1970-01-01.
+    """
+    return datetime.date.fromisoformat(normalize_date(date)).toordinal() - EPOCH_ORDINAL
+
+
+def normalize_dates(dates):
+    """Convert a column of dates to the canonical format, parsing each distinct
+    value once. Values that are not dates are left as they are.
+
+    Args:
+        dates (pandas.Series): dates.
+
+    Returns:
+        pandas.Series: normalized dates.
+    """
+    import pandas as pd  # pylint: disable=C0415
+
+    codes, uniques = pd.factorize(dates, use_na_sentinel=False)
+    normalized = np.array(
+        [normalize_date(date) if is_date(date) else date for date in uniques],
+        dtype=object,
+    )
+    return pd.Series(normalized[codes], index=dates.index, dtype=object)
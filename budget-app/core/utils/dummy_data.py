@@ -2,6 +2,7 @@
 """
 EXAMPLE_DATA = [
     {
+        "id": 1,
         "date": "2018-01-03",
         "type": "income",
         "amount": 94.0,
@@ -11,6 +12,7 @@ EXAMPLE_DATA = [
         "note": "may",
     },
     {
+        "id": 2,
         "date": "2018-01-02",
         "type": "income",
         "amount": 39.48,
@@ -20,6 +22,7 @@ EXAMPLE_DATA = [
         "note": "christmas",
     },
     {
+        "id": 3,
         "date": "2018-05-11",
         "type": "expense",
         "amount": -7.0,
@@ -29,6 +32,7 @@ EXAMPLE_DATA = [
         "note": "beer",
     },
     {
+        "id": 4,
         "date": "2018-05-18",
         "type": "expense",
         "amount": -9.5,
@@ -38,6 +42,7 @@ EXAMPLE_DATA = [
         "note": "bus",
     },
     {
+        "id": 5,
         "date": "2018-05-11",
         "type": "expense",
         "amount": -7.0,
@@ -47,6 +52,7 @@ EXAMPLE_DATA = [
         "note": "wine",
     },
     {
+        "id": 6,
         "date": "2018-05-18",
         "type": "expense",
         "amount": -9.5,
@@ -56,6 +62,7 @@ EXAMPLE_DATA = [
         "note": "penny",
     },
     {
+        "id": 7,
         "date": "2020-12-10",
         "type": "expense",
         "amount": -50.0,
@@ -65,6 +72,7 @@ EXAMPLE_DATA = [
         "note": "to Wallet",
     },
     {
+        "id": 8,
         "date": "2020-12-16",
         "type": "income",
         "amount": 50.0,
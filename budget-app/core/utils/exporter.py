@@ -0,0 +1,126 @@
+"""Streaming export of the transactions to a csv or newline-delimited json file.
+
+The transactions are read from the data manager one chunk at a time and written
+as they are read, so memory use does not depend on the number of transactions.
+"""
+# pylint: disable=R0801
+import csv
+import json
+import logging
+import os
+import threading
+
+from .tracing import traced
+from .transaction_store import ID_FIELD, TRANSACTION_FIELDS
+
+EXPORT_FORMATS = {"csv", "json"}
+
+logger = logging.getLogger(__name__)
+
+
+class DataExporter:  # pylint: disable=R0902
+    """Export the transactions of the data manager to a file.
+
+    The file is written next to its final path and only moved there once complete,
+    so a cancelled or failed export never leaves a partial file behind.
+
+    Args:
+        data_manager (DataManager): data manager holding the transactions.
+        path (str): export file path.
+        file_format (str, optional): "csv" or "json" (one json object per line).
+            Defaults to "csv".
+        filters (dict, optional): keyword arguments of DataManager.iter_transactions
+            (start_date, end_date, accounts, categories). Defaults to None.
+        on_progress (function, optional): called with the number of exported
+            transactions after each chunk. Defaults to None.
+
+    Raises:
+        ValueError: Mode Error: Format can only be 'csv' or 'json'!
+    """
+
+    @traced
+    def __init__(  # pylint: disable=R0913
+        self,
+        data_manager,
+        path: str,
+        file_format="csv",
+        filters=None,
+        on_progress=None,
+    ):
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError("Mode Error: Format can only be 'csv' or 'json'!")
+        self.data_manager = data_manager
+        self.path = path
+        self.file_format = file_format
+        self.filters = filters or {}
+        self.on_progress = on_progress
+        self.cancel_event = threading.Event()
+        self.exported = 0
+        self._thread = None
+
+    @traced
+    def start(self):
+        """Run the export in a background thread.
+
+        Returns:
+            threading.Thread: export thread.
+        """
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    @traced
+    def cancel(self):
+        """Stop the export after the chunk being written."""
+        self.cancel_event.set()
+
+    def is_running(self):
+        """Checks if the background export is running.
+
+        Returns:
+            bool: True if the export thread is alive.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    @traced
+    def run(self):
+        """Write the transactions to the export file chunk by chunk.
+
+        Returns:
+            bool: False if the export was cancelled (no file is written).
+        """
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf8", newline="") as file:
+            write_chunk = self.get_writer(file)
+            for transactions in self.data_manager.iter_transactions(**self.filters):
+                write_chunk(transactions)
+                self.exported += len(transactions)
+                if self.on_progress is not None:
+                    self.on_progress(self.exported)
+                if self.cancel_event.is_set():
+                    break
+
+        if self.cancel_event.is_set():
+            logger.info("DataExporter: export cancelled")
+            os.remove(tmp_path)
+            return False
+        os.replace(tmp_path, self.path)
+        return True
+
+    def get_writer(self, file):
+        """Build the function writing a chunk of transactions in the file format.
+
+        Args:
+            file: open export file.
+
+        Returns:
+            function: function taking a list of transaction dicts.
+        """
+        if self.file_format == "json":
+            return lambda transactions: file.writelines(
+                json.dumps(transaction) + "\n" for transaction in transactions
+            )
+
+        writer = csv.DictWriter(file, fieldnames=(ID_FIELD,) + TRANSACTION_FIELDS)
+        writer.writeheader()
+        return writer.writerows
@@ -0,0 +1,209 @@
+"""Fenwick (binary indexed) trees of the amounts by day.
+
+A tree holds the sum of the amounts of each day over a range of day numbers
+(days since 1970-01-01, see dates.py) and answers prefix sums ("balance on a date")
+and range sums ("spend between two dates") in O(log n), with O(log n) updates.
+The range of days grows when a transaction falls outside of it.
+"""
+
+import numpy as np
+
+from .dates import INVALID_DAY
+from .tracing import traced
+
+
+class DayFenwick:
+    """Fenwick tree of the sum of the amounts of each day.
+
+    Args:
+        first_day (int): first day number of the tree.
+        totals (numpy.ndarray): sum of the amounts of each day from first_day on.
+    """
+
+    def __init__(self, first_day, totals):
+        self.first_day = int(first_day)
+        self.totals = np.asarray(totals, dtype=np.float64).copy()
+        self.tree = _build_tree(self.totals)
+
+    @classmethod
+    def from_days(cls, days, amounts):
+        """Build a tree from the day numbers and amounts of some transactions.
+
+        Args:
+            days (numpy.ndarray): day number of each transaction.
+            amounts (numpy.ndarray): amount of each transaction.
+
+        Returns:
+            DayFenwick: tree of the transactions.
+        """
+        if len(days) == 0:
+            return cls(0, np.zeros(0))
+        first_day = int(days.min())
+        totals = np.bincount(days - first_day, weights=amounts)
+        return cls(first_day, totals)
+
+    @property
+    def last_day(self):
+        """Last day number of the tree."""
+        return self.first_day + len(self.totals) - 1
+
+    def _resize(self, day):
+        """Grow the range of days to include a day, with some margin so that the
+        tree is rebuilt O(log n) times for n days.
+        """
+        margin = max(len(self.totals), 32)
+        if self.totals.size == 0:
+            first_day, last_day = day, day + margin
+        elif day < self.first_day:
+            first_day, last_day = day - margin, self.last_day
+        else:
+            first_day, last_day = self.first_day, day + margin
+        totals = np.zeros(last_day - first_day + 1)
+        offset = self.first_day - first_day
+        totals[offset : offset + len(self.totals)] = self.totals
+        self.first_day = first_day
+        self.totals = totals
+        self.tree = _build_tree(totals)
+
+    def add(self, day, amount):
+        """Add an amount to a day.
+
+        Args:
+            day (int): day number.
+            amount (float): amount to add (negative to remove it).
+        """
+        if self.totals.size == 0 or not self.first_day <= day <= self.last_day:
+            self._resize(day)
+        index = day - self.first_day
+        self.totals[index] += amount
+        index += 1  # the tree is 1-based
+        while index < len(self.tree):
+            self.tree[index] += amount
+            index += index & -index
+
+    def prefix_sum(self, day):
+        """Sum of the amounts up to a day (included).
+
+        Args:
+            day (int): day number.
+
+        Returns:
+            float: sum of the amounts.
+        """
+        index = min(day, self.last_day) - self.first_day + 1
+        total = 0.0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return float(total)
+
+    def range_sum(self, first_day, last_day):
+        """Sum of the amounts between two days (both included).
+
+        Args:
+            first_day (int): first day number.
+            last_day (int): last day number.
+
+        Returns:
+            float: sum of the amounts.
+        """
+        if last_day < first_day:
+            return 0.0
+        return self.prefix_sum(last_day) - self.prefix_sum(first_day - 1)
+
+
+class FenwickIndex:
+    """Day trees of the amounts for each value of a transaction field
+    (e.g. one tree per account).
+
+    Args:
+        field (str): categorical field name (e.g. "account").
+    """
+
+    @traced
+    def __init__(self, field):
+        self.field = field
+        self.trees = {}
+
+    @classmethod
+    @traced
+    def from_store(cls, store, field):
+        """Build the trees of the alive transactions of a store.
+
+        Args:
+            store (TransactionStore): transactions.
+            field (str): categorical field name (e.g. "account").
+
+        Returns:
+            FenwickIndex: trees of the transactions.
+        """
+        index = cls(field)
+        positions = store.positions()
+        # transactions without a valid date can not be placed on a day
+        positions = positions[store.days[positions] != INVALID_DAY]
+        days = store.days[positions].astype(np.int64)
+        amounts = store.amount[positions]
+        codes = store.codes[field][positions]
+        for code in np.unique(codes):
+            mask = codes == code
+            index.trees[store.levels[field][code]] = DayFenwick.from_days(
+                days[mask], amounts[mask]
+            )
+        return index
+
+    def update(self, operation, days, transactions):
+        """Add or remove transactions from the trees.
+
+        Args:
+            operation (str): "add" or "remove".
+            days (list): day number of each transaction.
+            transactions (list): list of transaction dicts.
+        """
+        sign = 1 if operation == "add" else -1
+        for day, transaction in zip(days, transactions):
+            tree = self.trees.get(transaction[self.field])
+            if tree is None:
+                tree = self.trees[transaction[self.field]] = DayFenwick.from_days(
+                    np.zeros(0, dtype=np.int64), np.zeros(0)
+                )
+            tree.add(day, sign * transaction["amount"])
+
+    def prefix_sum(self, value, day):
+        """Sum of the amounts of a field value up to a day (included).
+
+        Args:
+            value (str): field value (e.g. account name).
+            day (int): day number.
+
+        Returns:
+            float: sum of the amounts.
+        """
+        tree = self.trees.get(value)
+        return tree.prefix_sum(day) if tree is not None else 0.0
+
+    def range_sum(self, value, first_day, last_day):
+        """Sum of the amounts of a field value between two days (both included).
+
+        Args:
+            value (str): field value (e.g. category name).
+            first_day (int): first day number.
+            last_day (int): last day number.
+
+        Returns:
+            float: sum of the amounts.
+        """
+        tree = self.trees.get(value)
+        return tree.range_sum(first_day, last_day) if tree is not None else 0.0
+
+
+def _build_tree(totals):
+    """Fenwick tree (1-based) of some values, built in O(n) from their cumulative
+    sums: node i holds the sum of the values (i - lowbit(i), i].
+    """
+    size = len(totals)
+    cumulative = np.zeros(size + 1)
+    np.cumsum(totals, out=cumulative[1:])
+    nodes = np.arange(size + 1)
+    tree = cumulative - cumulative[nodes - (nodes & -nodes)]
+    tree[0] = 0.0
+    return tree
@@ -0,0 +1,158 @@
+"""History of the committed versions of the data, stored as reverse deltas.
+
+Only the last version is stored in full (data.csv and metadata.json). For every
+commit a small delta file (history/<version>.json) is written, holding what is needed
+to go back from the new version to the previous one:
+``{"remove_ids": [...], "add": [transaction, ...], "metadata": {...}}``
+(metadata only if it changed). Older versions are rebuilt by applying the deltas
+from the newest to the oldest, and the history is pruned by deleting the oldest deltas.
+"""
+import json
+import logging
+import os
+
+from .tracing import traced
+from .transaction_store import ID_FIELD
+
+HISTORY_FOLDER = "history"
+# number of versions kept besides the last one
+HISTORY_SIZE = 50
+
+logger = logging.getLogger(__name__)
+
+
+class VersionHistory:
+    """Reverse deltas of the last committed versions of the data folder."""
+
+    @traced
+    def __init__(self, data_folder: str, size=HISTORY_SIZE):
+        self.data_folder = data_folder
+        self.folder = os.path.join(data_folder, HISTORY_FOLDER)
+        self.size = size
+
+    def versions(self):
+        """Versions that can be restored, the last one being the current version.
+
+        Returns:
+            list: sorted version numbers.
+        """
+        if not os.path.isdir(self.folder):
+            return [0]
+        versions = sorted(
+            int(name[: -len(".json")])
+            for name in os.listdir(self.folder)
+            if name.endswith(".json") and name[: -len(".json")].isdigit()
+        )
+        return versions + [versions[-1] + 1] if versions else [0]
+
+    @property
+    def current_version(self):
+        """Version of the committed data.
+
+        Returns:
+            int: version number.
+        """
+        return self.versions()[-1]
+
+    @staticmethod
+    def delta_path(version):
+        """Path of a delta file, relative to the data folder.
+
+        Args:
+            version (int): version the delta goes back to.
+
+        Returns:
+            str: delta file path.
+        """
+        return os.path.join(HISTORY_FOLDER, f"{version:06d}.json")
+
+    def next_delta(self, records=(), metadata=None):
+        """Build the delta going back from the version being committed to the
+        current one.
+
+        Args:
+            records (iterable, optional): (operation, transaction) changes applied
+                since the current version. Defaults to ().
+            metadata (dict, optional): current metadata, if it changes.
+                Defaults to None.
+
+        Returns:
+            dict: delta file path (relative to the data folder) -> function writing
+                the delta to an open file, empty if no history is kept.
+        """
+        if self.size <= 0:
+            return {}
+        delta = reverse_delta(records)
+        if metadata is not None:
+            delta["metadata"] = metadata
+
+        os.makedirs(self.folder, exist_ok=True)
+        return {
+            self.delta_path(self.current_version): lambda file: json.dump(delta, file)
+        }
+
+    def prune(self):
+        """Delete the oldest deltas, keeping the last `size` versions."""
+        versions = self.versions()[:-1]
+        for version in versions[: max(len(versions) - self.size, 0)]:
+            logger.info("VersionHistory: pruning version %s", version)
+            os.remove(os.path.join(self.data_folder, self.delta_path(version)))
+
+    @traced
+    def restore(self, store, metadata, version):
+        """Rebuild an older version from the current one.
+
+        Args:
+            store (TransactionStore): transactions of the current version,
+                modified in place.
+            metadata (dict): metadata of the current version.
+            version (int): version to go back to.
+
+        Raises:
+            ValueError: 404 Error: Version: {version} not found!
+
+        Returns:
+            dict: metadata of the requested version.
+        """
+        versions = self.versions()
+        if version not in versions:
+            raise ValueError(f"404 Error: Version: {version} not found!")
+
+        for delta_version in reversed(versions[versions.index(version) : -1]):
+            path = os.path.join(self.data_folder, self.delta_path(delta_version))
+            with open(path, "r", encoding="utf8") as file:
+                delta = json.load(file)
+            for transaction_id in delta["remove_ids"]:
+                if transaction_id in store.index:
+                    store.remove_at(store.index[transaction_id])
+            for transaction in delta["add"]:
+                if transaction[ID_FIELD] not in store.index:
+                    store.append(transaction)
+            metadata = delta.get("metadata", metadata)
+        return metadata
+
+
+def reverse_delta(records):
+    """Invert a sequence of changes.
+
+    Args:
+        records (iterable): (operation, transaction) changes.
+
+    Returns:
+        dict: ids of the transactions to remove and transactions to add back
+            to undo the changes.
+    """
+    added = {}
+    removed = {}
+    for operation, transaction in records:
+        transaction_id = transaction.get(ID_FIELD)
+        if transaction_id is None:  # journal written before transactions had ids
+            continue
+        if operation == "add":
+            added[transaction_id] = True
+        elif transaction_id in added:
+            # added and removed again: nothing to undo
+            del added[transaction_id]
+        else:
+            removed[transaction_id] = transaction
+    return {"remove_ids": list(added), "add": list(removed.values())}
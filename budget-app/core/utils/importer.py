@@ -0,0 +1,206 @@
+"""Streaming import of transactions from a csv file (e.g. a bank export).
+
+The file is read in chunks of rows, so memory use does not depend on the file size.
+Each chunk is validated one column at a time and its valid rows are added to the
+data manager as a single batch. Rows that can not be imported are written to a reject
+file together with the reason, instead of aborting the import.
+"""
+import csv
+import logging
+import os
+import threading
+
+from .dates import normalize_dates
+from .tracing import traced
+from .transaction_store import TRANSACTION_FIELDS, signed_amount
+from .validator import validate_transactions
+
+IMPORT_REJECTS = "rejected.csv"
+CHUNK_SIZE = 10000
+ERROR_FIELD = "error"
+
+logger = logging.getLogger(__name__)
+
+
+class CsvImporter:  # pylint: disable=R0902
+    """Import the transactions of a csv file through the data manager.
+
+    The csv file needs a column for each transaction field, other columns
+    (e.g. the transaction id) are ignored. Amounts can be signed: the sign is
+    given by the transaction type.
+    """
+
+    @traced
+    def __init__(  # pylint: disable=R0913
+        self,
+        data_manager,
+        path: str,
+        chunk_size=CHUNK_SIZE,
+        reject_path=None,
+        on_progress=None,
+    ):
+        self.data_manager = data_manager
+        self.path = path
+        self.chunk_size = chunk_size
+        self.reject_path = reject_path or os.path.join(
+            data_manager.data_folder, IMPORT_REJECTS
+        )
+        self.on_progress = on_progress
+        self.cancel_event = threading.Event()
+        self.imported = 0
+        self.rejected = 0
+        self._thread = None
+
+    @traced
+    def start(self):
+        """Run the import in a background thread.
+
+        Returns:
+            threading.Thread: import thread.
+        """
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    @traced
+    def cancel(self):
+        """Stop the import after the chunk being imported.
+
+        The chunks imported until then are kept.
+        """
+        self.cancel_event.set()
+
+    def is_running(self):
+        """Checks if the background import is running.
+
+        Returns:
+            bool: True if the import thread is alive.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    @traced
+    def run(self):
+        """Import the csv file chunk by chunk.
+
+        Raises:
+            ValueError: Import Error: if a transaction field column is missing.
+
+        Returns:
+            bool: False if the import was cancelled.
+        """
+        # pandas is only imported when a file is imported
+        import pandas as pd  # pylint: disable=C0415
+
+        total_size = max(os.path.getsize(self.path), 1)
+        with open(self.path, "r", encoding="utf8", newline="") as file, open(
+            self.reject_path, "w", encoding="utf8", newline=""
+        ) as reject_file:
+            reader = pd.read_csv(
+                file, chunksize=self.chunk_size, dtype=str, keep_default_na=False
+            )
+            reject_writer = None
+            for chunk in reader:
+                if reject_writer is None:
+                    missing = set(TRANSACTION_FIELDS) - set(chunk.columns)
+                    if missing:
+                        raise ValueError(
+                            f"Import Error: missing columns: {sorted(missing)}."
+                        )
+                    reject_writer = csv.DictWriter(
+                        reject_file, fieldnames=[*chunk.columns, ERROR_FIELD]
+                    )
+                    reject_writer.writeheader()
+
+                self.import_chunk(chunk, reject_writer)
+
+                if self.on_progress is not None:
+                    progress = min(file.tell() / total_size, 1.0)
+                    self.on_progress(self.imported, self.rejected, progress)
+                if self.cancel_event.is_set():
+                    logger.info("CsvImporter: import cancelled")
+                    return False
+        return True
+
+    @traced
+    def import_chunk(self, chunk, reject_writer):  # pylint: disable=R0914
+        """Validate a chunk of rows and add the valid ones as a single batch.
+
+        Args:
+            chunk (pandas.DataFrame): csv rows as strings.
+            reject_writer (csv.DictWriter): writer of the reject file.
+        """
+        transactions_df = to_transactions(chunk)
+        metadata_sets = self.data_manager.metadata_sets
+        invalid, messages = validate_transactions(
+            transactions_df,
+            accounts=metadata_sets["account"],
+            categories=metadata_sets["category"],
+            sub_categories=metadata_sets["subcategory"],
+        )
+
+        rows = chunk.to_dict("records")
+        valid_rows = []
+        transactions = []
+        chunk_keys = set()
+        for row, transaction, is_invalid, error in zip(
+            rows, transactions_df.to_dict("records"), invalid, messages
+        ):
+            key = tuple(transaction.values())
+            if not is_invalid and key in chunk_keys:
+                error = f"Integrity Error: Item: {transaction} repeated!"
+            elif not is_invalid and self.is_stored(transaction):
+                error = f"Integrity Error: Item: {transaction} already exists!"
+            if error:
+                reject_writer.writerow({**row, ERROR_FIELD: error})
+                self.rejected += 1
+                continue
+            chunk_keys.add(key)
+            valid_rows.append(row)
+            transactions.append(transaction)
+
+        try:
+            self.data_manager.add_transactions(transactions=transactions)
+        except ValueError as error:
+            # data changed since the validation: the whole chunk is rejected
+            for row in valid_rows:
+                reject_writer.writerow({**row, ERROR_FIELD: str(error)})
+            self.rejected += len(valid_rows)
+            return
+        self.imported += len(transactions)
+
+    def is_stored(self, transaction):
+        """Checks if a valid transaction of the file is already in the data.
+
+        Args:
+            transaction (dict): transaction with a positive amount.
+
+        Returns:
+            bool: True if the data holds the same transaction (with its signed
+            amount, e.g. negative for an expense).
+        """
+        amount = signed_amount(transaction["type"], transaction["amount"])
+        return {**transaction, "amount": amount} in self.data_manager.transactions
+
+
+def to_transactions(chunk):
+    """Build the transactions of a chunk of csv rows.
+
+    Args:
+        chunk (pandas.DataFrame): csv rows as strings.
+
+    Returns:
+        pandas.DataFrame: one column per transaction field, with positive amounts
+        and "YYYY-MM-DD" dates (invalid ones are left as they are and reported
+        by the validator).
+    """
+    import pandas as pd  # pylint: disable=C0415
+
+    transactions_df = pd.DataFrame(
+        {field: chunk[field].str.strip() for field in TRANSACTION_FIELDS}
+    )
+    transactions_df["date"] = normalize_dates(transactions_df["date"])
+    amount = pd.to_numeric(transactions_df["amount"], errors="coerce").abs()
+    transactions_df["amount"] = amount.astype(object).where(
+        amount.notna(), transactions_df["amount"]
+    )
+    return transactions_df
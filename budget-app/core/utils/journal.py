@@ -0,0 +1,122 @@
+"""Append-only journal to persist transaction changes without rewriting the data file."""
+import json
+import logging
+import os
+import shutil
+
+from .tracing import traced
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = {"add", "remove"}
+
+
+class TransactionJournal:
+    """Append-only log of the transactions added and removed since the last save.
+
+    Each line of the journal is a json record:
+    ``{"op": "add" | "remove", "transactions": [transaction, ...]}``
+
+    Before the data file is rewritten the journal is rotated to ``<path>.old``,
+    so that a crash during the rewrite can be recovered by replaying it again.
+    """
+
+    @traced
+    def __init__(self, path: str):
+        self.path = path
+        self.rotated_path = path + ".old"
+        self._file = None
+
+    @traced
+    def append(self, operation, transactions):
+        """Append a record to the journal and flush it to disk.
+
+        Args:
+            operation (str): "add" or "remove".
+            transactions (list): list of transaction dicts.
+
+        Raises:
+            ValueError: Mode Error: Operation can only be 'add' or 'remove'!
+        """
+        if operation not in OPERATIONS:
+            raise ValueError("Mode Error: Operation can only be 'add' or 'remove'!")
+
+        record = json.dumps({"op": operation, "transactions": list(transactions)})
+
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf8")  # pylint: disable=R1732
+        self._file.write(record + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    @traced
+    def replay(self, rotated=False):
+        """Read back the journal records in the order they were written.
+
+        A partially written last line (e.g. after a crash) is skipped.
+
+        Args:
+            rotated (bool, optional): read the rotated journal. Defaults to False.
+
+        Yields:
+            tuple: operation name and transaction dict.
+        """
+        path = self.rotated_path if rotated else self.path
+        if not os.path.exists(path):
+            return
+
+        with open(path, "r", encoding="utf8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("TransactionJournal: skipping corrupted record")
+                    continue
+                for transaction in record["transactions"]:
+                    yield record["op"], transaction
+
+    def size(self):
+        """Size of the journal on disk.
+
+        Returns:
+            int: size in bytes.
+        """
+        if not os.path.exists(self.path):
+            return 0
+        return os.path.getsize(self.path)
+
+    def has_rotated(self):
+        """Checks if a rotated journal is left over (i.e. a save did not complete).
+
+        Returns:
+            bool: True if the rotated journal exists.
+        """
+        return os.path.exists(self.rotated_path)
+
+    @traced
+    def rotate(self):
+        """Move the current journal aside and start a new empty one."""
+        self.close()
+        if not os.path.exists(self.path):
+            return
+        if os.path.exists(self.rotated_path):
+            # a previous save did not complete: keep its records as well
+            with open(self.path, "r", encoding="utf8") as src, open(
+                self.rotated_path, "a", encoding="utf8"
+            ) as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(self.path)
+        else:
+            os.replace(self.path, self.rotated_path)
+
+    @traced
+    def discard_rotated(self):
+        """Delete the rotated journal once its changes are saved in the data file."""
+        if os.path.exists(self.rotated_path):
+            os.remove(self.rotated_path)
+
+    def close(self):
+        """Close the journal file if open."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,64 @@
+"""Module to build bottom navbar items whose content is built on first use.
+
+Only the visible page has to be built before the first frame: the other items
+start empty and build their content when they are first entered, or earlier
+when prewarmed once the app is idle.
+"""
+from collections import deque
+
+from kivy.clock import Clock
+from kivymd.uix.bottomnavigation import MDBottomNavigationItem
+
+from .tracing import span
+
+# seconds after the first frame before the hidden pages are prewarmed
+PREWARM_DELAY = 1
+
+
+class LazyNavigationItem(MDBottomNavigationItem):  # pylint: disable=R0901
+    """Bottom navbar item that builds its page content the first time it is
+    entered (or when prewarmed).
+
+    Args:
+        build_content (function): returns the widget with the page content.
+        **kwargs: MDBottomNavigationItem arguments (name, text, icon...).
+    """
+
+    def __init__(self, build_content, **kwargs):
+        super().__init__(**kwargs)
+        self.build_content = build_content
+        self.is_built = False
+
+    def on_pre_enter(self, *args):
+        """Build the page content before the page is shown the first time."""
+        self.build()
+        return super().on_pre_enter(*args)
+
+    def build(self):
+        """Build the page content, once."""
+        if self.is_built:
+            return
+        self.is_built = True
+        with span("LazyNavigationItem.build", page=self.name):
+            self.add_widget(self.build_content())
+
+
+def prewarm(items, delay=PREWARM_DELAY):
+    """Build the content of some lazy items in the background of the main loop,
+    one item per frame so the app stays responsive.
+
+    Args:
+        items (list): LazyNavigationItem to build.
+        delay (float, optional): seconds before the first one is built.
+            Defaults to PREWARM_DELAY.
+    """
+    pending = deque(items)
+
+    def build_next(dt):  # pylint: disable=W0613
+        while pending and pending[0].is_built:
+            pending.popleft()
+        if pending:
+            pending.popleft().build()
+            Clock.schedule_once(build_next)
+
+    Clock.schedule_once(build_next, delay)
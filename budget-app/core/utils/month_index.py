@@ -0,0 +1,173 @@
+"""Month index of the csv file, to load only some months of the transactions.
+
+The csv file is written with its rows sorted by month, and next to it an index
+file (data.index.json) with, for every month, the byte range of its rows and
+the aggregates needed without loading them (balance per account and number of
+transactions per account, category and subcategory):
+``{"size": ..., "next_id": ..., "header": [...], "months": {"YYYYMM": {...}}}``
+"""
+import io
+import json
+import logging
+import os
+
+import numpy as np
+
+from .csv_io import read_columns, write_columns
+from .tracing import traced
+from .transaction_store import METADATA_FIELDS, factorize, month_key
+
+DATA_INDEX = "data.index.json"
+
+logger = logging.getLogger(__name__)
+
+
+def read_index(index_path, csv_path):
+    """Read the month index of a csv file.
+
+    Args:
+        index_path (str): index file path.
+        csv_path (str): csv file path.
+
+    Returns:
+        dict: month index, None if missing or not matching the csv file.
+    """
+    if not os.path.exists(index_path) or not os.path.exists(csv_path):
+        return None
+    with open(index_path, "r", encoding="utf8") as file:
+        index = json.load(file)
+    if index["size"] != os.path.getsize(csv_path):
+        logger.warning("month_index: index does not match %s", csv_path)
+        return None
+    return index
+
+
+@traced
+def write_csv_by_month(file, columns, next_id, old_csv=None):  # pylint: disable=R0914
+    """Write transactions to a csv file sorted by month and build its month index.
+
+    Args:
+        file: csv file open for writing (text mode, no newline translation).
+        columns (dict): field name -> numpy array of the transactions of the
+            loaded months (see TransactionStore.to_columns).
+        next_id (int): next transaction id.
+        old_csv (tuple, optional): csv file path, its month index and the months
+            to copy from it as they are (months not loaded). Defaults to None.
+
+    Returns:
+        dict: month index of the written file.
+    """
+    index = {"next_id": int(next_id), "header": list(columns), "months": {}}
+    write_columns(file, {name: [] for name in columns})
+
+    months = np.array([month_key(str(date)) for date in columns["date"]], dtype=object)
+    order = np.argsort(months, kind="stable")
+    columns = {name: np.asarray(values)[order] for name, values in columns.items()}
+    months = months[order]
+    stats = month_stats(columns, months)
+    month_values, starts = np.unique(months, return_index=True)
+    ranges = dict(zip(month_values, zip(starts, [*starts[1:], len(months)])))
+
+    old_path, old_index, copy_months = old_csv or (os.devnull, {"months": {}}, ())
+    with open(old_path, "rb") as old_file:
+        for month in sorted(set(ranges) | set(copy_months)):
+            offset = file.tell()
+            if month in ranges:
+                start, stop = ranges[month]
+                write_columns(
+                    file,
+                    {name: values[start:stop] for name, values in columns.items()},
+                    header=False,
+                )
+                entry = stats[month]
+            else:
+                entry = old_index["months"][month]
+                old_file.seek(entry["offset"])
+                file.write(old_file.read(entry["end"] - entry["offset"]).decode("utf8"))
+            index["months"][month] = {**entry, "offset": offset, "end": file.tell()}
+    index["size"] = file.tell()
+    return index
+
+
+def month_stats(columns, months):  # pylint: disable=R0914
+    """Aggregates of the transactions of each month.
+
+    Args:
+        columns (dict): field name -> values of the transactions.
+        months (numpy.ndarray): month of each transaction.
+
+    Returns:
+        dict: month -> number of rows, balance per account and usage counters.
+    """
+    stats = {
+        month: {
+            "rows": 0,
+            "balances": {},
+            "usage": {key: {} for key in METADATA_FIELDS},
+        }
+        for month in set(months)
+    }
+    month_codes, month_levels = factorize(months)
+    for month, rows in zip(month_levels, np.bincount(month_codes)):
+        stats[month]["rows"] = int(rows)
+    amounts = np.asarray(columns["amount"], dtype=np.float64)
+    for key in METADATA_FIELDS:
+        # one bin per (month, value) pair
+        value_codes, value_levels = factorize(columns[key])
+        pairs = month_codes.astype(np.int64) * len(value_levels) + value_codes
+        counts = np.bincount(pairs)
+        sums = np.bincount(pairs, weights=amounts) if key == "account" else None
+        for pair in np.flatnonzero(counts):
+            month_code, value_code = divmod(int(pair), len(value_levels))
+            month = month_levels[month_code]
+            value = str(value_levels[value_code])
+            stats[month]["usage"][key][value] = int(counts[pair])
+            if sums is not None:
+                stats[month]["balances"][value] = float(sums[pair])
+    return stats
+
+
+@traced
+def read_months(csv_path, index, months):
+    """Read the rows of some months of the csv file.
+
+    Args:
+        csv_path (str): csv file path.
+        index (dict): month index of the csv file.
+        months (iterable): months to read (missing months are skipped).
+
+    Returns:
+        dict: column name -> values of the transactions of the months.
+    """
+    parts = []
+    with open(csv_path, "rb") as file:
+        for month in sorted(months):
+            entry = index["months"].get(month)
+            if entry is None or entry["end"] == entry["offset"]:
+                continue
+            file.seek(entry["offset"])
+            parts.append(file.read(entry["end"] - entry["offset"]))
+    text = io.StringIO(b"".join(parts).decode("utf8"), newline="")
+    return read_columns(text, header=index["header"])
+
+
+def sum_months(index, months):
+    """Sum the aggregates of some months.
+
+    Args:
+        index (dict): month index.
+        months (iterable): months to sum.
+
+    Returns:
+        dict: balance per account and usage counters per metadata field.
+    """
+    total = {"balances": {}, "usage": {key: {} for key in METADATA_FIELDS}}
+    for month in months:
+        entry = index["months"][month]
+        for account, amount in entry["balances"].items():
+            total["balances"][account] = total["balances"].get(account, 0) + amount
+        for key in METADATA_FIELDS:
+            counter = total["usage"][key]
+            for value, count in entry["usage"][key].items():
+                counter[value] = counter.get(value, 0) + count
+    return total
@@ -0,0 +1,419 @@
+"""Storage of the transactions in one csv file per month (partitions/YYYYMM.csv).
+
+A manifest file (manifest.json) holds the metadata, the next transaction id and,
+for every partition, its number of rows, balance per account, usage counters and
+first/last date:
+``{"metadata": {...}, "next_id": ..., "months": {"YYYYMM": {...}}}``
+
+A change only rewrites the partitions of its months and the manifest, in a single
+atomic commit. The rows of each month are found through month postings (row
+positions per month, extended with the rows added to the store), so writing a
+month does not scan the whole store. Balances of the months not loaded come from
+the manifest.
+"""
+import copy
+import json
+import logging
+import os
+
+import numpy as np
+
+from .commit import atomic_commit, discard_incomplete, roll_forward
+from .csv_io import concat_columns, iter_rows, read_columns, write_columns
+from .dates import INVALID_DAY
+from .month_index import month_stats, sum_months
+from .tracing import traced
+from .transaction_store import (
+    ID_FIELD,
+    TRANSACTION_FIELDS,
+    TransactionList,
+    TransactionStore,
+    month_key,
+)
+
+MANIFEST_JSON = "manifest.json"
+PARTITIONS_FOLDER = "partitions"
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionedStorage:  # pylint: disable=R0902,R0904
+    """Storage backend using a csv file per month and a manifest.
+
+    Mutating calls are expected to be serialized by the data manager.
+    """
+
+    @traced
+    def __init__(self, data_folder: str):
+        self.data_folder = data_folder
+        self.manifest_path = os.path.join(data_folder, MANIFEST_JSON)
+        self.partitions_folder = os.path.join(data_folder, PARTITIONS_FOLDER)
+        self.manifest = None
+        self.store = None
+        self.loaded_months = None  # None if all the months are loaded
+        # month -> row positions of the store (removed rows are dropped on write)
+        self._postings = {}
+        self._postings_store = None
+        self._postings_size = 0  # rows of the store already in the postings
+
+    @staticmethod
+    def partition_path(month):
+        """Path of a partition file, relative to the data folder.
+
+        Args:
+            month (str): month ("YYYYMM").
+
+        Returns:
+            str: partition file path.
+        """
+        return os.path.join(PARTITIONS_FOLDER, f"{month}.csv")
+
+    @traced
+    def recover(self):
+        """Complete or discard a commit interrupted by a crash (done on startup)."""
+        if roll_forward(self.data_folder) or not os.path.isdir(self.partitions_folder):
+            return
+        discard_incomplete(
+            self.data_folder,
+            [MANIFEST_JSON]
+            + [
+                os.path.join(PARTITIONS_FOLDER, name[: -len(".tmp")])
+                for name in os.listdir(self.partitions_folder)
+                if name.endswith(".tmp")
+            ],
+        )
+
+    def is_empty(self):
+        """Checks if the data folder holds no manifest.
+
+        Returns:
+            bool: True if the manifest is missing.
+        """
+        self.recover()
+        return not os.path.exists(self.manifest_path)
+
+    @traced
+    def create(self, transactions, metadata):
+        """Create the partitions and the manifest.
+
+        Args:
+            transactions (iterable): transaction dicts.
+            metadata (dict): accounts, categories and subcategories.
+        """
+        os.makedirs(self.partitions_folder, exist_ok=True)
+        self.manifest = {
+            "metadata": copy.deepcopy(metadata),
+            "next_id": 1,
+            "months": {},
+        }
+        self.store = TransactionStore()
+        self.loaded_months = None
+        for transaction in transactions:
+            self.store.append(dict(transaction))
+        self.save_transactions(self.store)
+
+    @traced
+    def migrate(self, source):
+        """One-shot copy of the data of another storage (e.g. the csv files).
+
+        Args:
+            source: storage to copy the data from.
+        """
+        metadata = source.load_metadata()
+        self.create(TransactionList(source.load_transactions()), metadata)
+
+    def read_manifest(self):
+        """Read the manifest (once).
+
+        Returns:
+            dict: manifest.
+        """
+        if self.manifest is None:
+            with open(self.manifest_path, "r", encoding="utf8") as file:
+                self.manifest = json.load(file)
+        return self.manifest
+
+    @traced
+    def load_metadata(self):
+        """Load the metadata from the manifest.
+
+        Returns:
+            dict: accounts, categories and subcategories.
+        """
+        return copy.deepcopy(self.read_manifest()["metadata"])
+
+    @traced
+    def save_metadata(self, metadata):
+        """Save the metadata in the manifest.
+
+        Args:
+            metadata (dict): accounts, categories and subcategories.
+        """
+        self.write_partitions(months=(), metadata=metadata)
+
+    def read_partitions(self, months):
+        """Read the transactions of some partitions.
+
+        Args:
+            months (iterable): months to read (missing ones are skipped).
+
+        Returns:
+            dict: column name -> values of the transactions of the partitions.
+        """
+        parts = []
+        for month in sorted(months):
+            if month not in self.read_manifest()["months"]:
+                continue
+            path = os.path.join(self.data_folder, self.partition_path(month))
+            with open(path, "r", encoding="utf8", newline="") as file:
+                parts.append(read_columns(file))
+        return concat_columns(parts, [ID_FIELD, *TRANSACTION_FIELDS])
+
+    @traced
+    def load_transactions(self, since=None):
+        """Load the transactions of the partitions.
+
+        Args:
+            since (str, optional): first month to load ("YYYYMM"), the older ones
+                are loaded on demand (see load_months). Defaults to None (all).
+
+        Returns:
+            TransactionStore: store with the loaded transactions.
+        """
+        self.recover()
+        months = set(self.read_manifest()["months"])
+        self.loaded_months = None
+        if since is not None:
+            months = {month for month in months if month >= since}
+            self.loaded_months = set(months)
+        self.store = TransactionStore.from_columns(self.read_partitions(months))
+        # ids of the months not loaded are not reused
+        self.store.next_id = max(self.store.next_id, self.manifest["next_id"])
+        return self.store
+
+    def unloaded_months(self, before=None):
+        """Partitions that are not loaded yet.
+
+        Args:
+            before (str, optional): only the months before this one ("YYYYMM").
+                Defaults to None (all).
+
+        Returns:
+            list: sorted months ("YYYYMM").
+        """
+        if self.loaded_months is None:
+            return []
+        months = sorted(set(self.read_manifest()["months"]) - self.loaded_months)
+        return (
+            months if before is None else [month for month in months if month < before]
+        )
+
+    @traced
+    def load_months(self, months):
+        """Add the transactions of some partitions to the loaded ones.
+
+        Args:
+            months (iterable): months to load ("YYYYMM"), loaded ones are skipped.
+        """
+        if self.loaded_months is None:
+            return
+        months = set(months) - self.loaded_months
+        if not months:
+            return
+        for transaction in iter_rows(self.read_partitions(months)):
+            self.store.append(transaction)
+        self.loaded_months |= months
+
+    def read_months(self, months):
+        """Read the transactions of some partitions without loading them.
+
+        Args:
+            months (iterable): months to read ("YYYYMM").
+
+        Returns:
+            TransactionStore: store with the transactions of the partitions.
+        """
+        return TransactionStore.from_columns(self.read_partitions(months))
+
+    def opening(self, before=None):
+        """Aggregates of the partitions not loaded, from the manifest.
+
+        Args:
+            before (str, optional): only the months before this one ("YYYYMM").
+                Defaults to None (all).
+
+        Returns:
+            dict: balance per account and usage counters per metadata field.
+        """
+        return sum_months(self.read_manifest(), self.unloaded_months(before))
+
+    def month_postings(self):
+        """Row positions of the store per month, updated with the rows added
+        since the last call.
+
+        Returns:
+            dict: month ("YYYYMM") -> list of arrays of row positions.
+        """
+        store = self.store
+        if self._postings_store is not store:
+            self._postings = {}
+            self._postings_store = store
+            self._postings_size = 0
+        size = store.size
+        if size > self._postings_size:
+            # month of each distinct date, then of each new row
+            level_months = np.array(
+                [month_key(str(date)) for date in store.levels["date"]], dtype=object
+            )
+            positions = np.arange(self._postings_size, size)
+            months = level_months[store.codes["date"][self._postings_size : size]]
+            month_values, inverse = np.unique(months, return_inverse=True)
+            order = np.argsort(inverse, kind="stable")
+            bounds = np.searchsorted(inverse[order], np.arange(len(month_values) + 1))
+            for code, month in enumerate(month_values):
+                self._postings.setdefault(month, []).append(
+                    positions[order[bounds[code] : bounds[code + 1]]]
+                )
+            self._postings_size = size
+        return self._postings
+
+    def month_positions(self, month):
+        """Row positions of the alive transactions of a month.
+
+        Args:
+            month (str): month ("YYYYMM").
+
+        Returns:
+            numpy.ndarray: row positions, in store order.
+        """
+        parts = self.month_postings().get(month)
+        if not parts:
+            return np.zeros(0, dtype=np.int64)
+        positions = np.concatenate(parts)
+        positions = positions[self.store.alive[positions]]
+        invalid = positions[self.store.days[positions] == INVALID_DAY]
+        if invalid.size:
+            logger.warning(
+                "PartitionedStorage: invalid dates in %s, transaction ids %s",
+                month,
+                self.store.ids[invalid].tolist(),
+            )
+        return positions
+
+    def month_columns(self, month):
+        """Loaded transactions of a month.
+
+        Args:
+            month (str): month ("YYYYMM").
+
+        Returns:
+            dict: field name -> numpy array of the transactions of the month.
+        """
+        return self.store.to_columns(self.month_positions(month))
+
+    @traced
+    def write_partitions(self, months, metadata=None):
+        """Rewrite some partitions and the manifest in a single atomic commit.
+
+        Args:
+            months (iterable): months to rewrite from the loaded transactions.
+            metadata (dict, optional): new metadata. Defaults to None (unchanged).
+        """
+        manifest = dict(self.read_manifest(), months=dict(self.manifest["months"]))
+        if metadata is not None:
+            manifest["metadata"] = copy.deepcopy(metadata)
+        if self.store is not None:
+            manifest["next_id"] = int(self.store.next_id)
+
+        writers = {}
+        emptied = []
+        written = {}
+        for month in months:
+            written[month] = self.month_positions(month)
+            columns = self.store.to_columns(written[month])
+            if columns[ID_FIELD].size == 0:
+                manifest["months"].pop(month, None)
+                emptied.append(month)
+                continue
+            writers[
+                self.partition_path(month)
+            ] = lambda file, columns=columns: write_columns(file, columns)
+            manifest["months"][month] = partition_entry(columns, month)
+        writers[MANIFEST_JSON] = lambda file: json.dump(manifest, file)
+
+        atomic_commit(self.data_folder, writers)
+        self.manifest = manifest
+        # the removed rows are dropped from the postings once they are written
+        for month, positions in written.items():
+            self._postings[month] = [positions]
+        for month in emptied:
+            path = os.path.join(self.data_folder, self.partition_path(month))
+            if os.path.exists(path):
+                os.remove(path)
+
+    @traced
+    def save_transactions(self, store):
+        """Rewrite the partitions of the loaded months.
+
+        Args:
+            store (TransactionStore): store with the loaded transactions.
+        """
+        self.store = store
+        months = set(self.month_postings())
+        if self.loaded_months is None:
+            months |= set(self.read_manifest()["months"])
+        else:
+            months |= self.loaded_months
+        self.write_partitions(months)
+
+    @traced
+    def record(self, operation, transactions):
+        """Rewrite the partitions of the months of added or removed transactions.
+
+        Args:
+            operation (str): "add" or "remove".
+            transactions (list): list of transaction dicts.
+
+        Raises:
+            ValueError: Mode Error: Operation can only be 'add' or 'remove'!
+        """
+        if operation not in {"add", "remove"}:
+            raise ValueError("Mode Error: Operation can only be 'add' or 'remove'!")
+        self.write_partitions(
+            {month_key(transaction["date"]) for transaction in transactions}
+        )
+
+    def balance(self, account):
+        """Sum of the amounts of an account, from the manifest.
+
+        Args:
+            account (str): account name.
+
+        Returns:
+            float: account balance.
+        """
+        return sum(
+            entry["balances"].get(account, 0)
+            for entry in self.read_manifest()["months"].values()
+        )
+
+    def close(self):
+        """Nothing to release: every change is written right away."""
+
+
+def partition_entry(columns, month):
+    """Manifest entry of a partition.
+
+    Args:
+        columns (dict): field name -> values of the transactions of the partition.
+        month (str): month ("YYYYMM").
+
+    Returns:
+        dict: number of rows, balance per account, usage counters and date bounds.
+    """
+    size = len(columns["date"])
+    entry = month_stats(columns, np.full(size, month, dtype=object))[month]
+    dates = [str(date).replace("/", "-") for date in columns["date"]]
+    entry["first_date"] = min(dates)
+    entry["last_date"] = max(dates)
+    return entry
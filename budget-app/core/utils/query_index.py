@@ -0,0 +1,171 @@
+"""Indexes to query the transactions without scanning all of them.
+
+    - a date index: the (day number, row position) pairs of the transactions kept
+      sorted, so a date range is found with two binary searches (bisect)
+    - postings: for each value of the type, account, category and subcategory
+      fields, the set of the row positions using it
+
+A query intersects the positions of its filters, starting from the smallest set.
+Removed transactions are dropped lazily: the positions are checked against the
+alive rows of the store and the index is rebuilt once too many are removed.
+"""
+import bisect
+
+import numpy as np
+
+from .dates import INVALID_DAY, to_day
+from .tracing import traced
+from .transaction_store import ID_FIELD, TransactionView
+
+POSTINGS_FIELDS = ("type", "account", "category", "subcategory")
+LAST_DAY = np.iinfo(np.int32).max - 1
+SORT_KEYS = {"date", "amount", ID_FIELD}
+
+
+class QueryIndex:
+    """Date index and postings lists of the transactions of a store.
+
+    Args:
+        store (TransactionStore): transactions to index.
+    """
+
+    @traced
+    def __init__(self, store):
+        self.store = store
+        positions = store.positions()
+        days = store.days[positions]
+        order = np.argsort(days, kind="stable")
+        # sorted (day, position) pairs, searched with bisect
+        self.dates = list(zip(days[order].tolist(), positions[order].tolist()))
+        self.postings = {}
+        for field in POSTINGS_FIELDS:
+            codes = store.codes[field][positions]
+            sorted_positions = positions[np.argsort(codes, kind="stable")]
+            values, starts = np.unique(np.sort(codes), return_index=True)
+            bounds = [*starts[1:], len(codes)]
+            self.postings[field] = {
+                store.levels[field][code]: set(sorted_positions[start:stop].tolist())
+                for code, start, stop in zip(values, starts, bounds)
+            }
+        self.removed = 0
+
+    def add(self, position):
+        """Index a transaction added to the store.
+
+        Args:
+            position (int): row position of the transaction.
+        """
+        bisect.insort(self.dates, (int(self.store.days[position]), position))
+        row = TransactionView(self.store, position)
+        for field in POSTINGS_FIELDS:
+            self.postings[field].setdefault(row[field], set()).add(position)
+
+    def remove(self, count):
+        """Record that some transactions were removed from the store.
+
+        Args:
+            count (int): number of removed transactions.
+
+        Returns:
+            bool: True if the index should be rebuilt (more removed rows than alive).
+        """
+        self.removed += count
+        return self.removed > len(self.store)
+
+    def query(  # pylint: disable=R0913,R0914
+        self,
+        start_date=None,
+        end_date=None,
+        filters=None,
+        min_amount=None,
+        max_amount=None,
+        matches=None,
+        sort="date",
+        descending=False,
+        offset=0,
+        limit=None,
+    ):
+        """Row positions of the transactions matching some filters.
+
+        Args:
+            start_date (str, optional): first date. Defaults to None.
+            end_date (str, optional): last date. Defaults to None.
+            filters (dict, optional): postings field -> accepted values.
+                Defaults to None.
+            min_amount (float, optional): lowest amount. Defaults to None.
+            max_amount (float, optional): highest amount. Defaults to None.
+            matches (numpy.ndarray, optional): boolean mask of the rows to keep
+                (e.g. a text search). Defaults to None.
+            sort (str, optional): "date", "amount" or "id". Defaults to "date".
+            descending (bool, optional): reverse order. Defaults to False.
+            offset (int, optional): number of matching rows to skip. Defaults to 0.
+            limit (int, optional): maximum number of rows. Defaults to None.
+
+        Raises:
+            ValueError: Query Error: if a filter field or the sort key is unknown.
+
+        Returns:
+            numpy.ndarray: row positions.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Query Error: Unknown sort key: {sort}.")
+        unknown = set(filters or {}) - set(POSTINGS_FIELDS)
+        if unknown:
+            raise ValueError(f"Query Error: Unknown fields: {sorted(unknown)}.")
+
+        # union of the postings of the accepted values of each filter
+        candidate_sets = sorted(
+            (
+                set().union(*(self.postings[field].get(value, ()) for value in values))
+                for field, values in (filters or {}).items()
+            ),
+            key=len,
+        )
+        candidates = None
+        if candidate_sets:
+            candidates = candidate_sets[0].intersection(*candidate_sets[1:])
+
+        if start_date is not None or end_date is not None:
+            # rows with an invalid date are never in a date range
+            first = INVALID_DAY + 1 if start_date is None else to_day(start_date)
+            last = LAST_DAY if end_date is None else to_day(end_date)
+            low = bisect.bisect_left(self.dates, (first,))
+            high = bisect.bisect_left(self.dates, (last + 1,))
+            if candidates is None or high - low < len(candidates):
+                # the date range is the smallest set
+                in_range = [position for _, position in self.dates[low:high]]
+                candidates = (
+                    in_range
+                    if candidates is None
+                    else [position for position in in_range if position in candidates]
+                )
+            else:
+                days = self.store.days
+                candidates = [
+                    position
+                    for position in candidates
+                    if first <= days[position] <= last
+                ]
+
+        if candidates is None:
+            positions = self.store.positions()
+        else:
+            positions = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            positions = positions[self.store.alive[positions]]
+        if min_amount is not None:
+            positions = positions[self.store.amount[positions] >= min_amount]
+        if max_amount is not None:
+            positions = positions[self.store.amount[positions] <= max_amount]
+        if matches is not None:
+            positions = positions[matches[positions]]
+
+        # ties are broken by row position, i.e. insertion order
+        positions = np.sort(positions)
+        keys = {
+            "date": self.store.days,
+            "amount": self.store.amount,
+            ID_FIELD: self.store.ids,
+        }[sort][positions]
+        order = np.argsort(-keys if descending else keys, kind="stable")
+        stop = None if limit is None else offset + limit
+        return positions[order][offset:stop]
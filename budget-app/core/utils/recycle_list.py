@@ -0,0 +1,99 @@
+"""Module to build a virtualized list of transactions.
+
+Only the rows visible on screen are widgets: the RecycleView reuses them while
+scrolling and each data entry only holds a transaction id, the text of a row is
+read from the data manager when the row is bound to an entry.
+"""
+from kivy.metrics import dp
+from kivy.properties import NumericProperty
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivymd.uix.list import IconLeftWidget, IconRightWidget, OneLineAvatarIconListItem
+
+from .utils import dict2str
+
+ROW_HEIGHT = dp(56)
+
+
+class TransactionRow(  # pylint: disable=R0903
+    RecycleDataViewBehavior, OneLineAvatarIconListItem
+):
+    """Recycled row widget showing a transaction and a delete button."""
+
+    transaction_id = NumericProperty(-1)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.list_view = None
+        self.add_widget(IconLeftWidget(icon="swap-horizontal"))
+        self.add_widget(
+            IconRightWidget(
+                icon="delete",
+                on_release=lambda x: self.list_view.delete_callback(
+                    self.transaction_id
+                ),
+            )
+        )
+
+    def refresh_view_attrs(self, rv, index, data):
+        """Bind the row to a data entry: set its id and read its text.
+
+        Args:
+            rv (TransactionListView): list holding the row.
+            index (int): index of the data entry.
+            data (dict): data entry ({"transaction_id": id}).
+        """
+        self.list_view = rv
+        self.text = dict2str(  # pylint: disable=W0201
+            rv.data_manager.get_transaction(data["transaction_id"])
+        )
+        return super().refresh_view_attrs(rv, index, data)
+
+
+class TransactionListView(RecycleView):  # pylint: disable=R0903
+    """Virtualized list of transactions.
+
+    Args:
+        data_manager (DataManager): data manager holding the transactions.
+        on_delete (function): called with the id of a transaction when its
+            delete button is released.
+        on_end (function, optional): called when the list is scrolled to its
+            end (e.g. to load older transactions). Defaults to None.
+    """
+
+    def __init__(self, data_manager, on_delete, on_end=None, **kwargs):
+        super().__init__(**kwargs)
+        self.data_manager = data_manager
+        self.delete_callback = on_delete
+        self.end_callback = on_end
+        self.viewclass = TransactionRow
+        layout = RecycleBoxLayout(
+            default_size=(None, ROW_HEIGHT),
+            default_size_hint=(1, None),
+            size_hint_y=None,
+            orientation="vertical",
+        )
+        layout.bind(minimum_height=layout.setter("height"))
+        self.add_widget(layout)
+        self.bind(scroll_y=self.on_scroll)
+
+    def on_scroll(self, instance, scroll_y):  # pylint: disable=W0613
+        """Call the end callback when the bottom of the list is reached.
+
+        Args:
+            instance (TransactionListView): scrolled list.
+            scroll_y (float): vertical scroll position (0 at the bottom).
+        """
+        if scroll_y <= 0 and self.data and self.end_callback is not None:
+            self.end_callback()
+
+    def show(self, transaction_ids):
+        """Show some transactions, in order.
+
+        Args:
+            transaction_ids (list): transaction ids.
+        """
+        self.data = [  # pylint: disable=W0201
+            {"transaction_id": transaction_id} for transaction_id in transaction_ids
+        ]
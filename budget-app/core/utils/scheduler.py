@@ -0,0 +1,100 @@
+"""Write-behind scheduler: coalesce many changes into a single background flush."""
+import logging
+import threading
+import time
+
+from .tracing import traced
+
+# seconds without changes after which the pending changes are flushed
+FLUSH_DELAY = 1.0
+# number of changes after which the pending changes are flushed right away
+FLUSH_OPERATIONS = 100
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindScheduler:  # pylint: disable=R0902
+    """Call a flush function in a background thread once changes stop coming
+    for a quiet period, or once enough changes are pending.
+
+    Args:
+        flush_function (function): function writing the pending changes.
+        delay (float, optional): quiet period in seconds. Defaults to FLUSH_DELAY.
+        max_operations (int, optional): pending changes that trigger a flush
+            without waiting for the quiet period. Defaults to FLUSH_OPERATIONS.
+    """
+
+    @traced
+    def __init__(
+        self, flush_function, delay=FLUSH_DELAY, max_operations=FLUSH_OPERATIONS
+    ):
+        self.flush_function = flush_function
+        self.delay = delay
+        self.max_operations = max_operations
+        self._operations = 0
+        self._deadline = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._worker = None
+
+    def mark(self):
+        """Signal a new change to flush, restarting the quiet period."""
+        with self._condition:
+            self._operations += 1
+            self._deadline = time.monotonic() + self.delay
+            if self._worker is None and not self._closed:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+            self._condition.notify()
+
+    def pending(self):
+        """Number of changes waiting to be flushed.
+
+        Returns:
+            int: number of changes.
+        """
+        return self._operations
+
+    def _is_due(self):
+        if self._operations == 0:
+            return False
+        return (
+            self._operations >= self.max_operations
+            or time.monotonic() >= self._deadline
+        )
+
+    def _run(self):
+        """Worker loop: wait until a flush is due, then flush."""
+        while True:
+            with self._condition:
+                while not self._closed and not self._is_due():
+                    timeout = None
+                    if self._operations:
+                        timeout = self._deadline - time.monotonic()
+                    self._condition.wait(timeout)
+                if self._closed:
+                    return
+                self._operations = 0
+            try:
+                self.flush_function()
+            except Exception:  # pylint: disable=W0718
+                # the changes stay pending and are written by the next flush
+                logger.exception("WriteBehindScheduler: flush failed")
+
+    @traced
+    def flush(self):
+        """Flush the pending changes now, in the calling thread."""
+        with self._condition:
+            self._operations = 0
+        self.flush_function()
+
+    @traced
+    def close(self):
+        """Stop the worker thread and flush the pending changes."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+        self.flush()
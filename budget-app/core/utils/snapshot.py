@@ -0,0 +1,104 @@
+"""Binary snapshot of the transactions in the Arrow IPC (feather v2) format.
+
+The snapshot is written next to data.csv and loaded instead of parsing the csv
+when it is newer. Columns are typed:
+    - id -> int64
+    - amount -> float64
+    - date -> date32 (dates are read back in the "YYYY-MM-DD" format)
+    - type, account, category, subcategory, note -> dictionary encoded strings
+
+pyarrow is an optional dependency, only needed if the snapshot is enabled.
+"""
+import importlib.util
+import logging
+import os
+
+import numpy as np
+
+from .dates import INVALID_DAY
+from .tracing import traced
+from .transaction_store import CATEGORICAL_FIELDS, ID_FIELD, TransactionStore
+
+DATA_SNAPSHOT = "data.arrow"
+
+logger = logging.getLogger(__name__)
+
+
+def check_snapshot_support():
+    """Checks that pyarrow is installed.
+
+    Raises:
+        ImportError: if pyarrow is missing.
+    """
+    if importlib.util.find_spec("pyarrow") is None:
+        raise ImportError("Snapshot Error: pyarrow is required to use snapshots.")
+
+
+@traced
+def write_snapshot(store: TransactionStore, path):
+    """Write all the alive transactions of a store in a snapshot file.
+
+    Args:
+        store (TransactionStore): transactions to write.
+        path (str): snapshot file path.
+
+    Returns:
+        bool: False if the dates could not be converted (no snapshot written).
+    """
+    import pyarrow as pa  # pylint: disable=C0415,E0401
+    from pyarrow import feather  # pylint: disable=C0415,E0401
+
+    positions = store.positions()
+    if (store.days[positions] == INVALID_DAY).any():
+        logger.warning("snapshot: dates can not be converted, snapshot skipped")
+        return False
+
+    arrays = {
+        ID_FIELD: pa.array(store.ids[positions], pa.int64()),
+        "date": pa.array(store.days[positions], pa.date32()),
+        "amount": pa.array(store.amount[positions], pa.float64()),
+    }
+    for field in CATEGORICAL_FIELDS:
+        if field == "date":
+            continue
+        arrays[field] = pa.DictionaryArray.from_arrays(
+            pa.array(store.codes[field][positions], pa.int32()),
+            pa.array([str(level) for level in store.levels[field]], pa.string()),
+        )
+
+    feather.write_feather(pa.table(arrays), path + ".tmp", compression="uncompressed")
+    os.replace(path + ".tmp", path)
+    return True
+
+
+@traced
+def read_snapshot(path):
+    """Read a snapshot file into a transaction store.
+
+    Args:
+        path (str): snapshot file path.
+
+    Returns:
+        TransactionStore: store with all the transactions of the snapshot.
+    """
+    from pyarrow import feather  # pylint: disable=C0415,E0401
+
+    table = feather.read_table(path, memory_map=True)
+
+    codes = {}
+    levels = {}
+    for field in CATEGORICAL_FIELDS:
+        column = table.column(field).combine_chunks()
+        if field == "date":
+            days = column.cast("int32").to_numpy()
+            unique_days, codes[field] = np.unique(days, return_inverse=True)
+            levels[field] = np.datetime_as_string(
+                unique_days.astype("datetime64[D]")
+            ).tolist()
+        else:
+            codes[field] = column.indices.to_numpy()
+            levels[field] = column.dictionary.to_pylist()
+
+    amount = table.column("amount").to_numpy()
+    ids = table.column(ID_FIELD).to_numpy()
+    return TransactionStore.from_codes(amount, codes, levels, ids)
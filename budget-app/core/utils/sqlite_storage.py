@@ -0,0 +1,441 @@
+"""Storage of the data in a single sqlite database file (data.db).
+
+tables:
+    - transactions -> one row per transaction (id as primary key), indexed on
+      date, account, category and subcategory.
+    - metadata -> key/value table holding accounts, categories and subcategories
+      as json lists.
+
+Every change is a single INSERT/DELETE statement inside a transaction.
+
+Transactions can be loaded starting from a month, the older months being loaded on demand.
+Months are selected with ranges of the ISO dates (``date >= ? AND date < ?``), so the
+queries use the date index; the aggregates of the older months are read once, when the
+transactions are loaded, and kept in memory like the month index of the csv storage.
+"""
+import json
+import os
+import sqlite3
+
+from .dates import normalize_date
+from .month_index import sum_months
+from .tracing import traced
+from .transaction_store import (
+    ID_FIELD,
+    METADATA_FIELDS,
+    TRANSACTION_FIELDS,
+    TransactionList,
+    TransactionStore,
+)
+
+DATA_DB = "data.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    type TEXT NOT NULL,
+    amount REAL NOT NULL,
+    account TEXT NOT NULL,
+    category TEXT NOT NULL,
+    subcategory TEXT NOT NULL,
+    note TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date);
+CREATE INDEX IF NOT EXISTS idx_transactions_account ON transactions (account);
+CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions (category);
+CREATE INDEX IF NOT EXISTS idx_transactions_subcategory
+    ON transactions (subcategory);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+TABLE_FIELDS = (ID_FIELD,) + TRANSACTION_FIELDS
+COLUMNS = ", ".join(TABLE_FIELDS)
+INSERT_TRANSACTION = (
+    f"INSERT INTO transactions ({COLUMNS}) "
+    f"VALUES ({', '.join('?' for _ in TABLE_FIELDS)})"
+)
+DELETE_TRANSACTION = "DELETE FROM transactions WHERE id = ?"
+METADATA_KEYS = set(METADATA_FIELDS)
+# "YYYYMM" month of the "YYYY-MM-DD" dates (see month_key)
+MONTH = "substr(date, 1, 4) || substr(date, 6, 2)"
+ISO_DATE = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]"
+# PRAGMA user_version once the dates are stored as "YYYY-MM-DD"
+SCHEMA_VERSION = 1
+
+
+class SqliteStorage:
+    """Storage backend keeping transactions and metadata in one sqlite file.
+
+    Mutating calls are expected to be serialized by the data manager.
+    """
+
+    @traced
+    def __init__(self, data_folder: str):
+        self.data_folder = data_folder
+        self.db_path = os.path.join(data_folder, DATA_DB)
+        self._connection = None
+        self.store = None
+        self.since = None  # first month loaded, None if all the months are loaded
+        self.loaded_months = set()  # older months loaded on demand
+        # aggregates of the months before since: {"months": {"YYYYMM": {...}}}
+        self.months_index = {"months": {}}
+
+    @property
+    def connection(self):
+        """Open (once) the database connection and create the schema.
+
+        Returns:
+            sqlite3.Connection: database connection.
+        """
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._connection.executescript(SCHEMA)
+            _upgrade(self._connection)
+        return self._connection
+
+    def is_empty(self):
+        """Checks if the database holds no data.
+
+        Returns:
+            bool: True if the database file or its metadata are missing.
+        """
+        if not os.path.exists(self.db_path):
+            return True
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM metadata").fetchone()
+        return count == 0
+
+    @traced
+    def create(self, transactions, metadata):
+        """Fill the database with transactions and metadata in a single transaction.
+
+        Args:
+            transactions (iterable): transaction dicts.
+            metadata (dict): accounts, categories and subcategories.
+        """
+        with self.connection:
+            self.connection.executemany(
+                INSERT_TRANSACTION,
+                (_to_row(transaction) for transaction in transactions),
+            )
+            self._write_metadata(metadata)
+
+    @traced
+    def migrate(self, source):
+        """One-shot copy of the data of another storage (e.g. the csv files).
+
+        Args:
+            source: storage to copy the data from.
+        """
+        metadata = source.load_metadata()
+        self.create(TransactionList(source.load_transactions()), metadata)
+
+    @traced
+    def load_metadata(self):
+        """Load the metadata table.
+
+        Returns:
+            dict: accounts, categories and subcategories.
+        """
+        rows = self.connection.execute("SELECT key, value FROM metadata")
+        return {key: json.loads(value) for key, value in rows}
+
+    @traced
+    def save_metadata(self, metadata):
+        """Save the metadata table.
+
+        Args:
+            metadata (dict): accounts, categories and subcategories.
+        """
+        with self.connection:
+            self._write_metadata(metadata)
+
+    def _write_metadata(self, metadata):
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+            ((key, json.dumps(value)) for key, value in metadata.items()),
+        )
+
+    @traced
+    def load_transactions(self, since=None):
+        """Load the transactions, in insertion order.
+
+        Args:
+            since (str, optional): first month to load ("YYYYMM"), the older ones
+                are loaded on demand (see load_months). Defaults to None (all).
+
+        Returns:
+            TransactionStore: store with the loaded transactions.
+        """
+        self.since = since
+        self.loaded_months = set()
+        self.months_index = {"months": {}}
+        if since is None:
+            rows = self.connection.execute(
+                f"SELECT {COLUMNS} FROM transactions ORDER BY id"
+            ).fetchall()
+        else:
+            rows = self.connection.execute(
+                f"SELECT {COLUMNS} FROM transactions WHERE date >= ? ORDER BY id",
+                (month_start(since),),
+            ).fetchall()
+            self.months_index = self._read_months_index(since)
+        columns = {field: [] for field in TABLE_FIELDS}
+        for field, values in zip(TABLE_FIELDS, zip(*rows)):
+            columns[field] = values
+        self.store = TransactionStore.from_columns(columns)
+        # ids of the months not loaded are not reused
+        (max_id,) = self.connection.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM transactions"
+        ).fetchone()
+        self.store.next_id = max(self.store.next_id, max_id + 1)
+        return self.store
+
+    def _read_months_index(self, since):
+        """Aggregates of each month before a month, in one grouped query.
+
+        Args:
+            since (str): first month not aggregated ("YYYYMM").
+
+        Returns:
+            dict: {"months": month -> balance per account and usage counters}.
+        """
+        months = {}
+        rows = self.connection.execute(
+            f"SELECT {MONTH}, account, category, subcategory, COUNT(*), SUM(amount) "
+            # +date: most rows are older than the window, a scan beats the index
+            "FROM transactions WHERE +date < ? "
+            "GROUP BY 1, account, category, subcategory",
+            (month_start(since),),
+        )
+        for month, account, category, subcategory, count, amount in rows:
+            entry = months.get(month)
+            if entry is None:
+                entry = months[month] = {
+                    "balances": {},
+                    "usage": {key: {} for key in METADATA_FIELDS},
+                }
+            entry["balances"][account] = entry["balances"].get(account, 0) + amount
+            for key, value in zip(METADATA_FIELDS, (account, category, subcategory)):
+                usage = entry["usage"][key]
+                usage[value] = usage.get(value, 0) + count
+        return {"months": months}
+
+    def unloaded_months(self, before=None):
+        """Months of the database that are not loaded yet.
+
+        Args:
+            before (str, optional): only the months before this one ("YYYYMM").
+                Defaults to None (all).
+
+        Returns:
+            list: sorted months ("YYYYMM").
+        """
+        months = sorted(set(self.months_index["months"]) - self.loaded_months)
+        return (
+            months if before is None else [month for month in months if month < before]
+        )
+
+    @traced
+    def load_months(self, months):
+        """Add the transactions of some months to the loaded ones.
+
+        Args:
+            months (iterable): months to load ("YYYYMM"), loaded ones are skipped.
+        """
+        if self.since is None:
+            return
+        months = {month for month in months if month < self.since} - self.loaded_months
+        if not months:
+            return
+        for row in self._select_months(months):
+            self.store.append(dict(zip(TABLE_FIELDS, row)))
+        self.loaded_months |= months
+
+    def read_months(self, months):
+        """Read the transactions of some months without loading them.
+
+        Args:
+            months (iterable): months to read ("YYYYMM").
+
+        Returns:
+            TransactionStore: store with the transactions of the months.
+        """
+        rows = self._select_months(months).fetchall()
+        columns = {field: [] for field in TABLE_FIELDS}
+        for field, values in zip(TABLE_FIELDS, zip(*rows)):
+            columns[field] = values
+        return TransactionStore.from_columns(columns)
+
+    def _select_months(self, months):
+        """Query the rows of some months with the date index.
+
+        Args:
+            months (iterable): months ("YYYYMM").
+
+        Returns:
+            sqlite3.Cursor: rows of the months, ordered by id.
+        """
+        where, bounds = _month_ranges(months)
+        return self.connection.execute(
+            f"SELECT {COLUMNS} FROM transactions WHERE {where} ORDER BY id", bounds
+        )
+
+    def opening(self, before=None):
+        """Aggregates of the transactions not loaded.
+
+        Args:
+            before (str, optional): only the months before this one ("YYYYMM").
+                Defaults to None (all).
+
+        Returns:
+            dict: balance per account and usage counters per metadata field.
+        """
+        return sum_months(self.months_index, self.unloaded_months(before))
+
+    @traced
+    def save_transactions(self, store):
+        """Replace the transactions of the loaded months of the database.
+
+        Args:
+            store (TransactionStore): store with the loaded transactions.
+        """
+        with self.connection:
+            if self.since is None:
+                self.connection.execute("DELETE FROM transactions")
+            else:
+                where, bounds = _month_ranges(self.loaded_months)
+                self.connection.execute(
+                    f"DELETE FROM transactions WHERE date >= ? OR {where}",
+                    (month_start(self.since), *bounds),
+                )
+            self.connection.executemany(
+                INSERT_TRANSACTION, (_to_row(row) for row in TransactionList(store))
+            )
+
+    @traced
+    def record(self, operation, transactions):
+        """Insert or delete transactions inside a single database transaction.
+
+        Args:
+            operation (str): "add" or "remove".
+            transactions (list): list of transaction dicts.
+
+        Raises:
+            ValueError: Mode Error: Operation can only be 'add' or 'remove'!
+        """
+        if operation not in {"add", "remove"}:
+            raise ValueError("Mode Error: Operation can only be 'add' or 'remove'!")
+        with self.connection:
+            if operation == "add":
+                self.connection.executemany(
+                    INSERT_TRANSACTION,
+                    (_to_row(transaction) for transaction in transactions),
+                )
+            else:
+                self.connection.executemany(
+                    DELETE_TRANSACTION,
+                    ((transaction[ID_FIELD],) for transaction in transactions),
+                )
+
+    def balance(self, account):
+        """Sum of the amounts of an account (uses the account index).
+
+        Args:
+            account (str): account name.
+
+        Returns:
+            float: account balance.
+        """
+        (balance,) = self.connection.execute(
+            "SELECT COALESCE(SUM(amount), 0) FROM transactions WHERE account = ?",
+            (account,),
+        ).fetchone()
+        return balance
+
+    def is_used(self, key, item):
+        """Check if any transaction uses a metadata item (uses the key index).
+
+        Args:
+            key (str): transaction field (e.g "category", "account",..).
+            item (str): item to check.
+
+        Returns:
+            bool: True if found.
+        """
+        if key not in METADATA_KEYS:
+            raise ValueError(f"Key Error: Unknown key: {key}.")
+        (found,) = self.connection.execute(
+            f"SELECT EXISTS(SELECT 1 FROM transactions WHERE {key} = ?)", (item,)
+        ).fetchone()
+        return bool(found)
+
+    def close(self):
+        """Close the database connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def _to_row(transaction):
+    """Transaction dict to a tuple of values ordered as the table columns."""
+    return tuple(transaction[field] for field in TABLE_FIELDS)
+
+
+def month_start(month):
+    """First date of a month, to compare with the ISO dates of the table.
+
+    Args:
+        month (str): month ("YYYYMM").
+
+    Returns:
+        str: "YYYY-MM-01" date.
+    """
+    return f"{month[:4]}-{month[4:]}-01"
+
+
+def _month_ranges(months):
+    """WHERE clause selecting the dates of some months with index-friendly ranges.
+
+    Args:
+        months (iterable): months ("YYYYMM").
+
+    Returns:
+        tuple: clause (false if there are no months) and its parameters.
+    """
+    bounds = []
+    for month in sorted(months):
+        year, number = int(month[:4]), int(month[4:])
+        year, number = (year + 1, 1) if number == 12 else (year, number + 1)
+        bounds += [month_start(month), f"{year:04d}-{number:02d}-01"]
+    if not bounds:
+        return "0", ()
+    where = " OR ".join("(date >= ? AND date < ?)" for _ in bounds[::2])
+    return f"({where})", tuple(bounds)
+
+
+def _upgrade(connection):
+    """Store the dates written before they were normalized as "YYYY-MM-DD",
+    once per database, so the month ranges find them.
+
+    Args:
+        connection (sqlite3.Connection): database connection.
+    """
+    (version,) = connection.execute("PRAGMA user_version").fetchone()
+    if version >= SCHEMA_VERSION:
+        return
+    with connection:
+        rows = connection.execute(
+            "SELECT id, date FROM transactions WHERE date NOT GLOB ?", (ISO_DATE,)
+        ).fetchall()
+        updates = []
+        for transaction_id, date in rows:
+            try:
+                updates.append((normalize_date(date), transaction_id))
+            except ValueError:
+                continue
+        connection.executemany("UPDATE transactions SET date = ? WHERE id = ?", updates)
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
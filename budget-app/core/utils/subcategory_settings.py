@@ -1,38 +1,39 @@
 """Module to define the subcategories settings to insert in the settings page of the app."""
-import logging
-import time
 
+from kivy.clock import Clock
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.list import (
     IconLeftWidget,
     IconRightWidget,
     MDList,
     OneLineAvatarIconListItem,
+    TwoLineAvatarIconListItem,
 )
 from kivymd.uix.scrollview import MDScrollView
 from kivymd.uix.textfield import MDTextField
 
 from .dialogbox import DialogBuilder
-
-logger = logging.getLogger(__name__)
+from .tracing import traced
 
 
 class SubcategoryWidget:
     """Subcategory widget to add and remove subcategories."""
 
+    @traced
     def __init__(self, data_manager):
-        logger.info("SubcategoryWidget: %s:  __init__", time.time())
         self.data_manager = data_manager
         self.subcategory_list = MDList()
+        self.subcategory_widgets = {}
         self.subcategory_dialog = None
+        self.data_manager.add_listener(self.on_transactions_changed)
 
+    @traced
     def generate_subcategory_list(self):
         """Generate a list of widgets to hold each subcategory name.
 
         Returns:
             MDScrollView: list widget with all subcategories.
         """
-        logger.info("SubcategoryWidget: %s:  generate_subcategory_list", time.time())
         for subcategory in self.data_manager.sub_categories:
             self.subcategory_list.add_widget(
                 self.single_subcategory_list(subcategory=subcategory)
@@ -49,6 +50,7 @@ class SubcategoryWidget:
 
         return MDScrollView(self.subcategory_list)
 
+    @traced
     def single_subcategory_list(self, subcategory):
         """Generate a single widget to hold the subcategory name.
 
@@ -56,38 +58,72 @@ class SubcategoryWidget:
             subcategory (str): subcategory name.
 
         Returns:
-            OneLineAvatarIconListItem: widget with icon, description and delete button.
+            TwoLineAvatarIconListItem: widget with icon, description, usage
+                and delete button.
         """
-        logger.info("SubcategoryWidget: %s:  single_subcategory_list", time.time())
-        return OneLineAvatarIconListItem(
+        self.subcategory_widgets[subcategory] = TwoLineAvatarIconListItem(
             IconLeftWidget(icon="bank"),
             IconRightWidget(
                 icon="delete",
                 on_release=lambda x, item=subcategory: self.delete_subcategory(item),
             ),
             text=subcategory,
+            secondary_text=self.usage_description(subcategory),
             id=subcategory,
         )
+        return self.subcategory_widgets[subcategory]
+
+    def usage_description(self, subcategory):
+        """Text with the number of transactions using a subcategory.
+
+        Args:
+            subcategory (str): subcategory name.
 
+        Returns:
+            str: usage description.
+        """
+        count = self.data_manager.get_usage_count("subcategory", subcategory)
+        return f"used by {count} transactions"
+
+    @traced
+    def on_transactions_changed(self, operation, transactions):  # pylint: disable=W0613
+        """Refresh the usage of the subcategories touched by added/removed transactions.
+
+        Args:
+            operation (str): "add" or "remove".
+            transactions (list): list of transaction dicts.
+        """
+        items = {transaction["subcategory"] for transaction in transactions}
+        # widgets must be updated from the main thread
+        Clock.schedule_once(lambda dt: self.refresh_usage(items))
+
+    @traced
+    def refresh_usage(self, items):
+        """Update the usage text of some subcategory widgets.
+
+        Args:
+            items (set): subcategory names.
+        """
+        for item in items:
+            if item in self.subcategory_widgets:
+                self.subcategory_widgets[item].secondary_text = self.usage_description(
+                    item
+                )
+
+    @traced
     def delete_subcategory(self, subcategory):
         """Remove a subcategory from the list.
 
         Args:
             subcategory (str): subcategory name.
         """
-        logger.info("SubcategoryWidget: %s: delete_subcategory", time.time())
-        # Remove the corresponding widget from the layout
-        widget_to_remove = next(
-            widget
-            for widget in self.subcategory_list.children
-            if widget.id == subcategory
-        )
-        self.subcategory_list.remove_widget(widget_to_remove)
         self.data_manager.remove_subcategory(subcategory=subcategory)
+        # Remove the corresponding widget from the layout
+        self.subcategory_list.remove_widget(self.subcategory_widgets.pop(subcategory))
 
+    @traced
     def get_subcategory_name(self, instance):
         """Get a new subcategory name."""
-        logger.info("SubcategoryWidget: %s: get_subcategory_name", time.time())
         # initialize new input widget
         text_input = MDTextField(hint_text="Enter a new subcategory")
         text_input.on_text_validate = lambda: self.add_subcategory(
@@ -98,6 +134,7 @@ class SubcategoryWidget:
         # add text input to collect new account name
         self.subcategory_list.add_widget(text_input)
 
+    @traced
     def add_subcategory(self, input_widget, subcategory):
         """Add a new subcategory to the list.
 
@@ -105,7 +142,6 @@ class SubcategoryWidget:
             input_widget (widget): widget to remove.
             subcategory (str): subcategory name.
         """
-        logger.info("SubcategoryWidget: %s: add_subcategory", time.time())
         # remove text input widget (not needed anymore)
         self.subcategory_list.remove_widget(input_widget)
         # add new account to data manager
@@ -123,9 +159,9 @@ class SubcategoryWidget:
             )
         )
 
+    @traced
     def get_subcategory_dialog(self, instance):  # pylint: disable=W0613
         """Opens Pop-up box with a list of all subcategories."""
-        logger.info("SubcategoryWidget: %s:  get_subcategory_dialog", time.time())
         if not self.subcategory_dialog:
             # create dialog button
             self.subcategory_dialog = DialogBuilder().build_confirmation_dialog(
@@ -0,0 +1,133 @@
+"""Inverted index for the full-text search of the transactions.
+
+The text fields are dictionary-encoded in the store, so each distinct note,
+category or subcategory is tokenized once and the index maps every token to the
+codes of the values holding it. A search looks up the tokens starting with each
+term in the sorted vocabulary (bisect) and turns their codes into a mask of the
+rows with one vectorized lookup per field. Every term must match (AND).
+
+Values added to the store are tokenized on the next search and removed
+transactions are dropped through the alive rows of the store, so the index never
+has to be rebuilt.
+"""
+import bisect
+import re
+
+import numpy as np
+
+from .tracing import traced
+
+TEXT_FIELDS = ("note", "category", "subcategory")
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Split a text into lowercase words.
+
+    Args:
+        text (str): text to split.
+
+    Returns:
+        list: words of the text.
+    """
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+class TextIndex:
+    """Inverted index from the words of some text fields to the store values.
+
+    Args:
+        store (TransactionStore): transactions to index.
+        fields (tuple, optional): categorical fields to index.
+            Defaults to TEXT_FIELDS.
+    """
+
+    @traced
+    def __init__(self, store, fields=TEXT_FIELDS):
+        self.store = store
+        self.fields = fields
+        # token -> field -> codes of the values holding the token
+        self.postings = {}
+        # sorted tokens, for the prefix lookups
+        self.vocabulary = []
+        # number of values of each field already tokenized
+        self.indexed = {field: 0 for field in fields}
+        # term -> row mask of the last search (search-as-you-type repeats terms)
+        self._cache = {}
+        self._cache_size = 0
+        self.refresh()
+
+    def refresh(self):
+        """Tokenize the values added to the store since the last call."""
+        new_tokens = set()
+        for field in self.fields:
+            levels = self.store.levels[field]
+            for code in range(self.indexed[field], len(levels)):
+                if not isinstance(levels[code], str):
+                    continue
+                for token in set(tokenize(levels[code])):
+                    if token not in self.postings:
+                        self.postings[token] = {}
+                        new_tokens.add(token)
+                    self.postings[token].setdefault(field, []).append(code)
+            self.indexed[field] = len(levels)
+        if len(new_tokens) > len(self.vocabulary) // 8:
+            self.vocabulary = sorted(self.vocabulary + list(new_tokens))
+        else:
+            for token in new_tokens:
+                bisect.insort(self.vocabulary, token)
+
+    def prefix_tokens(self, prefix):
+        """Tokens starting with a prefix.
+
+        Args:
+            prefix (str): lowercase prefix.
+
+        Returns:
+            list: matching tokens.
+        """
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        stop = start
+        while stop < len(self.vocabulary) and self.vocabulary[stop].startswith(prefix):
+            stop += 1
+        return self.vocabulary[start:stop]
+
+    def _term_mask(self, term):
+        """Mask of the rows with a word starting with a term in any field."""
+        size = self.store.size
+        mask = np.zeros(size, dtype=bool)
+        tokens = self.prefix_tokens(term)
+        for field in self.fields:
+            hits = np.zeros(len(self.store.levels[field]), dtype=bool)
+            for token in tokens:
+                hits[self.postings[token].get(field, [])] = True
+            if hits.any():
+                mask |= hits[self.store.codes[field][:size]]
+        return mask
+
+    @traced
+    def match(self, text):
+        """Mask of the rows where every word of a text starts a word of the
+        indexed fields (e.g. "pen gro" matches a "penny" note in "grocery").
+
+        Args:
+            text (str): searched text.
+
+        Returns:
+            numpy.ndarray: boolean mask of the alive rows of the store that match.
+        """
+        self.refresh()
+        size = self.store.size
+        if size != self._cache_size:
+            self._cache = {}
+            self._cache_size = size
+        mask = self.store.alive[:size].copy()
+        cache = {}
+        for term in dict.fromkeys(tokenize(text)):
+            term_mask = self._cache.get(term)
+            if term_mask is None:
+                term_mask = self._term_mask(term)
+            cache[term] = term_mask
+            mask &= term_mask
+        self._cache = cache
+        return mask
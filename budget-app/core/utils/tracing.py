@@ -0,0 +1,230 @@
+"""Lightweight tracing of where the time goes (startup, loading, changes).
+
+Functions decorated with ``traced`` and blocks wrapped in ``with span(name)``
+are timed when tracing is enabled: spans nest per thread, their durations are
+aggregated per name (count, total, self time without the nested spans, max) and
+they can be exported as Chrome trace events, to open in chrome://tracing or
+https://ui.perfetto.dev.
+
+Tracing is disabled by default and then costs a single flag check per call.
+Set the BUDGET_TRACE environment variable to enable it from the start: with a
+file path (e.g. BUDGET_TRACE=trace.json) the trace is written there on exit.
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+TRACE_ENV = "BUDGET_TRACE"
+
+
+class Tracer:
+    """Collects the spans of all the threads.
+
+    Args:
+        enabled (bool, optional): record spans. Defaults to False.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.events = []
+        # span name -> [count, total ns, self ns, max ns]
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter_ns()
+
+    def enable(self):
+        """Start recording spans."""
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording spans (the recorded ones are kept)."""
+        self.enabled = False
+
+    def reset(self):
+        """Drop the recorded spans."""
+        with self._lock:
+            self.events = []
+            self.stats = {}
+
+    def span(self, name, **args):
+        """Time a block of code.
+
+        Args:
+            name (str): span name (e.g. "DataManager.load_transactions").
+            **args: values shown with the span in the trace viewer.
+
+        Returns:
+            context manager: the span, a no-op one when tracing is disabled.
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name, args)
+
+    def _children(self):
+        """Stack of the durations of the spans nested in the open ones
+        of the current thread."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, name, args, start, end, children):  # pylint: disable=R0913
+        duration = end - start
+        with self._lock:
+            stat = self.stats.get(name)
+            if stat is None:
+                stat = self.stats[name] = [0, 0, 0, 0]
+            stat[0] += 1
+            stat[1] += duration
+            stat[2] += duration - children
+            stat[3] = max(stat[3], duration)
+            self.events.append(
+                (name, args, start, duration, os.getpid(), threading.get_ident())
+            )
+
+    def summary(self):
+        """Aggregated durations per span name, slowest first.
+
+        Returns:
+            dict: span name -> count, total, self and max durations (seconds).
+        """
+        with self._lock:
+            stats = sorted(self.stats.items(), key=lambda item: -item[1][1])
+        return {
+            name: {
+                "count": count,
+                "total": total / 1e9,
+                "self": self_time / 1e9,
+                "max": longest / 1e9,
+            }
+            for name, (count, total, self_time, longest) in stats
+        }
+
+    def chrome_trace(self):
+        """Recorded spans as Chrome trace events.
+
+        Returns:
+            dict: {"traceEvents": [...]} with one complete ("X") event per span.
+        """
+        with self._lock:
+            events = list(self.events)
+        return {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - self._origin) / 1000,
+                    "dur": duration / 1000,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": args,
+                }
+                for name, args, start, duration, pid, tid in events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def export_chrome_trace(self, path):
+        """Write the recorded spans to a Chrome trace json file.
+
+        Args:
+            path (str): output file path.
+        """
+        with open(path, "w", encoding="utf8") as file:
+            json.dump(self.chrome_trace(), file, default=str)
+
+
+class _Span:
+    """Span recorded when it is exited."""
+
+    __slots__ = ("tracer", "name", "args", "start", "stack")
+
+    def __init__(self, owner, name, args):
+        self.tracer = owner
+        self.name = name
+        self.args = args
+        self.start = None
+        self.stack = None
+
+    def __enter__(self):
+        self.stack = self.tracer._children()  # pylint: disable=W0212
+        self.stack.append(0)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter_ns()
+        children = self.stack.pop()
+        if self.stack:
+            self.stack[-1] += end - self.start
+        self.tracer._record(  # pylint: disable=W0212
+            self.name, self.args, self.start, end, children
+        )
+
+
+class _NoSpan:
+    """Span doing nothing, used when tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+tracer = Tracer(enabled=bool(os.environ.get(TRACE_ENV)))
+
+
+def span(name, **args):
+    """Time a block of code with the app tracer (see Tracer.span).
+
+    Args:
+        name (str): span name.
+        **args: values shown with the span in the trace viewer.
+
+    Returns:
+        context manager: the span.
+    """
+    return tracer.span(name, **args)
+
+
+def traced(function):
+    """Decorator timing every call of a function with the app tracer,
+    as a span named after the function (e.g. "DataManager.add_transactions",
+    or "csv_io.read_store" for a module function).
+
+    Args:
+        function (function): function to time.
+
+    Returns:
+        function: wrapped function.
+    """
+    name = function.__qualname__
+    if "." not in name:
+        name = f"{function.__module__.rsplit('.', 1)[-1]}.{name}"
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not tracer.enabled:
+            return function(*args, **kwargs)
+        with _Span(tracer, name, {}):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+def _export_on_exit():
+    """Write the trace to the file named by BUDGET_TRACE, if any."""
+    path = os.environ.get(TRACE_ENV)
+    if path and path not in {"1", "true"} and tracer.events:
+        tracer.export_chrome_trace(path)
+
+
+atexit.register(_export_on_exit)
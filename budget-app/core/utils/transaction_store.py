@@ -0,0 +1,699 @@
+"""Columnar in-memory storage for the transactions.
+
+Instead of one dict per transaction, each field is stored in its own numpy array:
+    - id -> int64 array of unique transaction ids (persisted with the data)
+    - amount -> float64 array
+    - date, type, account, category, subcategory, note -> int32 array of codes
+      pointing into the list of distinct values of the field (dictionary encoding)
+
+Removed rows are only flagged as deleted, so row positions stay stable.
+Dates are normalized to "YYYY-MM-DD" and also kept as an int32 day number per row
+(see dates.py), so date filters and sorting compare integers.
+An id -> row position hash index (built on first use) allows O(1) lookups.
+A row fingerprint (amount plus the codes of the other fields) -> row positions
+index (a multiset, also built on first use) finds transactions without an id in O(1).
+"""
+from collections.abc import Mapping
+
+import numpy as np
+
+from .dates import INVALID_DAY, normalize_date, to_day
+from .tracing import traced
+
+TRANSACTION_FIELDS = (
+    "date",
+    "type",
+    "amount",
+    "account",
+    "category",
+    "subcategory",
+    "note",
+)
+CATEGORICAL_FIELDS = tuple(field for field in TRANSACTION_FIELDS if field != "amount")
+ID_FIELD = "id"
+# transaction fields referencing the metadata
+METADATA_FIELDS = ("account", "category", "subcategory")
+# types of the transactions stored with a positive amount, the others are negative
+INCOME_TYPES = ("income", "deposit")
+
+
+def month_key(date):
+    """Month of a "YYYY-MM-DD" or "YYYY/MM/DD" date, as a sortable "YYYYMM" string.
+
+    Args:
+        date (str): date string.
+
+    Returns:
+        str: month key.
+    """
+    return date[:4] + date[5:7]
+
+
+def signed_amount(transaction_type, amount):
+    """Amount of a transaction as stored: rounded to the cent, negative unless
+    the transaction is an income or a deposit.
+
+    Args:
+        transaction_type (str): transaction type (e.g. "expense").
+        amount (str, int, float): amount, with or without its sign.
+
+    Raises:
+        ValueError: if the amount is not a number.
+
+    Returns:
+        float: signed amount.
+    """
+    amount = round(float(amount), 2)
+    return amount if transaction_type in INCOME_TYPES else -abs(amount)
+
+
+class TransactionStore:  # pylint: disable=R0902,R0904
+    """Column store holding all the transactions of the data manager."""
+
+    @traced
+    def __init__(self, capacity=1024):
+        self._size = 0  # number of used rows (alive or removed)
+        self._count = 0  # number of alive rows
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.amount = np.zeros(capacity, dtype=np.float64)
+        self.days = np.zeros(capacity, dtype=np.int32)
+        self.codes = {
+            field: np.zeros(capacity, dtype=np.int32) for field in CATEGORICAL_FIELDS
+        }
+        self.levels = {field: [] for field in CATEGORICAL_FIELDS}
+        self._lookup = {field: {} for field in CATEGORICAL_FIELDS}
+        self.next_id = 1
+        self._index = None  # id -> row position
+        self._fingerprints = None  # fingerprint -> row positions
+
+    @classmethod
+    def from_codes(cls, amount, codes, levels, ids=None):
+        """Build a store from already encoded columns.
+
+        Args:
+            amount (numpy.ndarray): float amounts.
+            codes (dict): field name -> array of integer codes.
+            levels (dict): field name -> list of the distinct values.
+            ids (numpy.ndarray, optional): transaction ids. Defaults to None,
+                in which case ids from 1 to n are assigned.
+
+        Returns:
+            TransactionStore: store holding the rows.
+        """
+        size = len(amount)
+        store = cls(capacity=max(size, 1024))
+        store.alive[:size] = True
+        store.ids[:size] = np.arange(1, size + 1) if ids is None else ids
+        store.next_id = int(store.ids[:size].max()) + 1 if size else 1
+        store.amount[:size] = amount
+        codes = dict(codes)
+        levels = dict(levels)
+        codes["date"], levels["date"] = _normalize_date_levels(
+            np.asarray(codes["date"]), levels["date"]
+        )
+        for field in CATEGORICAL_FIELDS:
+            store.codes[field][:size] = codes[field]
+            store.levels[field] = list(levels[field])
+            store._lookup[field] = {  # pylint: disable=W0212
+                value: code for code, value in enumerate(store.levels[field])
+            }
+        # only the distinct dates are converted
+        level_days = np.array(
+            [_day(level) for level in store.levels["date"]], dtype=np.int32
+        )
+        if size:
+            store.days[:size] = level_days[store.codes["date"][:size]]
+        store._size = size  # pylint: disable=W0212
+        store._count = size  # pylint: disable=W0212
+        return store
+
+    @classmethod
+    @traced
+    def from_frame(cls, data_df):
+        """Build a store from a dataframe with one column per transaction field.
+
+        Args:
+            data_df (pandas.DataFrame): transactions dataframe.
+
+        Returns:
+            TransactionStore: store holding the dataframe rows.
+        """
+        codes = {}
+        levels = {}
+        for field in CATEGORICAL_FIELDS:
+            codes[field], uniques = data_df[field].factorize(use_na_sentinel=False)
+            levels[field] = list(uniques)
+        # files written before transactions had an id get one assigned here
+        ids = (
+            data_df[ID_FIELD].to_numpy(dtype=np.int64) if ID_FIELD in data_df else None
+        )
+        return cls.from_codes(
+            data_df["amount"].to_numpy(dtype=np.float64), codes, levels, ids
+        )
+
+    @classmethod
+    @traced
+    def from_columns(cls, columns):
+        """Build a store from one sequence of values per transaction field
+        (e.g. parsed by the csv reader), without pandas.
+
+        Args:
+            columns (dict): field name -> values (the id column is optional).
+
+        Returns:
+            TransactionStore: store holding the rows.
+        """
+        codes = {}
+        levels = {}
+        for field in CATEGORICAL_FIELDS:
+            codes[field], levels[field] = factorize(columns[field])
+        ids = columns.get(ID_FIELD)
+        return cls.from_codes(
+            np.asarray(columns["amount"], dtype=np.float64),
+            codes,
+            levels,
+            None if ids is None else np.asarray(ids, dtype=np.int64),
+        )
+
+    def copy(self):
+        """Copy the alive rows into a new, independent store.
+
+        Returns:
+            TransactionStore: store copy.
+        """
+        positions = self.positions()
+        store = TransactionStore.from_codes(
+            self.amount[positions],
+            {field: self.codes[field][positions] for field in CATEGORICAL_FIELDS},
+            self.levels,
+            self.ids[positions],
+        )
+        store.next_id = self.next_id
+        return store
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def size(self):
+        """Number of used rows (alive or removed).
+
+        Returns:
+            int: number of rows.
+        """
+        return self._size
+
+    def _grow(self):
+        """Double the capacity of every column."""
+        capacity = 2 * len(self.alive)
+        self.alive = np.resize(self.alive, capacity)
+        self.alive[self._size :] = False
+        self.ids = np.resize(self.ids, capacity)
+        self.amount = np.resize(self.amount, capacity)
+        self.days = np.resize(self.days, capacity)
+        for field in CATEGORICAL_FIELDS:
+            self.codes[field] = np.resize(self.codes[field], capacity)
+
+    def _encode(self, field, value):
+        """Return the code of a value, adding it to the field levels if new."""
+        code = self._lookup[field].get(value)
+        if code is None:
+            code = len(self.levels[field])
+            self.levels[field].append(value)
+            self._lookup[field][value] = code
+        return code
+
+    @property
+    def index(self):
+        """Hash index from transaction id to row position of the alive rows.
+
+        Returns:
+            dict: transaction id -> row position.
+        """
+        if self._index is None:
+            positions = self.positions()
+            self._index = dict(zip(self.ids[positions].tolist(), positions.tolist()))
+        return self._index
+
+    @property
+    def fingerprints(self):
+        """Row fingerprint -> row positions of the alive transactions (multiset).
+
+        Returns:
+            dict: fingerprint tuple -> list of row positions.
+        """
+        if self._fingerprints is None:
+            positions = self.positions()
+            columns = [self.amount[positions].tolist()] + [
+                self.codes[field][positions].tolist() for field in CATEGORICAL_FIELDS
+            ]
+            self._fingerprints = {}
+            for position, fingerprint in zip(positions.tolist(), zip(*columns)):
+                self._fingerprints.setdefault(fingerprint, []).append(position)
+        return self._fingerprints
+
+    def fingerprint(self, transaction):
+        """Fingerprint of a transaction dict, as stored in the fingerprints index.
+
+        Args:
+            transaction (dict): transaction dict.
+
+        Returns:
+            tuple: fingerprint, None if the dict can not be equal to a stored row
+            (missing or extra fields, non numeric amount or unknown values).
+        """
+        if transaction.keys() - {ID_FIELD} != set(TRANSACTION_FIELDS):
+            return None
+        # a dict with a non numeric amount can never be equal to a stored row
+        if not isinstance(transaction["amount"], (int, float, np.number)):
+            return None
+        fingerprint = [float(transaction["amount"])]
+        for field in CATEGORICAL_FIELDS:
+            value = transaction[field]
+            if field == "date":
+                value = _canonical_date(value)
+            try:
+                code = self._lookup[field].get(value)
+            except TypeError:  # unhashable value
+                return None
+            if code is None:
+                return None
+            fingerprint.append(code)
+        return tuple(fingerprint)
+
+    def _row_fingerprint(self, position):
+        return (float(self.amount[position]),) + tuple(
+            int(self.codes[field][position]) for field in CATEGORICAL_FIELDS
+        )
+
+    def append(self, transaction):
+        """Add a transaction at the end of the store.
+
+        If the transaction has no id, a new one is assigned and set in the dict,
+        as is the normalized date.
+
+        Args:
+            transaction (dict): transaction dict.
+
+        Raises:
+            ValueError: if the transaction id is already used.
+
+        Returns:
+            int: row position of the new transaction.
+        """
+        transaction_id = transaction.setdefault(ID_FIELD, self.next_id)
+        if transaction_id in self.index:
+            raise ValueError(
+                f"Integrity Error: Transaction id: {transaction_id} already exists!"
+            )
+        if self._size == len(self.alive):
+            self._grow()
+
+        transaction["date"] = _canonical_date(transaction["date"])
+        position = self._size
+        self.ids[position] = transaction_id
+        self.days[position] = _day(transaction["date"])
+        self.index[transaction_id] = position
+        self.next_id = max(self.next_id, transaction_id + 1)
+        self.amount[position] = transaction["amount"]
+        for field in CATEGORICAL_FIELDS:
+            self.codes[field][position] = self._encode(field, transaction[field])
+        self.alive[position] = True
+        self._size += 1
+        self._count += 1
+        if self._fingerprints is not None:
+            self._fingerprints.setdefault(self._row_fingerprint(position), []).append(
+                position
+            )
+        return position
+
+    def remove_at(self, position):
+        """Flag the transaction at a row position as removed.
+
+        Args:
+            position (int): row position.
+        """
+        if not self.alive[position]:
+            raise ValueError(f"404 Error: Row: {position} not found!")
+        self.alive[position] = False
+        self.index.pop(int(self.ids[position]), None)
+        self._count -= 1
+        if self._fingerprints is not None:
+            fingerprint = self._row_fingerprint(position)
+            positions = self._fingerprints[fingerprint]
+            positions.remove(position)
+            if not positions:
+                del self._fingerprints[fingerprint]
+
+    def restore_at(self, position):
+        """Flag a removed transaction as alive again (undo of remove_at).
+
+        Args:
+            position (int): row position.
+
+        Raises:
+            ValueError: if the row is alive or its id is used again.
+        """
+        transaction_id = int(self.ids[position])
+        if self.alive[position] or transaction_id in self.index:
+            raise ValueError(f"Integrity Error: Row: {position} can not be restored!")
+        self.alive[position] = True
+        self.index[transaction_id] = position
+        self._count += 1
+        if self._fingerprints is not None:
+            self._fingerprints.setdefault(self._row_fingerprint(position), []).append(
+                position
+            )
+
+    def row(self, position):
+        """Decode a row into a transaction dict.
+
+        Args:
+            position (int): row position.
+
+        Returns:
+            dict: transaction dict.
+        """
+        transaction = {ID_FIELD: int(self.ids[position])}
+        for field in TRANSACTION_FIELDS:
+            if field == "amount":
+                transaction[field] = float(self.amount[position])
+            else:
+                transaction[field] = self.levels[field][self.codes[field][position]]
+        return transaction
+
+    def positions(self):
+        """Row positions of all the alive transactions.
+
+        Returns:
+            numpy.ndarray: array of row positions.
+        """
+        return np.flatnonzero(self.alive[: self._size])
+
+    def mask(self, field, value):
+        """Boolean mask of the alive rows where a field is equal to a value.
+
+        Args:
+            field (str): categorical field name (e.g. "account").
+            value: value to look for.
+
+        Returns:
+            numpy.ndarray: boolean mask over the used rows.
+        """
+        code = self._lookup[field].get(value)
+        if code is None:
+            return np.zeros(self._size, dtype=bool)
+        return self.alive[: self._size] & (self.codes[field][: self._size] == code)
+
+    def select(self, start=0, stop=None, date_range=None, values=None):
+        """Row positions of the alive transactions of a range of rows
+        matching some filters.
+
+        Args:
+            start (int, optional): first row position. Defaults to 0.
+            stop (int, optional): row position after the last one. Defaults to None.
+            date_range (tuple, optional): first and last date ("YYYY-MM-DD" or
+                "YYYY/MM/DD"), either can be None. Defaults to None.
+            values (dict, optional): field name -> collection of accepted values.
+                Defaults to None.
+
+        Returns:
+            numpy.ndarray: array of row positions.
+        """
+        stop = self._size if stop is None else min(stop, self._size)
+        mask = self.alive[start:stop].copy()
+        for field, accepted in (values or {}).items():
+            accepted = set(accepted)
+            level_mask = np.array(
+                [level in accepted for level in self.levels[field]], dtype=bool
+            )
+            mask &= level_mask[self.codes[field][start:stop]]
+        if date_range is not None:
+            first, last = date_range
+            days = self.days[start:stop]
+            if first is not None:
+                mask &= days >= to_day(first)
+            if last is not None:
+                mask &= (days <= to_day(last)) & (days != INVALID_DAY)
+        return start + np.flatnonzero(mask)
+
+    def sort_by_date(self, positions, descending=False):
+        """Sort row positions by date (stable: rows of a day keep their order).
+
+        Args:
+            positions (numpy.ndarray): row positions.
+            descending (bool, optional): newest first. Defaults to False.
+
+        Returns:
+            numpy.ndarray: sorted row positions.
+        """
+        days = self.days[positions]
+        order = np.argsort(
+            -days.astype(np.int64) if descending else days, kind="stable"
+        )
+        return positions[order]
+
+    def count(self, field, value):
+        """Number of alive transactions where a field is equal to a value.
+
+        Args:
+            field (str): categorical field name (e.g. "account").
+            value: value to look for.
+
+        Returns:
+            int: number of transactions.
+        """
+        return int(np.count_nonzero(self.mask(field, value)))
+
+    def sum_amount(self, field, value):
+        """Sum of the amounts of the transactions where a field is equal to a value.
+
+        Args:
+            field (str): categorical field name (e.g. "account").
+            value: value to look for.
+
+        Returns:
+            float: sum of the amounts.
+        """
+        return float(self.amount[: self._size][self.mask(field, value)].sum())
+
+    def sum_by(self, field):
+        """Sum of the amounts grouped by the values of a field, in a single pass.
+
+        Args:
+            field (str): categorical field name (e.g. "account").
+
+        Returns:
+            dict: field value -> sum of the amounts (only values in use).
+        """
+        alive = self.alive[: self._size]
+        codes = self.codes[field][: self._size][alive]
+        levels = self.levels[field]
+        sums = np.bincount(
+            codes, weights=self.amount[: self._size][alive], minlength=len(levels)
+        )
+        used = np.bincount(codes, minlength=len(levels)) > 0
+        return {levels[code]: float(sums[code]) for code in np.flatnonzero(used)}
+
+    def count_by(self, field):
+        """Number of alive transactions for each value of a field, in a single pass.
+
+        Args:
+            field (str): categorical field name (e.g. "account").
+
+        Returns:
+            dict: field value -> number of transactions (only values in use).
+        """
+        alive = self.alive[: self._size]
+        levels = self.levels[field]
+        counts = np.bincount(
+            self.codes[field][: self._size][alive], minlength=len(levels)
+        )
+        return {levels[code]: int(counts[code]) for code in np.flatnonzero(counts)}
+
+    def find(self, transaction):
+        """Find the alive row equal to a transaction dict.
+
+        A transaction with an id is looked up in the id index,
+        one without in the fingerprints index (both O(1)).
+
+        Args:
+            transaction (dict): transaction dict.
+
+        Returns:
+            int: row position, -1 if not found.
+        """
+        if ID_FIELD in transaction:
+            position = self.index.get(transaction[ID_FIELD], -1)
+            if "date" in transaction:
+                transaction = {
+                    **transaction,
+                    "date": _canonical_date(transaction["date"]),
+                }
+            if position >= 0 and self.row(position) != transaction:
+                return -1
+            return position
+
+        positions = self.fingerprints.get(self.fingerprint(transaction))
+        return min(positions) if positions else -1
+
+    def to_columns(self, positions=None):
+        """Copy the alive transactions into one decoded array per field.
+
+        Args:
+            positions (numpy.ndarray, optional): row positions to copy.
+                Defaults to None (all the alive rows).
+
+        Returns:
+            dict: field name -> numpy array.
+        """
+        if positions is None:
+            positions = self.positions()
+        columns = {ID_FIELD: self.ids[positions]}
+        for field in TRANSACTION_FIELDS:
+            if field == "amount":
+                columns[field] = self.amount[positions]
+            else:
+                levels = np.empty(len(self.levels[field]), dtype=object)
+                levels[:] = self.levels[field]
+                columns[field] = levels[self.codes[field][positions]]
+        return columns
+
+
+def factorize(values):
+    """Dictionary-encode some values, in order of first appearance.
+
+    Args:
+        values (iterable): values to encode.
+
+    Returns:
+        tuple: array of integer codes and list of the distinct values.
+    """
+    lookup = {}
+    codes = np.fromiter(
+        (lookup.setdefault(value, len(lookup)) for value in values), dtype=np.int32
+    )
+    return codes, list(lookup)
+
+
+def _canonical_date(date):
+    """Normalized date, or the value as it is if it is not a valid date."""
+    try:
+        return normalize_date(date)
+    except ValueError:
+        return date
+
+
+def _day(date):
+    """Day number of a date, INVALID_DAY if it is not a valid date."""
+    try:
+        return to_day(date)
+    except ValueError:
+        return INVALID_DAY
+
+
+def _normalize_date_levels(codes, levels):
+    """Normalize the distinct dates of a column, merging the ones that become equal.
+
+    Args:
+        codes (numpy.ndarray): date codes.
+        levels (list): distinct dates.
+
+    Returns:
+        tuple: new codes and distinct normalized dates.
+    """
+    normalized = [_canonical_date(level) for level in levels]
+    new_levels = list(dict.fromkeys(normalized))
+    if len(new_levels) == len(levels) and normalized == list(levels):
+        return codes, list(levels)
+    new_codes = {level: code for code, level in enumerate(new_levels)}
+    remap = np.array([new_codes[level] for level in normalized], dtype=np.int32)
+    return remap[codes], new_levels
+
+
+class TransactionList:
+    """List-like view of a transaction store, used by the UI panels.
+
+    Iterating the view yields one transaction dict per alive row.
+    """
+
+    def __init__(self, store: TransactionStore):
+        self.store = store
+
+    def __len__(self):
+        return len(self.store)
+
+    def __iter__(self):
+        for position in self.store.positions():
+            yield self.store.row(position)
+
+    def __getitem__(self, index):
+        positions = self.store.positions()[index]
+        if isinstance(index, slice):
+            return [self.store.row(position) for position in positions]
+        return self.store.row(positions)
+
+    def __contains__(self, item):
+        return isinstance(item, dict) and self.store.find(item) >= 0
+
+    def append(self, transaction):
+        """Append a transaction to the store.
+
+        Args:
+            transaction (dict): transaction dict.
+        """
+        self.store.append(transaction)
+
+    def remove(self, transaction):
+        """Remove the first row equal to a transaction.
+
+        Args:
+            transaction (dict): transaction dict.
+
+        Raises:
+            ValueError: if the transaction is not in the store.
+        """
+        position = self.store.find(transaction)
+        if position < 0:
+            raise ValueError("TransactionList.remove(x): x not in list")
+        self.store.remove_at(position)
+
+
+class TransactionView(Mapping):
+    """Read-only view of a row of the store, decoded field by field on access.
+
+    It compares equal to the transaction dict of the row and ``dict(view)`` copies it.
+    """
+
+    __slots__ = ("store", "position")
+
+    def __init__(self, store: TransactionStore, position: int):
+        self.store = store
+        self.position = position
+
+    def __getitem__(self, field):
+        if field == ID_FIELD:
+            return int(self.store.ids[self.position])
+        if field == "amount":
+            return float(self.store.amount[self.position])
+        if field not in CATEGORICAL_FIELDS:
+            raise KeyError(field)
+        return self.store.levels[field][self.store.codes[field][self.position]]
+
+    def __iter__(self):
+        return iter((ID_FIELD,) + TRANSACTION_FIELDS)
+
+    def __len__(self):
+        return len(TRANSACTION_FIELDS) + 1
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def to_dict(self):
+        """Decode the row into a transaction dict.
+
+        Returns:
+            dict: transaction dict.
+        """
+        return self.store.row(self.position)
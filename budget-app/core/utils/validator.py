@@ -1,47 +1,49 @@
 """Module with all the validators for the data manager."""
-from datetime import datetime
+import math
+
+import numpy as np
+
+from .dates import DATE_ERROR, is_date, normalize_date
+from .transaction_store import ID_FIELD, TRANSACTION_FIELDS
+
+TRANSACTION_TYPES = {"income", "expense", "withdraw", "deposit"}
 
 
 def validate_transaction(item, accounts, categories, sub_categories):
     """validate a transaction fields.
 
+    The metadata values are looked up with ``in``, so sets make the check O(1).
+
     Args:
         item (dict): transaction
+        accounts (set): known accounts.
+        categories (set): known categories.
+        sub_categories (set): known subcategories.
 
     Raises:
         ValueError: Error for each field based on its value.
     """
-    sample_transaction_keys = {
-        "date",
-        "type",
-        "amount",
-        "account",
-        "category",
-        "subcategory",
-        "note",
-    }
+    sample_transaction_keys = set(TRANSACTION_FIELDS)
 
-    if sample_transaction_keys != item.keys():
+    # the id is optional, it is assigned when the transaction is added
+    if sample_transaction_keys != item.keys() - {ID_FIELD}:
         raise ValueError("Transaction Error: dict key missing or extra.")
 
-    if item["type"] not in {
-        "income",
-        "expense",
-        "withdraw",
-        "deposit",
-    }:  # pylint: disable=raise-missing-from
+    if item["type"] not in TRANSACTION_TYPES:  # pylint: disable=raise-missing-from
         raise ValueError(
             f"Transaction Error: Unknown transaction type: {item['type']}."
         )
 
     try:
-        _ = int(item["amount"])
-    except ValueError:
-        raise ValueError(  # pylint: disable=raise-missing-from
+        amount = float(item["amount"])
+    except (TypeError, ValueError):
+        amount = math.nan
+    if not math.isfinite(amount):
+        raise ValueError(
             f"Transaction Error: Amount must be float or int: {item['amount']}"
         )
 
-    if int(item["amount"]) < 0:
+    if amount < 0:
         raise ValueError(
             f"Transaction Error: Amount must be a positive number: {item['amount']}"
         )
@@ -54,14 +56,79 @@ def validate_transaction(item, accounts, categories, sub_categories):
         if item[key] not in value:
             raise ValueError(f"Transaction Error: Unknown {key}:{item[key]}.")
 
-    date_format = "%Y/%m/%d"
-    try:
-        datetime.strptime(item["date"], date_format)
-    except ValueError:
-        raise ValueError(  # pylint: disable=raise-missing-from
-            f"Transaction Error: Invalid date format. Must be in {date_format}."
+    # "YYYY-MM-DD" and "YYYY/MM/DD" are both accepted
+    normalize_date(item["date"])
+
+
+def validate_transactions(data_df, accounts, categories, sub_categories):
+    """validate the transactions of a dataframe, one column at a time.
+
+    The same checks as validate_transaction, but every row is checked and the
+    first error of each row is reported instead of raised.
+
+    Args:
+        data_df (pandas.DataFrame): transactions, one column per field.
+        accounts (set): known accounts.
+        categories (set): known categories.
+        sub_categories (set): known subcategories.
+
+    Returns:
+        tuple: boolean numpy array (True for the invalid rows) and numpy array of
+        the error messages ("" for the valid rows).
+    """
+    import pandas as pd  # pylint: disable=C0415
+
+    messages = np.full(len(data_df), "", dtype=object)
+    failed = np.zeros(len(data_df), dtype=bool)
+    if set(TRANSACTION_FIELDS) != set(data_df.columns) - {ID_FIELD}:
+        messages[:] = "Transaction Error: dict key missing or extra."
+        return np.ones(len(data_df), dtype=bool), messages
+
+    def report(invalid, prefix, field=None, suffix=""):
+        # only the first error of a row is kept, messages are built for those rows
+        invalid = np.asarray(invalid, dtype=bool) & ~failed
+        failed[invalid] = True
+        if field is None:
+            messages[invalid] = prefix
+        else:
+            values = data_df[field].to_numpy(dtype=object)[invalid]
+            messages[invalid] = [f"{prefix}{value}{suffix}" for value in values]
+
+    report(
+        ~data_df["type"].isin(TRANSACTION_TYPES).to_numpy(),
+        "Transaction Error: Unknown transaction type: ",
+        "type",
+        ".",
+    )
+
+    amount = pd.to_numeric(data_df["amount"], errors="coerce").to_numpy()
+    report(
+        ~np.isfinite(amount),
+        "Transaction Error: Amount must be float or int: ",
+        "amount",
+    )
+    report(
+        amount < 0, "Transaction Error: Amount must be a positive number: ", "amount"
+    )
+
+    for key, value in {
+        "account": accounts,
+        "category": categories,
+        "subcategory": sub_categories,
+    }.items():
+        report(
+            ~data_df[key].isin(value).to_numpy(),
+            f"Transaction Error: Unknown {key}:",
+            key,
+            ".",
         )
 
+    # dates repeat a lot: each distinct value is parsed only once
+    codes, dates = pd.factorize(data_df["date"], use_na_sentinel=False)
+    valid_dates = np.array([is_date(date) for date in dates], dtype=bool)
+    report(~valid_dates[codes] if len(dates) else np.zeros(0, dtype=bool), DATE_ERROR)
+    return failed, messages
+
 
 def validate_input(item, item_list, item_type, mode="add"):
     """Utility function validate the input before updating data.
@@ -72,7 +139,8 @@ def validate_input(item, item_list, item_type, mode="add"):
 
     Args:
         item: item to check (e.g. str)
-        item_list (list): list of present items.
+        item_list (collection): present items, a set (or any collection with an O(1)
+            ``in``, e.g. the transactions view) keeps the check O(1).
         item_type (type): type of the item that is expected.
         mode (str, optional): mode of the check. Defaults to "add".
 
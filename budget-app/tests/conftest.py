@@ -1,5 +1,6 @@
 """Fixtures for the test module."""
 import os
+import shutil
 import sys
 
 import pytest
@@ -10,7 +11,11 @@ module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # sys.path.append('../')
 sys.path.insert(0, module_directory)
 # pylint: disable=C0116, W0621
-from core.data_manager import DATA_CSV, METADATA_JSON  # pylint: disable=C0413,E0401
+from core.data_manager import (  # pylint: disable=C0413,E0401
+    DATA_CSV,
+    METADATA_JSON,
+    DataManager,
+)
 
 TEST_FOLDER_PATH = "/tmp/tmp_empty_dir/"
 
@@ -21,13 +26,12 @@ def clean_data(folder_path):
     Args:
         folder_path (str): path to the folder.
     """
-    csv_file_path = os.path.join(folder_path, DATA_CSV)
-    json_file_path = os.path.join(folder_path, METADATA_JSON)
-
-    if os.path.exists(json_file_path):
-        os.remove(json_file_path)
-    if os.path.exists(csv_file_path):
-        os.remove(csv_file_path)
+    for file_name in os.listdir(folder_path):
+        file_path = os.path.join(folder_path, file_name)
+        if os.path.isdir(file_path):
+            shutil.rmtree(file_path)
+        else:
+            os.remove(file_path)
 
 
 @pytest.fixture
@@ -62,3 +66,34 @@ def create_full_folder(create_empty_folder):
 
     yield folder
     clean_data(folder_path=folder)
+
+
+@pytest.fixture
+def new_transaction():
+    """Fixture with a valid transaction that is not in the example data.
+
+    Returns:
+        dict: transaction dict.
+    """
+    return {
+        "date": "2118/01/03",
+        "type": "expense",
+        "amount": 10,
+        "account": "C24",
+        "category": "bar",
+        "subcategory": "alcohol",
+        "note": "new",
+    }
+
+
+@pytest.fixture
+def data_manager(create_empty_folder):
+    """Fixture with a csv data manager initialized with the example data.
+
+    Yields:
+        DataManager: data manager.
+    """
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+    yield new_manager
+    new_manager.close()
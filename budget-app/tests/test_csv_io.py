@@ -0,0 +1,58 @@
+"""Tests for the csv reader and writer of the transactions."""
+import io
+import os
+import sys
+
+import pytest
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.path.append('../')
+sys.path.insert(0, module_directory)
+# pylint: disable=C0116, W0621
+from core.utils.csv_io import read_columns, write_columns  # pylint: disable=C0413,E0401
+from core.utils.transaction_store import TransactionStore  # pylint: disable=C0413,E0401
+
+HEADER = "id,date,type,amount,account,category,subcategory,note\n"
+
+
+def test_read_write_round_trip():
+    text = HEADER + '1,2018-01-03,income,94.0,N26,salary,evotec,"may, june"\n'
+    columns = read_columns(io.StringIO(text, newline=""))
+    assert columns["id"] == [1]
+    assert columns["amount"] == [94.0]
+    assert columns["note"] == ["may, june"]
+    output = io.StringIO(newline="")
+    write_columns(output, columns)
+    assert output.getvalue() == text
+
+
+def test_read_ragged_rows():
+    text = (
+        HEADER
+        + "1,2018-01-03,income,94.0,N26,salary,evotec,may\n"
+        # no trailing empty note, then a blank line
+        + "2,2018-01-02,income,39.48,Wallet,gift,\n"
+        + "\n"
+        + "3,2018-01-04,expense,5,Wallet,bar,alcohol,\n"
+    )
+    columns = read_columns(io.StringIO(text, newline=""))
+    assert columns["id"] == [1, 2, 3]
+    assert columns["subcategory"] == ["evotec", "", "alcohol"]
+    assert columns["note"] == ["may", "", ""]
+    store = TransactionStore.from_columns(columns)
+    assert len(store) == 3
+    assert store.row(1)["note"] == ""
+
+
+def test_read_too_long_row():
+    text = HEADER + "1,2018-01-03,income,94.0,N26,salary,evotec,may,extra\n"
+    with pytest.raises(ValueError, match="Csv Error: line 2"):
+        read_columns(io.StringIO(text, newline=""))
+
+
+def test_read_empty_file():
+    assert not read_columns(io.StringIO(""))
+    columns = read_columns(io.StringIO(HEADER))
+    assert columns["id"] == []
@@ -0,0 +1,75 @@
+"""Tests for the aggregate cube of the dashboard."""
+import os
+import sys
+
+import pytest
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.path.append('../')
+sys.path.insert(0, module_directory)
+# pylint: disable=C0116, W0621
+from core.data_manager import EXAMPLE_DATA  # pylint: disable=C0413,E0401
+from core.utils.cube import ROLLUPS, AggregateCube  # pylint: disable=C0413,E0401
+
+
+def scan_total(transactions, **filters):
+    """Total computed by scanning all the transactions."""
+    matching = [
+        transaction
+        for transaction in transactions
+        if all(
+            (
+                transaction["date"][:4] + transaction["date"][5:7]
+                if key == "month"
+                else transaction[key]
+            )
+            == value
+            for key, value in filters.items()
+        )
+    ]
+    return sum(item["amount"] for item in matching), len(matching)
+
+
+def test_cube_totals(data_manager):
+    cube = data_manager.cube
+    assert len(ROLLUPS) == 16
+    assert cube.total() == pytest.approx(scan_total(EXAMPLE_DATA))
+    assert cube.total(account="Wallet") == pytest.approx((15.98, 4))
+    assert cube.total(month="201801", category="salary") == pytest.approx(
+        scan_total(EXAMPLE_DATA, month="201801", category="salary")
+    )
+    assert cube.total(month="199901") == (0.0, 0)
+
+    breakdown = cube.breakdown("account", month="201805")
+    for account, total in breakdown.items():
+        assert total == pytest.approx(
+            scan_total(EXAMPLE_DATA, month="201805", account=account)
+        )
+
+    with pytest.raises(ValueError):
+        cube.total(note="beer")
+
+
+def test_cube_updates(data_manager, new_transaction):
+    cube = data_manager.cube
+    data_manager.add_transaction(transaction=new_transaction)
+    assert cube.total(month="211801", account="C24") == (-10, 1)
+
+    data_manager.remove_transaction(transaction=dict(EXAMPLE_DATA[0]))
+    # the updated cube is the same as one built from scratch
+    rebuilt = AggregateCube.from_store(data_manager.store)
+    for rollup, cells in rebuilt.rollups.items():
+        assert cube.rollups[rollup].keys() == cells.keys()
+        for key, cell in cells.items():
+            assert cube.rollups[rollup][key] == pytest.approx(cell)
+
+    data_manager.remove_transaction(transaction=new_transaction)
+    assert cube.breakdown("month", account="C24").get("211801") is None
+
+
+def test_cube_empty_store():
+    cube = AggregateCube()
+    assert cube.total() == (0.0, 0)
+    assert cube.breakdown("category") == {}
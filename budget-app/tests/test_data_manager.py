@@ -12,6 +12,7 @@ sys.path.insert(0, module_directory)
 # pylint: disable=C0116, W0621
 from core.data_manager import (  # pylint: disable=C0413,E0401
     DATA_CSV,
+    DATA_JOURNAL,
     EXAMPLE_DATA,
     EXAMPLE_METADATA,
     METADATA_JSON,
@@ -288,6 +289,31 @@ def test_add_remove_transaction(create_empty_folder):
     assert item not in new_manager.accounts
 
 
+def test_add_ui_transaction_twice(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+
+    # the input dialogs give the amount as a string
+    item = {
+        "date": "2118/01/03",
+        "type": "expense",
+        "amount": "10",
+        "account": "N26",
+        "category": "salary",
+        "subcategory": "family",
+        "note": "may",
+    }
+
+    new_manager.add_transaction(transaction=dict(item))
+    with pytest.raises(ValueError):
+        new_manager.add_transaction(transaction=dict(item))
+    with pytest.raises(ValueError):
+        new_manager.add_transactions([dict(item, amount="10.00")])
+    assert len(new_manager.transactions) == len(EXAMPLE_DATA) + 1
+    assert {**item, "date": "2118-01-03", "amount": -10} in new_manager.transactions
+    new_manager.close()
+
+
 def test_save_transactions(create_empty_folder):
     new_manager = DataManager(data_folder=create_empty_folder)
     # create data
@@ -335,3 +361,248 @@ def test_save_transactions(create_empty_folder):
 
     # check if new transaction is removed
     assert test_transaction not in new_manager.transactions
+
+
+def test_journal_add_remove_transaction(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+    csv_mtime = os.path.getmtime(os.path.join(create_empty_folder, DATA_CSV))
+
+    item = {
+        "date": "2118/01/03",
+        "type": "expense",
+        "amount": 10,
+        "account": "N26",
+        "category": "bar",
+        "subcategory": "alcohol",
+        "note": "journal",
+    }
+    new_manager.add_transaction(transaction=item)
+
+    # the csv is not rewritten, the change is in the journal
+    assert os.path.getmtime(os.path.join(create_empty_folder, DATA_CSV)) == csv_mtime
+    assert os.path.exists(os.path.join(create_empty_folder, DATA_JOURNAL))
+
+    reloaded = DataManager(data_folder=create_empty_folder)
+    reloaded.initialize_data()
+    assert item in reloaded.transactions
+
+    reloaded.remove_transaction(transaction=item)
+
+    reloaded = DataManager(data_folder=create_empty_folder)
+    reloaded.initialize_data()
+    assert item not in reloaded.transactions
+    assert len(reloaded.transactions) == len(EXAMPLE_DATA)
+
+
+def test_journal_compaction(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder, journal_size_limit=0)
+    new_manager.initialize_data()
+
+    item = {
+        "date": "2118/01/03",
+        "type": "income",
+        "amount": 10,
+        "account": "N26",
+        "category": "salary",
+        "subcategory": "evotec",
+        "note": "compaction",
+    }
+    new_manager.add_transaction(transaction=item)
+    new_manager.storage.wait()
+
+    assert new_manager.storage.journal.size() == 0
+    assert not new_manager.storage.journal.has_rotated()
+
+    new_manager.load_transactions()
+    assert item in new_manager.transactions
+
+
+def test_journal_recover_interrupted_save(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+
+    item = {
+        "date": "2118/01/03",
+        "type": "income",
+        "amount": 10,
+        "account": "N26",
+        "category": "salary",
+        "subcategory": "evotec",
+        "note": "recover",
+    }
+    new_manager.add_transaction(transaction=item)
+    # simulate a crash after the csv has been written but before
+    # the rotated journal has been removed
+    new_manager.storage.journal.rotate()
+    new_manager.storage.write_transactions(new_manager.store)
+    new_manager.storage.journal.append("add", [item])
+    new_manager.storage.journal.rotate()
+
+    reloaded = DataManager(data_folder=create_empty_folder)
+    reloaded.initialize_data()
+
+    assert len(reloaded.transactions) == len(EXAMPLE_DATA) + 1
+    assert not reloaded.storage.journal.has_rotated()
+
+
+def test_balances_updated_on_add_remove(create_empty_folder, new_transaction):
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+
+    # all balances are computed when loading the transactions
+    assert new_manager.balances == pytest.approx(
+        {"N26": 34.5, "Wallet": 15.98, "C24": 50.0}
+    )
+    changes = []
+    new_manager.add_listener(lambda operation, items: changes.append(operation))
+
+    new_manager.add_transaction(transaction=new_transaction)
+    assert new_manager.get_account_balance(account="C24") == 40
+
+    new_manager.remove_transaction(transaction=new_transaction)
+    assert new_manager.get_account_balance(account="C24") == 50
+    assert changes == ["add", "remove"]
+
+    new_manager.add_account(account="test")
+    assert new_manager.get_account_balance(account="test") == 0
+
+
+def test_usage_counters(create_empty_folder, new_transaction):
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+
+    assert new_manager.get_usage_count("account", "Wallet") == 4
+    assert new_manager.get_usage_count("category", "bar") == 2
+    assert new_manager.get_usage_count("subcategory", "other") == 0
+
+    new_manager.add_category(category="test")
+    new_transaction["category"] = "test"
+    new_manager.add_transaction(transaction=new_transaction)
+    assert new_manager.get_usage_count("category", "test") == 1
+
+    with pytest.raises(ValueError):
+        new_manager.remove_category(category="test")
+
+    new_manager.remove_transaction(transaction=new_transaction)
+    assert new_manager.get_usage_count("category", "test") == 0
+    new_manager.remove_category(category="test")
+
+
+def test_add_remove_transactions_batch(create_empty_folder, new_transaction):
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+    batch = [dict(new_transaction, note=f"batch {i}") for i in range(3)]
+
+    # an invalid transaction rejects the whole batch
+    with pytest.raises(ValueError):
+        new_manager.add_transactions([*batch, dict(new_transaction, account="x")])
+    with pytest.raises(ValueError):
+        new_manager.add_transactions([*batch, dict(batch[0])])
+    assert len(new_manager.transactions) == len(EXAMPLE_DATA)
+
+    new_manager.add_transactions(iter(batch))
+    assert all(item in new_manager.transactions for item in batch)
+    assert new_manager.get_account_balance(account="C24") == 20
+
+    # the batch is persisted with a single journal record
+    journal_path = os.path.join(create_empty_folder, DATA_JOURNAL)
+    with open(journal_path, "r", encoding="utf8") as file:
+        assert len(file.readlines()) == 1
+
+    with pytest.raises(ValueError):
+        new_manager.remove_transactions([batch[0], batch[0]])
+    new_manager.remove_transactions(batch[:2])
+    new_manager.close()
+
+    reloaded = DataManager(data_folder=create_empty_folder)
+    reloaded.initialize_data()
+    assert len(reloaded.transactions) == len(EXAMPLE_DATA) + 1
+    assert batch[2] in reloaded.transactions
+
+
+def test_batch_rollback(create_empty_folder, new_transaction, monkeypatch):
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+    batch = [dict(new_transaction, date=f"2118/01/0{i}") for i in (1, 2)]
+    inputs = [dict(item) for item in batch]
+
+    # the caller's dicts are left as they are when the batch is rejected
+    with pytest.raises(ValueError):
+        new_manager.add_transactions([*batch, dict(new_transaction, account="x")])
+    assert batch == inputs
+
+    def fail(operation, transactions):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(new_manager.storage, "record", fail)
+    balance = new_manager.get_account_balance(account="C24")
+    with pytest.raises(OSError):
+        new_manager.add_transactions(batch)
+    assert batch == inputs
+    assert len(new_manager.transactions) == len(EXAMPLE_DATA)
+    assert new_manager.get_account_balance(account="C24") == balance
+    assert not new_manager.query(start_date="2118-01-01")
+
+    with pytest.raises(OSError):
+        new_manager.remove_transactions([EXAMPLE_DATA[0], EXAMPLE_DATA[1]])
+    assert len(new_manager.transactions) == len(EXAMPLE_DATA)
+    assert EXAMPLE_DATA[0] in new_manager.transactions
+    assert new_manager.get_transaction(EXAMPLE_DATA[1]["id"]) == EXAMPLE_DATA[1]
+
+    monkeypatch.undo()
+    new_manager.add_transactions(batch)
+    # ids, dates and signed amounts are set once the batch is added
+    assert [item["date"] for item in batch] == ["2118-01-01", "2118-01-02"]
+    assert all(item in new_manager.transactions for item in batch)
+    new_manager.remove_transactions([EXAMPLE_DATA[0], EXAMPLE_DATA[1]])
+    assert len(new_manager.transactions) == len(EXAMPLE_DATA)
+    new_manager.close()
+
+
+def test_add_transfer(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+
+    with pytest.raises(ValueError):
+        new_manager.add_transfer("2118/01/03", "10", "N26", "N26")
+    with pytest.raises(ValueError):
+        new_manager.add_transfer("2118/01/03", "10", "N26", "unknown")
+    assert len(new_manager.transactions) == len(EXAMPLE_DATA)
+
+    transaction_from, transaction_to = new_manager.add_transfer(
+        "2118/01/03", "10", "N26", "C24", note="rent"
+    )
+    assert transaction_from["amount"] == -10
+    assert transaction_to["amount"] == 10
+    assert new_manager.get_account_balance(account="N26") == 24.5
+    assert new_manager.get_account_balance(account="C24") == 60
+
+
+def test_metadata_sets_in_sync(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+
+    new_manager.add_account(account="test")
+    assert "test" in new_manager.metadata_sets["account"]
+    with pytest.raises(ValueError):
+        new_manager.add_account(account="test")
+
+    new_manager.remove_account(account="test")
+    assert "test" not in new_manager.metadata_sets["account"]
+    assert new_manager.metadata_sets["account"] == set(new_manager.accounts)
+
+
+def test_dates_stored_in_iso_format(create_empty_folder, new_transaction):
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+    new_manager.add_transaction(transaction=new_transaction)
+    new_manager.save_transactions()
+
+    assert new_transaction["date"] == "2118-01-03"
+    assert "2118-01-03" in list(new_manager.load_csv()["date"])
+    # either format finds the transaction
+    new_manager.remove_transaction(
+        transaction={**new_transaction, "date": "2118/01/03"}
+    )
+    assert new_transaction not in new_manager.transactions
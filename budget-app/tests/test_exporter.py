@@ -0,0 +1,78 @@
+"""Tests for the exporter module."""
+import csv
+import json
+import os
+import sys
+
+import pytest
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.path.append('../')
+sys.path.insert(0, module_directory)
+# pylint: disable=C0116, W0621
+from core.data_manager import EXAMPLE_DATA  # pylint: disable=C0413,E0401
+from core.utils.exporter import DataExporter  # pylint: disable=C0413,E0401
+
+
+def test_iter_transactions(data_manager, new_transaction):
+    data_manager.add_transaction(transaction=new_transaction)
+
+    chunks = list(data_manager.iter_transactions(chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 3]
+    assert [item for chunk in chunks for item in chunk] == list(
+        data_manager.transactions
+    )
+
+    # "YYYY/MM/DD" and "YYYY-MM-DD" dates are compared the same way
+    (filtered,) = data_manager.iter_transactions(
+        start_date="2018-06-01", accounts=["C24"]
+    )
+    assert [item["id"] for item in filtered] == [8, 9]
+    assert not list(data_manager.iter_transactions(categories=["unknown"]))
+
+
+def test_export_csv(data_manager, create_empty_folder):
+    path = os.path.join(create_empty_folder, "export.csv")
+    progress = []
+
+    exporter = DataExporter(data_manager, path, on_progress=progress.append)
+    exporter.start().join()
+
+    with open(path, "r", encoding="utf8") as file:
+        rows = list(csv.DictReader(file))
+    assert [int(row["id"]) for row in rows] == [item["id"] for item in EXAMPLE_DATA]
+    assert progress == [len(EXAMPLE_DATA)]
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_export_json_filtered(data_manager, create_empty_folder):
+    path = os.path.join(create_empty_folder, "export.json")
+
+    exporter = DataExporter(
+        data_manager,
+        path,
+        file_format="json",
+        filters={"categories": ["bar"], "chunk_size": 2},
+    )
+    assert exporter.run()
+
+    with open(path, "r", encoding="utf8") as file:
+        rows = [json.loads(line) for line in file]
+    assert rows == [item for item in EXAMPLE_DATA if item["category"] == "bar"]
+
+
+def test_export_cancel(data_manager, create_empty_folder):
+    path = os.path.join(create_empty_folder, "export.csv")
+
+    exporter = DataExporter(data_manager, path, filters={"chunk_size": 2})
+    exporter.on_progress = lambda exported: exporter.cancel()
+
+    assert not exporter.run()
+    assert exporter.exported == 2
+    assert not os.path.exists(path)
+    assert not os.path.exists(path + ".tmp")
+
+    with pytest.raises(ValueError):
+        DataExporter(data_manager, path, file_format="xml")
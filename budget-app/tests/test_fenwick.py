@@ -0,0 +1,101 @@
+"""Tests for the Fenwick trees of the amounts by day."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.path.append('../')
+sys.path.insert(0, module_directory)
+# pylint: disable=C0116, W0621
+from core.data_manager import EXAMPLE_DATA, DataManager  # pylint: disable=C0413,E0401
+from core.utils.dates import to_day  # pylint: disable=C0413,E0401
+from core.utils.fenwick import DayFenwick  # pylint: disable=C0413,E0401
+
+
+def test_day_fenwick_matches_scan():
+    rng = np.random.default_rng(0)
+    days = rng.integers(100, 200, size=500)
+    amounts = rng.normal(size=500)
+    tree = DayFenwick.from_days(days, amounts)
+
+    # days outside of the range grow the tree
+    for day, amount in [(50, 1.5), (1000, -2.0), (150, 3.0)]:
+        tree.add(day, amount)
+        days = np.append(days, day)
+        amounts = np.append(amounts, amount)
+
+    for day in [0, 50, 99, 120, 199, 500, 1000, 5000]:
+        assert tree.prefix_sum(day) == pytest.approx(amounts[days <= day].sum())
+    assert tree.range_sum(120, 160) == pytest.approx(
+        amounts[(days >= 120) & (days <= 160)].sum()
+    )
+    assert tree.range_sum(160, 120) == 0
+
+
+def test_empty_day_fenwick():
+    tree = DayFenwick.from_days(np.zeros(0, dtype=np.int64), np.zeros(0))
+    assert tree.prefix_sum(100) == 0
+    tree.add(100, 5)
+    assert tree.prefix_sum(99) == 0
+    assert tree.prefix_sum(100) == 5
+
+
+def test_balance_at(data_manager, new_transaction):
+    def scan_balance(account, date):
+        return round(
+            sum(
+                item["amount"]
+                for item in data_manager.transactions
+                if item["account"] == account and to_day(item["date"]) <= to_day(date)
+            ),
+            2,
+        )
+
+    for date in ["2017-12-31", "2018-01-03", "2018/05/11", "2030-01-01"]:
+        assert data_manager.balance_at("Wallet", date) == scan_balance("Wallet", date)
+    assert data_manager.balance_at("Wallet", "2030-01-01") == 15.98
+
+    # the trees follow the added and removed transactions
+    data_manager.add_transaction(transaction=new_transaction)
+    assert data_manager.balance_at("C24", "2118-01-02") == 50
+    assert data_manager.balance_at("C24", "2118-01-03") == 40
+    data_manager.remove_transaction(transaction=new_transaction)
+    assert data_manager.balance_history("C24", ["2118-01-02", "2118-01-03"]) == [
+        50,
+        50,
+    ]
+
+
+def test_category_total(data_manager):
+    for category in {item["category"] for item in EXAMPLE_DATA}:
+        assert data_manager.category_total(
+            category, "2018-01-01", "2018-05-31"
+        ) == round(
+            sum(
+                item["amount"]
+                for item in EXAMPLE_DATA
+                if item["category"] == category and item["date"] <= "2018-05-31"
+            ),
+            2,
+        )
+
+
+def test_balance_at_windowed(data_manager):
+    data_manager.save_transactions()  # writes the month index
+    windowed = DataManager(data_folder=data_manager.data_folder, window_months=1)
+    windowed.initialize_data()
+    assert windowed.balance_at("Wallet", "2030-01-01") == 15.98
+    # only the month of the date is loaded, the older ones come from the index
+    assert windowed.balance_at("Wallet", "2018-05-20") == data_manager.balance_at(
+        "Wallet", "2018-05-20"
+    )
+    assert windowed.storage.unloaded_months() == ["201801", "202012"]
+    assert windowed.balance_history("N26", ["2018-01-02", "2018-05-31"]) == (
+        data_manager.balance_history("N26", ["2018-01-02", "2018-05-31"])
+    )
+    assert windowed.storage.unloaded_months() == ["202012"]
+    windowed.close()
@@ -0,0 +1,110 @@
+"""Tests for the atomic commits and the version history."""
+import json
+import os
+import sys
+
+import pytest
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.path.append('../')
+sys.path.insert(0, module_directory)
+# pylint: disable=C0116, W0621
+from core.data_manager import (  # pylint: disable=C0413,E0401
+    DATA_CSV,
+    EXAMPLE_DATA,
+    EXAMPLE_METADATA,
+    METADATA_JSON,
+    DataManager,
+)
+from core.utils.commit import COMMIT_MARKER  # pylint: disable=C0413,E0401
+from core.utils.transaction_store import TransactionList  # pylint: disable=C0413,E0401
+
+
+def write_file(path, content):
+    with open(path, "w", encoding="utf8") as file:
+        file.write(content)
+
+
+def interrupted_commit(folder, with_marker):
+    """Leave the files of a commit of new metadata and no transactions."""
+    metadata = dict(EXAMPLE_METADATA, accounts=["new"])
+    write_file(os.path.join(folder, METADATA_JSON + ".tmp"), json.dumps(metadata))
+    write_file(
+        os.path.join(folder, DATA_CSV + ".tmp"),
+        "id,date,type,amount,account,category,subcategory,note\n",
+    )
+    if with_marker:
+        write_file(
+            os.path.join(folder, COMMIT_MARKER), json.dumps([DATA_CSV, METADATA_JSON])
+        )
+
+
+def test_commit_roll_forward(create_empty_folder):
+    DataManager(data_folder=create_empty_folder).initialize_data()
+    interrupted_commit(create_empty_folder, with_marker=True)
+
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+
+    # both files of the commit are applied
+    assert new_manager.accounts == ["new"]
+    assert len(new_manager.load_csv()) == 0
+    assert sorted(os.listdir(create_empty_folder)) == [DATA_CSV, METADATA_JSON]
+
+
+def test_commit_discard_incomplete(create_empty_folder):
+    DataManager(data_folder=create_empty_folder).initialize_data()
+    interrupted_commit(create_empty_folder, with_marker=False)
+
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+
+    # neither file of the commit is applied
+    assert new_manager.accounts == EXAMPLE_METADATA["accounts"]
+    assert len(new_manager.transactions) == len(EXAMPLE_DATA)
+    assert sorted(os.listdir(create_empty_folder)) == [DATA_CSV, METADATA_JSON]
+
+
+def test_history_versions(create_empty_folder, new_transaction):
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+    history = new_manager.storage.history
+
+    new_manager.add_transaction(transaction=new_transaction)
+    new_manager.remove_transaction(transaction=dict(EXAMPLE_DATA[0]))
+    new_manager.save_transactions()  # version 1
+    new_manager.add_account(account="test")  # version 2
+    new_manager.remove_transaction(transaction=new_transaction)
+    new_manager.save_transactions()  # version 3
+    assert history.versions() == [0, 1, 2, 3]
+
+    store, metadata = new_manager.storage.load_version(0)
+    assert sorted(TransactionList(store), key=lambda item: item["id"]) == EXAMPLE_DATA
+    assert metadata == EXAMPLE_METADATA
+
+    store, metadata = new_manager.storage.load_version(1)
+    assert new_transaction in TransactionList(store)
+    assert EXAMPLE_DATA[0] not in TransactionList(store)
+    assert "test" not in metadata["accounts"]
+
+    store, metadata = new_manager.storage.load_version(2)
+    assert new_transaction in TransactionList(store)
+    assert "test" in metadata["accounts"]
+
+    with pytest.raises(ValueError):
+        new_manager.storage.load_version(4)
+
+
+def test_history_prune(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder, history_size=2)
+    new_manager.initialize_data()
+
+    for account in ["a", "b", "c", "d"]:
+        new_manager.add_account(account=account)
+
+    # only the last 2 versions are kept besides the current one
+    assert new_manager.storage.history.versions() == [2, 3, 4]
+    _, metadata = new_manager.storage.load_version(2)
+    assert metadata["accounts"] == EXAMPLE_METADATA["accounts"] + ["a", "b"]
@@ -0,0 +1,163 @@
+"""Tests for the csv importer module."""
+import csv
+import os
+import sys
+
+import pytest
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.path.append('../')
+sys.path.insert(0, module_directory)
+# pylint: disable=C0116, W0621
+from core.data_manager import EXAMPLE_DATA, DataManager  # pylint: disable=C0413,E0401
+from core.utils.importer import (  # pylint: disable=C0413,E0401
+    ERROR_FIELD,
+    IMPORT_REJECTS,
+    CsvImporter,
+)
+
+HEADER = ["date", "type", "amount", "account", "category", "subcategory", "note"]
+
+
+def write_csv(path, rows, header=None):
+    with open(path, "w", encoding="utf8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(header or HEADER)
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def import_manager(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+    yield new_manager
+    new_manager.close()
+
+
+def test_import_csv(import_manager, create_empty_folder):
+    path = os.path.join(create_empty_folder, "bank.csv")
+    write_csv(
+        path,
+        [
+            ["2118/01/01", "expense", "-12", "N26", "bar", "alcohol", "beer"],
+            ["2118/01/02", "income", "100", "C24", "salary", "evotec", "june"],
+            ["2118/01/02", "income", "100", "C24", "salary", "evotec", "june"],
+            ["2118/01/03", "expense", "5", "unknown", "bar", "alcohol", ""],
+            ["2118-01-04", "expense", "5", "N26", "bar", "alcohol", ""],
+            ["2118/01/05", "expense", "abc", "N26", "bar", "alcohol", ""],
+        ],
+    )
+    progress = []
+
+    importer = CsvImporter(
+        import_manager,
+        path,
+        chunk_size=2,
+        on_progress=lambda *args: progress.append(args),
+    )
+    assert importer.run()
+
+    assert (importer.imported, importer.rejected) == (3, 3)
+    assert len(import_manager.transactions) == len(EXAMPLE_DATA) + 3
+    assert import_manager.get_account_balance(account="N26") == 34.5 - 12 - 5
+    assert import_manager.get_account_balance(account="C24") == 150
+    # progress is reported after each chunk
+    assert len(progress) == 3
+    assert progress[-1] == (3, 3, 1.0)
+
+    with open(
+        os.path.join(create_empty_folder, IMPORT_REJECTS), "r", encoding="utf8"
+    ) as file:
+        rejects = list(csv.DictReader(file))
+    assert [row["date"] for row in rejects] == [
+        "2118/01/02",
+        "2118/01/03",
+        "2118/01/05",
+    ]
+    assert all(row[ERROR_FIELD] for row in rejects)
+
+
+def test_import_existing_rows(import_manager, create_empty_folder):
+    path = os.path.join(create_empty_folder, "bank.csv")
+    write_csv(
+        path,
+        [
+            # expense already in the data (stored with a negative amount)
+            ["2018-05-11", "expense", "7", "Wallet", "bar", "alcohol", "beer"],
+            ["2018/01/03", "income", "94", "N26", "salary", "evotec", "may"],
+            ["2118-05-11", "expense", "7", "Wallet", "bar", "alcohol", "beer"],
+        ],
+    )
+
+    importer = CsvImporter(import_manager, path)
+    assert importer.run()
+
+    assert (importer.imported, importer.rejected) == (1, 2)
+    assert len(import_manager.transactions) == len(EXAMPLE_DATA) + 1
+    with open(
+        os.path.join(create_empty_folder, IMPORT_REJECTS), "r", encoding="utf8"
+    ) as file:
+        rejects = list(csv.DictReader(file))
+    assert [row["date"] for row in rejects] == ["2018-05-11", "2018/01/03"]
+    assert all("already exists" in row[ERROR_FIELD] for row in rejects)
+
+
+def test_import_fractional_amounts(import_manager, create_empty_folder):
+    path = os.path.join(create_empty_folder, "bank.csv")
+    write_csv(
+        path,
+        [
+            ["2118/01/01", "expense", "-12.75", "N26", "bar", "alcohol", "beer"],
+            ["2118/01/02", "income", "1000.99", "C24", "salary", "evotec", "june"],
+            ["2118/01/03", "expense", "0.125", "N26", "bar", "alcohol", "rounded"],
+            ["2118/01/04", "expense", "inf", "N26", "bar", "alcohol", "infinite"],
+        ],
+    )
+
+    importer = CsvImporter(import_manager, path)
+    assert importer.run()
+
+    assert (importer.imported, importer.rejected) == (3, 1)
+    imported = import_manager.query(start_date="2118-01-01")
+    assert [transaction["amount"] for transaction in imported] == [
+        -12.75,
+        1000.99,
+        -0.12,
+    ]
+    assert import_manager.get_account_balance(account="N26") == pytest.approx(
+        34.5 - 12.75 - 0.12
+    )
+    assert import_manager.get_account_balance(account="C24") == pytest.approx(
+        50 + 1000.99
+    )
+
+
+def test_import_cancel(import_manager, create_empty_folder):
+    path = os.path.join(create_empty_folder, "bank.csv")
+    write_csv(
+        path,
+        [
+            ["2118/01/01", "expense", "1", "N26", "bar", "alcohol", f"row {i}"]
+            for i in range(10)
+        ],
+    )
+
+    importer = CsvImporter(import_manager, path, chunk_size=4)
+    # stops after the first chunk, which is kept
+    importer.on_progress = lambda *args: importer.cancel()
+    importer.start().join()
+
+    assert not importer.is_running()
+    assert importer.imported == 4
+    assert len(import_manager.transactions) == len(EXAMPLE_DATA) + 4
+
+
+def test_import_missing_columns(import_manager, create_empty_folder):
+    path = os.path.join(create_empty_folder, "bank.csv")
+    write_csv(path, [["2118/01/01", "1"]], header=["date", "amount"])
+
+    with pytest.raises(ValueError):
+        CsvImporter(import_manager, path).run()
+    assert len(import_manager.transactions) == len(EXAMPLE_DATA)
@@ -0,0 +1,188 @@
+"""Tests for the date-windowed loading of the transactions."""
+import datetime
+import os
+import sys
+
+import pytest
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.path.append('../')
+sys.path.insert(0, module_directory)
+# pylint: disable=C0116, W0621
+from core.data_manager import (  # pylint: disable=C0413,E0401
+    EXAMPLE_DATA,
+    DataManager,
+    window_start,
+)
+from core.utils.month_index import DATA_INDEX  # pylint: disable=C0413,E0401
+
+TODAY = datetime.date.today().strftime("%Y/%m/%d")
+
+
+def recent_transactions(new_transaction):
+    return [
+        dict(new_transaction, date=TODAY, note="recent"),
+        dict(new_transaction, date=TODAY, account="N26", type="income", note="pay"),
+    ]
+
+
+@pytest.fixture(params=["csv", "sqlite", "partitioned"])
+def windowed_folder(request, create_empty_folder, new_transaction):
+    """Folder with the example data plus two transactions of the current month.
+
+    Yields:
+        tuple: folder path and storage name.
+    """
+    new_manager = DataManager(data_folder=create_empty_folder, storage=request.param)
+    new_manager.initialize_data()
+    new_manager.add_transactions(recent_transactions(new_transaction))
+    # the month index is written with the csv file
+    new_manager.save_transactions()
+    new_manager.close()
+    yield create_empty_folder, request.param
+
+
+def test_window_start():
+    assert window_start(datetime.date(2024, 3, 15), 12) == "202304"
+    assert window_start(datetime.date(2024, 12, 1), 1) == "202412"
+
+
+def test_windowed_loading(windowed_folder, new_transaction):
+    folder, storage = windowed_folder
+    full = DataManager(data_folder=folder, storage=storage)
+    full.initialize_data()
+
+    windowed = DataManager(data_folder=folder, storage=storage, window_months=12)
+    windowed.initialize_data()
+
+    # only the recent transactions are loaded, the aggregates cover all of them
+    assert len(windowed.transactions) == 2
+    assert windowed.balances == pytest.approx(full.balances)
+    assert windowed.usage == full.usage
+    assert windowed.get_account_balance("N26") == full.get_account_balance("N26")
+
+    windowed.ensure_loaded(start_date="2020-01-01")
+    assert len(windowed.transactions) == 4
+    assert windowed.storage.unloaded_months() == ["201801", "201805"]
+
+    # changes of months not loaded load them first
+    windowed.remove_transaction(transaction=dict(EXAMPLE_DATA[0]))
+    windowed.add_transaction(transaction=dict(new_transaction, date="2018/05/01"))
+    assert windowed.storage.unloaded_months() == []
+    windowed.save_transactions()
+    windowed.close()
+    full.close()
+
+    reloaded = DataManager(data_folder=folder, storage=storage)
+    reloaded.initialize_data()
+    assert len(reloaded.transactions) == len(EXAMPLE_DATA) + 2
+    assert EXAMPLE_DATA[0] not in reloaded.transactions
+    ids = [item["id"] for item in reloaded.transactions]
+    assert len(set(ids)) == len(ids)
+
+
+def test_windowed_query(windowed_folder):
+    folder, storage = windowed_folder
+    windowed = DataManager(data_folder=folder, storage=storage, window_months=12)
+    windowed.initialize_data()
+    unloaded = windowed.storage.unloaded_months()
+
+    # an open date range only lists the loaded transactions
+    assert len(windowed.query_ids(descending=True)) == 2
+    assert len(windowed.query_ids(text="bank")) == 0
+    assert windowed.storage.unloaded_months() == unloaded
+
+    # older months are paged in, newest first
+    assert windowed.load_older_months(count=1) == unloaded[-1:]
+    assert windowed.storage.unloaded_months() == unloaded[:-1]
+    assert len(windowed.query_ids()) > 2
+    while windowed.load_older_months():
+        pass
+    assert windowed.storage.unloaded_months() == []
+    assert len(windowed.query_ids()) == len(EXAMPLE_DATA) + 2
+
+    # a start date loads the months from it on
+    reloaded = DataManager(data_folder=folder, storage=storage, window_months=12)
+    reloaded.initialize_data()
+    assert len(reloaded.query_ids(start_date="2020-01-01")) == 4
+    assert reloaded.storage.unloaded_months() == ["201801", "201805"]
+    windowed.close()
+    reloaded.close()
+
+
+def test_windowed_export(windowed_folder):
+    folder, storage = windowed_folder
+    full = DataManager(data_folder=folder, storage=storage)
+    full.initialize_data()
+    windowed = DataManager(data_folder=folder, storage=storage, window_months=12)
+    windowed.initialize_data()
+    loaded_months = set(windowed.storage.loaded_months)
+    unloaded = windowed.storage.unloaded_months()
+
+    # the months not loaded are read from the storage, not loaded
+    chunks = list(windowed.iter_transactions(chunk_size=3))
+    exported = [item for chunk in chunks for item in chunk]
+    assert all(len(chunk) <= 3 for chunk in chunks)
+    assert sorted(exported, key=lambda item: item["id"]) == sorted(
+        full.transactions, key=lambda item: item["id"]
+    )
+    assert windowed.storage.loaded_months == loaded_months
+    assert windowed.storage.unloaded_months() == unloaded
+    assert len(windowed.transactions) == 2
+
+    chunks = windowed.iter_transactions(end_date="2018-05-31", accounts=["Wallet"])
+    filtered = [item for chunk in chunks for item in chunk]
+    assert {item["date"] for item in filtered} == {
+        "2018-01-02",
+        "2018-05-11",
+        "2018-05-18",
+    }
+    assert windowed.storage.unloaded_months() == unloaded
+
+    # a month loaded by a change during the export is read from the store
+    export = windowed.iter_transactions(chunk_size=1)
+    next(export)
+    windowed.remove_transaction(transaction=dict(EXAMPLE_DATA[0]))
+    exported = [item for chunk in export for item in chunk]
+    assert EXAMPLE_DATA[0] not in exported
+    assert len(exported) == len(EXAMPLE_DATA)
+    windowed.close()
+    full.close()
+
+
+def test_windowed_journal_replay(windowed_folder, new_transaction):
+    folder, storage = windowed_folder
+    windowed = DataManager(data_folder=folder, storage=storage, window_months=12)
+    windowed.initialize_data()
+    old_transaction = dict(new_transaction, date="2018/01/20")
+    windowed.add_transaction(transaction=old_transaction)
+    windowed.close()
+
+    reloaded = DataManager(data_folder=folder, storage=storage, window_months=12)
+    reloaded.initialize_data()
+    assert reloaded.get_account_balance("C24") == 50 - 10 - 10
+    if storage == "csv":
+        # the month changed by the journal record is loaded, not the others
+        assert old_transaction in reloaded.transactions
+        assert len(reloaded.transactions) == 2 + 2 + 1
+    reloaded.ensure_loaded(start_date="2018-01-01")
+    assert old_transaction in reloaded.transactions
+
+
+def test_windowed_without_index(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+
+    # all the data is loaded and the month index is written in the background
+    windowed = DataManager(data_folder=create_empty_folder, window_months=12)
+    windowed.initialize_data()
+    assert len(windowed.transactions) == len(EXAMPLE_DATA)
+    windowed.close()
+    assert os.path.exists(os.path.join(create_empty_folder, DATA_INDEX))
+
+    windowed = DataManager(data_folder=create_empty_folder, window_months=12)
+    windowed.initialize_data()
+    assert len(windowed.transactions) == 0
+    assert windowed.get_account_balance("Wallet") == 15.98
@@ -0,0 +1,171 @@
+"""Tests for the month-partitioned storage of the data manager."""
+import json
+import os
+import sys
+
+import pytest
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.path.append('../')
+sys.path.insert(0, module_directory)
+# pylint: disable=C0116, W0621
+from core.data_manager import (  # pylint: disable=C0413,E0401
+    EXAMPLE_DATA,
+    EXAMPLE_METADATA,
+    DataManager,
+)
+from core.utils.partitioned_storage import (  # pylint: disable=C0413,E0401
+    MANIFEST_JSON,
+    PARTITIONS_FOLDER,
+)
+
+
+@pytest.fixture
+def partitioned_manager(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder, storage="partitioned")
+    new_manager.initialize_data()
+    yield new_manager
+    new_manager.close()
+
+
+def read_manifest(folder):
+    with open(os.path.join(folder, MANIFEST_JSON), "r", encoding="utf8") as file:
+        return json.load(file)
+
+
+def test_initialize_partitioned(partitioned_manager, create_empty_folder):
+    assert sorted(os.listdir(create_empty_folder)) == [MANIFEST_JSON, PARTITIONS_FOLDER]
+    assert sorted(os.listdir(os.path.join(create_empty_folder, PARTITIONS_FOLDER))) == [
+        "201801.csv",
+        "201805.csv",
+        "202012.csv",
+    ]
+    assert partitioned_manager.accounts == EXAMPLE_METADATA["accounts"]
+    assert sorted(partitioned_manager.transactions, key=lambda item: item["id"]) == (
+        EXAMPLE_DATA
+    )
+
+    manifest = read_manifest(create_empty_folder)
+    assert manifest["metadata"] == EXAMPLE_METADATA
+    assert sum(entry["rows"] for entry in manifest["months"].values()) == len(
+        EXAMPLE_DATA
+    )
+    assert manifest["months"]["201801"]["first_date"] <= (
+        manifest["months"]["201801"]["last_date"]
+    )
+    assert partitioned_manager.storage.balance("N26") == pytest.approx(34.5)
+    assert partitioned_manager.storage.balance("unknown") == 0
+
+
+def test_partitioned_add_rewrites_one_month(
+    partitioned_manager, create_empty_folder, new_transaction
+):
+    partitions = os.path.join(create_empty_folder, PARTITIONS_FOLDER)
+    old_partition = os.path.join(partitions, "201801.csv")
+    old_mtime = os.stat(old_partition).st_mtime_ns
+
+    partitioned_manager.add_transaction(transaction=new_transaction)
+    assert os.path.exists(os.path.join(partitions, "211801.csv"))
+    assert os.stat(old_partition).st_mtime_ns == old_mtime
+
+    manifest = read_manifest(create_empty_folder)
+    assert manifest["months"]["211801"]["rows"] == 1
+    assert manifest["months"]["211801"]["balances"] == {"C24": -10}
+    assert manifest["months"]["211801"]["first_date"] == "2118-01-03"
+
+    # the partition of a month left without transactions is removed
+    partitioned_manager.remove_transaction(transaction={**new_transaction})
+    assert not os.path.exists(os.path.join(partitions, "211801.csv"))
+    assert "211801" not in read_manifest(create_empty_folder)["months"]
+
+
+def test_partitioned_reload(partitioned_manager, create_empty_folder, new_transaction):
+    partitioned_manager.add_transaction(transaction=new_transaction)
+    partitioned_manager.add_account(account="test")
+
+    reloaded = DataManager(data_folder=create_empty_folder, storage="partitioned")
+    reloaded.initialize_data()
+    assert {**new_transaction, "amount": -10} in reloaded.transactions
+    assert reloaded.get_account_balance(account="C24") == 40
+    assert "test" in reloaded.accounts
+    reloaded.close()
+
+
+def test_partitioned_date_range_reads(partitioned_manager, monkeypatch):
+    windowed = DataManager(
+        data_folder=partitioned_manager.data_folder,
+        storage="partitioned",
+        window_months=1,
+    )
+    windowed.initialize_data()
+    assert len(windowed.transactions) == 0
+    assert windowed.get_account_balance("Wallet") == 15.98
+
+    # only the partitions of the range are read, none is loaded
+    read = []
+    read_partitions = windowed.storage.read_partitions
+    monkeypatch.setattr(
+        windowed.storage,
+        "read_partitions",
+        lambda months: read.append(set(months)) or read_partitions(months),
+    )
+    list(windowed.iter_transactions(start_date="2018-05-01", end_date="2018-05-31"))
+    assert read == [{"201805"}]
+    assert windowed.storage.unloaded_months() == ["201801", "201805", "202012"]
+    windowed.close()
+
+
+def test_migrate_to_partitioned(create_empty_folder, new_transaction):
+    csv_manager = DataManager(data_folder=create_empty_folder)
+    csv_manager.initialize_data()
+    csv_manager.add_transaction(transaction=new_transaction)
+    csv_manager.close()
+
+    new_manager = DataManager(data_folder=create_empty_folder, storage="partitioned")
+    new_manager.initialize_data()
+    assert sorted(new_manager.transactions, key=lambda item: item["id"]) == sorted(
+        csv_manager.transactions, key=lambda item: item["id"]
+    )
+    new_manager.close()
+
+
+def test_partitioned_month_postings(
+    partitioned_manager, create_empty_folder, new_transaction, monkeypatch
+):
+    storage = partitioned_manager.storage
+
+    # a month is written from its postings, the store is never scanned by date
+    def fail(*args, **kwargs):
+        raise AssertionError("select over the whole store")
+
+    monkeypatch.setattr(storage.store, "select", fail)
+    second = dict(new_transaction, note="second")
+    partitioned_manager.add_transaction(transaction=new_transaction)
+    partitioned_manager.add_transaction(transaction=second)
+    assert [int(position) for position in storage.month_positions("211801")] == [
+        len(EXAMPLE_DATA),
+        len(EXAMPLE_DATA) + 1,
+    ]
+    partitioned_manager.remove_transaction(transaction={**new_transaction})
+    assert read_manifest(create_empty_folder)["months"]["211801"]["rows"] == 1
+    assert storage.month_columns("211801")["note"].tolist() == ["second"]
+
+
+def test_partitioned_invalid_dates(create_empty_folder, caplog):
+    new_manager = DataManager(data_folder=create_empty_folder, storage="partitioned")
+    new_manager.initialize_data()
+    new_manager.close()
+    path = os.path.join(create_empty_folder, PARTITIONS_FOLDER, "201801.csv")
+    with open(path, "a", encoding="utf8") as file:
+        file.write("99,2018-01-xx,expense,1.0,Wallet,bar,alcohol,bad date\n")
+
+    reloaded = DataManager(data_folder=create_empty_folder, storage="partitioned")
+    reloaded.initialize_data()
+    reloaded.remove_transaction(transaction=dict(EXAMPLE_DATA[0]))
+    # the row is kept in its partition and reported
+    with open(path, "r", encoding="utf8") as file:
+        assert "bad date" in file.read()
+    assert "invalid dates in 201801, transaction ids [99]" in caplog.text
+    reloaded.close()
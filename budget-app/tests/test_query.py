@@ -0,0 +1,140 @@
+"""Tests for the indexed transaction queries."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.path.append('../')
+sys.path.insert(0, module_directory)
+# pylint: disable=C0116, W0621
+from core.data_manager import EXAMPLE_DATA  # pylint: disable=C0413,E0401
+from core.utils.dates import to_day  # pylint: disable=C0413,E0401
+from core.utils.query_index import QueryIndex  # pylint: disable=C0413,E0401
+from core.utils.transaction_store import (  # pylint: disable=C0413,E0401
+    TransactionStore,
+    TransactionView,
+)
+
+
+def ids(transactions):
+    return [transaction["id"] for transaction in transactions]
+
+
+def test_query_all_sorted_by_date(data_manager):
+    transactions = data_manager.query()
+    assert ids(transactions) == [2, 1, 3, 5, 4, 6, 7, 8]
+    assert ids(data_manager.query(descending=True)) == [8, 7, 4, 6, 3, 5, 1, 2]
+    assert ids(data_manager.query(sort="amount")) == [7, 4, 6, 3, 5, 2, 8, 1]
+
+
+def test_query_views(data_manager):
+    view = data_manager.query(limit=1)[0]
+    assert isinstance(view, TransactionView)
+    assert view == EXAMPLE_DATA[1]
+    assert dict(view) == EXAMPLE_DATA[1]
+    assert view["amount"] == 39.48
+    with pytest.raises(KeyError):
+        _ = view["missing"]
+
+
+def test_query_filters(data_manager):
+    assert ids(data_manager.query(accounts=["Wallet"])) == [2, 3, 5, 6]
+    assert ids(data_manager.query(accounts=["Wallet"], types=["expense"])) == [3, 5, 6]
+    assert ids(data_manager.query(categories=["bar", "transport"])) == [3, 5, 4]
+    assert ids(data_manager.query(subcategories=[""])) == [7, 8]
+    assert not data_manager.query(accounts=["unknown"])
+    in_may = data_manager.query(start_date="2018/05/11", end_date="2018-05-18")
+    assert ids(in_may) == [3, 5, 4, 6]
+    assert ids(data_manager.query(start_date="2020-01-01")) == [7, 8]
+    assert ids(data_manager.query(end_date="2018-01-02")) == [2]
+    assert ids(
+        data_manager.query(
+            start_date="2018-05-01", accounts=["N26", "C24"], max_amount=0
+        )
+    ) == [4, 7]
+    assert ids(data_manager.query(min_amount=0, max_amount=50)) == [2, 8]
+
+
+def test_query_slices(data_manager):
+    assert ids(data_manager.query(limit=3)) == [2, 1, 3]
+    assert ids(data_manager.query(offset=3, limit=3)) == [5, 4, 6]
+    assert ids(data_manager.query(offset=6, limit=3)) == [7, 8]
+    with pytest.raises(ValueError):
+        data_manager.query(sort="note")
+
+
+def test_query_after_changes(data_manager, new_transaction):
+    # the index is built, then kept up to date
+    assert len(data_manager.query()) == len(EXAMPLE_DATA)
+    data_manager.add_transaction(new_transaction)
+    assert data_manager.query(descending=True, limit=1)[0] == new_transaction
+    assert ids(data_manager.query(accounts=["C24"])) == [8, new_transaction["id"]]
+
+    data_manager.remove_transaction(EXAMPLE_DATA[7])
+    assert ids(data_manager.query(accounts=["C24"])) == [new_transaction["id"]]
+    assert 8 not in ids(data_manager.query())
+
+
+def test_query_index_matches_scan():
+    rng = np.random.default_rng(0)
+    size = 2000
+    store = TransactionStore.from_frame(
+        pd.DataFrame(
+            {
+                "date": [
+                    f"2020-{month:02d}-{day:02d}"
+                    for month, day in zip(
+                        rng.integers(1, 13, size), rng.integers(1, 29, size)
+                    )
+                ],
+                "type": rng.choice(["income", "expense"], size),
+                "amount": rng.normal(size=size).round(2),
+                "account": rng.choice(["N26", "Wallet", "C24"], size),
+                "category": rng.choice(["bar", "gift", "salary", "grocery"], size),
+                "subcategory": rng.choice(["", "food"], size),
+                "note": "",
+            }
+        )
+    )
+    index = QueryIndex(store)
+    for position in rng.choice(size, 500, replace=False):
+        store.remove_at(int(position))
+    index.remove(500)
+
+    positions = index.query(
+        start_date="2020-03-01",
+        end_date="2020-06-30",
+        filters={"account": ["N26", "C24"], "category": ["bar"]},
+        min_amount=-1,
+        sort="amount",
+        descending=True,
+    )
+    alive = store.positions()
+    expected = alive[
+        (store.days[alive] >= to_day("2020-03-01"))
+        & (store.days[alive] <= to_day("2020-06-30"))
+        & np.isin(
+            [store.levels["account"][code] for code in store.codes["account"][alive]],
+            ["N26", "C24"],
+        )
+        & np.isin(
+            [store.levels["category"][code] for code in store.codes["category"][alive]],
+            ["bar"],
+        )
+        & (store.amount[alive] >= -1)
+    ]
+    assert sorted(positions.tolist()) == sorted(expected.tolist())
+    amounts = store.amount[positions]
+    assert (np.diff(amounts) <= 0).all()
+
+
+def test_query_ids(data_manager):
+    assert data_manager.query_ids() == ids(data_manager.query())
+    assert data_manager.query_ids(
+        accounts=["Wallet"], text="alc", descending=True, limit=1
+    ) == [3]
@@ -0,0 +1,89 @@
+"""Tests for the write-behind scheduler module."""
+import os
+import sys
+import threading
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.path.append('../')
+sys.path.insert(0, module_directory)
+# pylint: disable=C0116, W0621
+from core.data_manager import (  # pylint: disable=C0413,E0401
+    DATA_JOURNAL,
+    EXAMPLE_DATA,
+    DataManager,
+)
+from core.utils.scheduler import WriteBehindScheduler  # pylint: disable=C0413,E0401
+
+
+def test_scheduler_quiet_period():
+    flushed = threading.Event()
+    scheduler = WriteBehindScheduler(flushed.set, delay=0.05, max_operations=100)
+
+    scheduler.mark()
+    scheduler.mark()
+    assert scheduler.pending() == 2
+    assert flushed.wait(timeout=5)
+    assert scheduler.pending() == 0
+    scheduler.close()
+
+
+def test_scheduler_max_operations():
+    flushed = threading.Event()
+    scheduler = WriteBehindScheduler(flushed.set, delay=60, max_operations=3)
+
+    scheduler.mark()
+    scheduler.mark()
+    assert not flushed.wait(timeout=0.1)
+    scheduler.mark()
+    assert flushed.wait(timeout=5)
+    scheduler.close()
+
+
+def test_scheduler_close_flushes():
+    calls = []
+    scheduler = WriteBehindScheduler(lambda: calls.append(1), delay=60)
+
+    scheduler.mark()
+    scheduler.close()
+    assert calls == [1]
+
+
+def journal_lines(folder):
+    path = os.path.join(folder, DATA_JOURNAL)
+    if not os.path.exists(path):
+        return 0
+    with open(path, "r", encoding="utf8") as file:
+        return len(file.readlines())
+
+
+def test_write_behind_data_manager(create_empty_folder, new_transaction):
+    new_manager = DataManager(
+        data_folder=create_empty_folder, write_behind=True, flush_delay=60
+    )
+    new_manager.initialize_data()
+
+    second_transaction = dict(new_transaction, note="second")
+    new_manager.add_transaction(transaction=new_transaction)
+    new_manager.add_transaction(transaction=second_transaction)
+    new_manager.add_category(category="test")
+    # nothing is written until the flush
+    assert journal_lines(create_empty_folder) == 0
+    assert (
+        "test"
+        not in DataManager(create_empty_folder).storage.load_metadata()["categories"]
+    )
+
+    new_manager.flush()
+    # the two adds are coalesced in a single record
+    assert journal_lines(create_empty_folder) == 1
+
+    new_manager.remove_transaction(transaction=new_transaction)
+    new_manager.close()
+    assert journal_lines(create_empty_folder) == 2
+
+    reloaded = DataManager(data_folder=create_empty_folder)
+    reloaded.initialize_data()
+    assert len(reloaded.transactions) == len(EXAMPLE_DATA) + 1
+    assert "test" in reloaded.categories
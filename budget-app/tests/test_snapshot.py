@@ -0,0 +1,73 @@
+"""Tests for the binary snapshot of the transactions."""
+import os
+import sys
+
+import pytest
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.path.append('../')
+sys.path.insert(0, module_directory)
+# pylint: disable=C0116, W0621
+from core.data_manager import DataManager  # pylint: disable=C0413,E0401
+from core.data_manager import DATA_CSV, EXAMPLE_DATA  # pylint: disable=C0413,E0401
+from core.utils.snapshot import (  # pylint: disable=C0413,E0401
+    DATA_SNAPSHOT,
+    read_snapshot,
+    write_snapshot,
+)
+from core.utils.transaction_store import TransactionList  # pylint: disable=C0413,E0401
+
+pa = pytest.importorskip("pyarrow")
+
+
+def test_snapshot_round_trip(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder)
+    new_manager.initialize_data()
+    path = os.path.join(create_empty_folder, DATA_SNAPSHOT)
+
+    assert write_snapshot(new_manager.store, path)
+
+    table = pa.feather.read_table(path)
+    assert table.schema.field("date").type == pa.date32()
+    assert table.schema.field("amount").type == pa.float64()
+    assert pa.types.is_dictionary(table.schema.field("account").type)
+
+    assert list(TransactionList(read_snapshot(path))) == EXAMPLE_DATA
+
+
+def test_snapshot_loaded_when_newer(create_empty_folder, new_transaction):
+    new_manager = DataManager(
+        data_folder=create_empty_folder, journal_size_limit=0, snapshot=True
+    )
+    new_manager.initialize_data()
+    new_manager.add_transaction(transaction=new_transaction)
+    new_manager.storage.wait()
+    assert os.path.exists(os.path.join(create_empty_folder, DATA_SNAPSHOT))
+
+    reloaded = DataManager(data_folder=create_empty_folder, snapshot=True)
+    reloaded.initialize_data()
+    assert reloaded.storage.is_snapshot_newer()
+    # dates are read back from the snapshot in the "YYYY-MM-DD" format
+    iso_transaction = {**new_transaction, "date": "2118-01-03", "amount": -10}
+    assert iso_transaction in reloaded.transactions
+
+    # journal records are matched against the snapshot dates
+    reloaded.remove_transaction(transaction=iso_transaction)
+    reloaded = DataManager(data_folder=create_empty_folder, snapshot=True)
+    reloaded.initialize_data()
+    assert list(reloaded.transactions) == EXAMPLE_DATA
+
+
+def test_snapshot_ignored_when_older(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder, snapshot=True)
+    new_manager.initialize_data()
+    new_manager.save_transactions()
+
+    csv_path = os.path.join(create_empty_folder, DATA_CSV)
+    snapshot_mtime = os.path.getmtime(os.path.join(create_empty_folder, DATA_SNAPSHOT))
+    os.utime(csv_path, (snapshot_mtime + 10, snapshot_mtime + 10))
+
+    reloaded = DataManager(data_folder=create_empty_folder, snapshot=True)
+    assert not reloaded.storage.is_snapshot_newer()
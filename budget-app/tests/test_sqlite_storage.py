@@ -0,0 +1,146 @@
+"""Tests for the sqlite storage of the data manager."""
+import os
+import sys
+
+import pytest
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.path.append('../')
+sys.path.insert(0, module_directory)
+# pylint: disable=C0116, W0621
+from core.data_manager import (  # pylint: disable=C0413,E0401
+    DATA_DB,
+    EXAMPLE_DATA,
+    EXAMPLE_METADATA,
+    DataManager,
+)
+from core.utils.sqlite_storage import _month_ranges  # pylint: disable=C0413,E0401
+
+
+@pytest.fixture
+def sqlite_manager(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder, storage="sqlite")
+    new_manager.initialize_data()
+    yield new_manager
+    new_manager.close()
+
+
+def test_initialize_sqlite(sqlite_manager, create_empty_folder):
+    assert os.listdir(create_empty_folder) == [DATA_DB]
+    assert sqlite_manager.accounts == EXAMPLE_METADATA["accounts"]
+    assert list(sqlite_manager.transactions) == EXAMPLE_DATA
+
+
+def test_invalid_storage(create_empty_folder):
+    with pytest.raises(ValueError):
+        DataManager(data_folder=create_empty_folder, storage="invalid")
+
+
+def test_sqlite_add_remove_transaction(
+    sqlite_manager, create_empty_folder, new_transaction
+):
+    sqlite_manager.add_transaction(transaction=new_transaction)
+
+    reloaded = DataManager(data_folder=create_empty_folder, storage="sqlite")
+    reloaded.initialize_data()
+    assert {**new_transaction, "amount": -10} in reloaded.transactions
+    assert reloaded.get_account_balance(account="C24") == 40
+
+    reloaded.remove_transaction(transaction={**new_transaction, "amount": -10})
+    reloaded.close()
+
+    reloaded = DataManager(data_folder=create_empty_folder, storage="sqlite")
+    reloaded.initialize_data()
+    assert list(reloaded.transactions) == EXAMPLE_DATA
+    reloaded.close()
+
+
+def test_sqlite_queries(sqlite_manager):
+    assert sqlite_manager.storage.balance("N26") == pytest.approx(34.5)
+    assert sqlite_manager.storage.balance("unknown") == 0
+    assert sqlite_manager.storage.is_used("category", "bar")
+    assert not sqlite_manager.storage.is_used("category", "other")
+
+    with pytest.raises(ValueError):
+        sqlite_manager.storage.is_used("note", "beer")
+
+    with pytest.raises(ValueError):
+        sqlite_manager.remove_category(category="bar")
+
+
+def test_sqlite_metadata(sqlite_manager, create_empty_folder):
+    sqlite_manager.add_account(account="test")
+
+    reloaded = DataManager(data_folder=create_empty_folder, storage="sqlite")
+    reloaded.initialize_data()
+    assert "test" in reloaded.accounts
+    reloaded.close()
+
+
+def test_migrate_from_csv(create_empty_folder, new_transaction):
+    csv_manager = DataManager(data_folder=create_empty_folder)
+    csv_manager.initialize_data()
+    csv_manager.add_transaction(transaction=new_transaction)
+    csv_manager.add_category(category="test")
+    csv_manager.close()
+
+    new_manager = DataManager(data_folder=create_empty_folder, storage="sqlite")
+    new_manager.initialize_data()
+
+    assert list(new_manager.transactions) == list(csv_manager.transactions)
+    assert new_manager.categories == csv_manager.categories
+    new_manager.close()
+
+
+def test_sqlite_month_ranges(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder, storage="sqlite")
+    new_manager.initialize_data()
+    connection = new_manager.storage.connection
+    where, bounds = _month_ranges(["201812", "201801"])
+    assert bounds == ("2018-01-01", "2018-02-01", "2018-12-01", "2019-01-01")
+    plan = connection.execute(
+        f"EXPLAIN QUERY PLAN SELECT * FROM transactions WHERE {where}", bounds
+    ).fetchall()
+    assert "idx_transactions_date" in str(plan)
+    assert _month_ranges([]) == ("0", ())
+    new_manager.close()
+
+
+def test_sqlite_windowed_months_in_memory(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder, storage="sqlite")
+    new_manager.initialize_data()
+    new_manager.close()
+
+    windowed = DataManager(
+        data_folder=create_empty_folder, storage="sqlite", window_months=12
+    )
+    windowed.initialize_data()
+    assert windowed.storage.unloaded_months() == ["201801", "201805", "202012"]
+    assert windowed.get_account_balance("Wallet") == pytest.approx(15.98)
+    # the months and their aggregates are not read from the database again
+    windowed.storage.close()
+    windowed.storage.connection.execute("DELETE FROM transactions")
+    assert windowed.storage.unloaded_months() == ["201801", "201805", "202012"]
+    assert windowed.storage.opening()["balances"]["Wallet"] == pytest.approx(15.98)
+    windowed.close()
+
+
+def test_sqlite_legacy_dates(create_empty_folder):
+    new_manager = DataManager(data_folder=create_empty_folder, storage="sqlite")
+    new_manager.initialize_data()
+    connection = new_manager.storage.connection
+    connection.execute("UPDATE transactions SET date = '2018/1/3' WHERE id = 1")
+    connection.execute("PRAGMA user_version = 0")
+    connection.commit()
+    new_manager.close()
+
+    reloaded = DataManager(data_folder=create_empty_folder, storage="sqlite")
+    reloaded.initialize_data()
+    assert reloaded.get_transaction(1)["date"] == "2018-01-03"
+    (date,) = reloaded.storage.connection.execute(
+        "SELECT date FROM transactions WHERE id = 1"
+    ).fetchone()
+    assert date == "2018-01-03"
+    reloaded.close()
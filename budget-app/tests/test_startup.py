@@ -0,0 +1,64 @@
+"""Tests for the import and startup budget of the data manager."""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# pylint: disable=C0116, W0621
+
+# modules too heavy to be imported before the app shows its first frame
+HEAVY_MODULES = ("pandas", "pyarrow")
+# seconds for a fresh interpreter to load the data (well under a second on a laptop)
+STARTUP_BUDGET = 3
+
+STARTUP_SCRIPT = textwrap.dedent(
+    """
+    import json
+    import sys
+    import time
+
+    start = time.perf_counter()
+    sys.path.insert(0, {module_directory!r})
+    from core.data_manager import DataManager
+
+    manager = DataManager(
+        data_folder={data_folder!r}, storage={storage!r}, window_months=12
+    )
+    manager.initialize_data()
+    # what the Dashboard and the Transactions page read on startup
+    manager.cube.total()
+    manager.query_ids(descending=True)
+    manager.close()
+    print(json.dumps({{
+        "seconds": time.perf_counter() - start,
+        "modules": [name for name in {heavy!r} if name in sys.modules],
+    }}))
+    """
+)
+
+
+def run_startup(data_folder, storage):
+    script = STARTUP_SCRIPT.format(
+        module_directory=module_directory,
+        data_folder=data_folder,
+        storage=storage,
+        heavy=HEAVY_MODULES,
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, check=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+@pytest.mark.parametrize("storage", ["csv", "sqlite", "partitioned"])
+def test_startup_does_not_import_pandas(create_empty_folder, storage):
+    # first start creates the data files, the second one loads them
+    for _ in range(2):
+        result = run_startup(create_empty_folder, storage)
+        assert result["modules"] == []
+        assert result["seconds"] < STARTUP_BUDGET
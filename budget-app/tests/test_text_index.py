@@ -0,0 +1,90 @@
+"""Tests for the full-text search of the transactions."""
+import os
+import sys
+
+import numpy as np
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.path.append('../')
+sys.path.insert(0, module_directory)
+# pylint: disable=C0116, W0621
+from core.data_manager import EXAMPLE_DATA  # pylint: disable=C0413,E0401
+from core.utils.text_index import TextIndex, tokenize  # pylint: disable=C0413,E0401
+from core.utils.transaction_store import (  # pylint: disable=C0413,E0401
+    CATEGORICAL_FIELDS,
+    TransactionStore,
+)
+
+
+def ids(transactions):
+    return [transaction["id"] for transaction in transactions]
+
+
+def test_tokenize():
+    assert tokenize("To Wallet, from-room 2x") == ["to", "wallet", "from", "room", "2x"]
+    assert not tokenize("")
+
+
+def test_search(data_manager):
+    assert ids(data_manager.query(text="penny")) == [6]
+    # prefix of a word of the note and of the category
+    assert ids(data_manager.query(text="pen gro")) == [6]
+    assert ids(data_manager.query(text="GROCERY")) == [6]
+    # words of the note, category and subcategory
+    assert ids(data_manager.query(text="bank")) == [7, 8]
+    assert ids(data_manager.query(text="wallet")) == [7]
+    assert ids(data_manager.query(text="alc")) == [3, 5]
+    assert not data_manager.query(text="alc penny")
+    assert ids(data_manager.query(text="alc", sort="id", descending=True, limit=1)) == [
+        5
+    ]
+    assert ids(data_manager.query(text="bank", accounts=["C24"])) == [8]
+    # no words: no text filter
+    assert len(data_manager.query(text=" ")) == len(EXAMPLE_DATA)
+
+
+def test_search_after_changes(data_manager, new_transaction):
+    assert not data_manager.query(text="new")
+    new_transaction["note"] = "new cocktails"
+    data_manager.add_transaction(new_transaction)
+    assert ids(data_manager.query(text="cock")) == [new_transaction["id"]]
+    assert ids(data_manager.query(text="alcohol")) == [3, 5, new_transaction["id"]]
+
+    data_manager.remove_transaction(EXAMPLE_DATA[2])
+    assert ids(data_manager.query(text="alcohol")) == [5, new_transaction["id"]]
+
+
+def test_search_keeps_index(data_manager, new_transaction):
+    assert ids(data_manager.query(text="alcohol")) == [3, 5]
+    text_index = data_manager.text_index
+    new_transaction["note"] = "new cocktails"
+    data_manager.add_transaction(new_transaction)
+    data_manager.remove_transaction(EXAMPLE_DATA[2])
+    assert data_manager.text_index is text_index
+    assert ids(data_manager.query(text="cock")) == [new_transaction["id"]]
+    assert ids(data_manager.query(text="alcohol")) == [5, new_transaction["id"]]
+
+
+def test_search_large():
+    size = 1_000_000
+    rng = np.random.default_rng(0)
+    notes = [
+        f"shop {word}{number}"
+        for word in ("penny", "rewe", "aldi")
+        for number in range(1000)
+    ]
+    levels = {field: [""] for field in CATEGORICAL_FIELDS}
+    levels["note"] = notes
+    levels["category"] = ["grocery", "bar", "transport"]
+    codes = {field: np.zeros(size, dtype=np.int32) for field in CATEGORICAL_FIELDS}
+    codes["note"] = rng.integers(0, len(notes), size).astype(np.int32)
+    codes["category"] = rng.integers(0, 3, size).astype(np.int32)
+    store = TransactionStore.from_codes(np.zeros(size), codes, levels)
+    index = TextIndex(store)
+
+    for text in ["p", "pe", "pen", "penny", "penny g", "penny gro"]:
+        mask = index.match(text)
+    expected = (codes["note"] < 1000) & (codes["category"] == 0)
+    assert (mask == expected).all()
@@ -0,0 +1,117 @@
+"""Tests for the tracing spans."""
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.path.append('../')
+sys.path.insert(0, module_directory)
+# pylint: disable=C0116, W0621
+from core.data_manager import DataManager  # pylint: disable=C0413,E0401
+from core.utils import tracing  # pylint: disable=C0413,E0401
+from core.utils.csv_io import read_store  # pylint: disable=C0413,E0401
+from core.utils.tracing import Tracer, span, traced  # pylint: disable=C0413,E0401
+
+
+@pytest.fixture
+def app_tracer():
+    was_enabled = tracing.tracer.enabled
+    tracing.tracer.reset()
+    tracing.tracer.enable()
+    yield tracing.tracer
+    tracing.tracer.enabled = was_enabled
+    tracing.tracer.reset()
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span("block"):
+        pass
+    assert not tracer.events
+    assert tracer.summary() == {}
+
+
+def test_nested_spans_self_time():
+    tracer = Tracer(enabled=True)
+    with tracer.span("outer"):
+        for _ in range(3):
+            with tracer.span("inner", step=1):
+                sum(range(10000))
+    summary = tracer.summary()
+    assert list(summary) == ["outer", "inner"]
+    assert summary["inner"]["count"] == 3
+    assert summary["outer"]["count"] == 1
+    assert summary["inner"]["self"] == pytest.approx(summary["inner"]["total"])
+    assert summary["outer"]["self"] < summary["outer"]["total"]
+    assert summary["outer"]["total"] >= summary["inner"]["total"]
+    assert summary["inner"]["max"] <= summary["inner"]["total"]
+
+
+def test_spans_of_threads_do_not_nest():
+    tracer = Tracer(enabled=True)
+
+    def work():
+        with tracer.span("thread"):
+            sum(range(10000))
+
+    with tracer.span("main"):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+    summary = tracer.summary()
+    # the thread span is not a child of the main one
+    assert summary["main"]["self"] == pytest.approx(summary["main"]["total"])
+    assert len({event[5] for event in tracer.events}) == 2
+
+
+def test_chrome_trace_export(tmp_path):
+    tracer = Tracer(enabled=True)
+    with tracer.span("outer", rows=2):
+        with tracer.span("inner"):
+            pass
+    path = tmp_path / "trace.json"
+    tracer.export_chrome_trace(str(path))
+    with open(path, "r", encoding="utf8") as file:
+        trace = json.load(file)
+    events = {event["name"]: event for event in trace["traceEvents"]}
+    assert set(events) == {"outer", "inner"}
+    assert all(event["ph"] == "X" for event in events.values())
+    assert events["outer"]["args"] == {"rows": 2}
+    assert events["outer"]["ts"] <= events["inner"]["ts"]
+    assert events["inner"]["dur"] <= events["outer"]["dur"]
+    tracer.reset()
+    assert tracer.chrome_trace()["traceEvents"] == []
+
+
+def test_traced_names(app_tracer, create_empty_folder):
+    @traced
+    def helper():
+        with span("helper block"):
+            return 1
+
+    assert helper() == 1
+    data_manager = DataManager(data_folder=create_empty_folder, window_months=12)
+    data_manager.initialize_data()
+    data_manager.close()
+    read_store(os.path.join(create_empty_folder, "data.csv"))
+    summary = app_tracer.summary()
+    assert "test_traced_names.<locals>.helper" in summary
+    assert "helper block" in summary
+    assert "DataManager.initialize_data" in summary
+    assert "csv_io.read_store" in summary
+
+
+def test_traced_disabled(app_tracer):
+    @traced
+    def helper(value):
+        return value * 2
+
+    app_tracer.disable()
+    assert helper(2) == 4
+    assert helper.__name__ == "helper"
+    assert app_tracer.summary() == {}
@@ -0,0 +1,146 @@
+"""Tests for the transaction store module."""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Get the directory containing your module
+module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.path.append('../')
+sys.path.insert(0, module_directory)
+# pylint: disable=C0116, W0621
+from core.utils.dummy_data import EXAMPLE_DATA  # pylint: disable=C0413,E0401
+from core.utils.transaction_store import (  # pylint: disable=C0413,E0401
+    ID_FIELD,
+    TRANSACTION_FIELDS,
+    TransactionList,
+    TransactionStore,
+)
+
+
+@pytest.fixture
+def store():
+    return TransactionStore.from_frame(pd.DataFrame(EXAMPLE_DATA).fillna(""))
+
+
+def test_from_frame_round_trip(store):
+    assert len(store) == len(EXAMPLE_DATA)
+    assert list(TransactionList(store)) == EXAMPLE_DATA
+
+    columns = store.to_columns()
+    assert tuple(columns) == (ID_FIELD,) + TRANSACTION_FIELDS
+    assert pd.DataFrame(columns).to_dict(orient="records") == EXAMPLE_DATA
+
+
+def test_append_grows_capacity():
+    new_store = TransactionStore(capacity=2)
+
+    for transaction in EXAMPLE_DATA:
+        new_store.append(transaction)
+
+    assert len(new_store) == len(EXAMPLE_DATA)
+    assert [new_store.row(i) for i in range(len(EXAMPLE_DATA))] == EXAMPLE_DATA
+
+
+def test_find_and_remove(store):
+    transactions = TransactionList(store)
+
+    assert store.find(EXAMPLE_DATA[3]) == 3
+    assert EXAMPLE_DATA[3] in transactions
+    assert store.find({**EXAMPLE_DATA[3], "note": "unknown"}) == -1
+    assert (
+        store.find({**EXAMPLE_DATA[3], "amount": str(EXAMPLE_DATA[3]["amount"])}) == -1
+    )
+    assert store.find({**EXAMPLE_DATA[3], "extra": 1}) == -1
+
+    transactions.remove(EXAMPLE_DATA[3])
+
+    assert EXAMPLE_DATA[3] not in transactions
+    assert len(transactions) == len(EXAMPLE_DATA) - 1
+    assert transactions[3] == EXAMPLE_DATA[4]
+
+    with pytest.raises(ValueError):
+        transactions.remove(EXAMPLE_DATA[3])
+
+
+def test_count_and_sum_amount(store):
+    assert store.count("account", "Wallet") == 4
+    assert store.count("account", "unknown") == 0
+    assert store.sum_amount("account", "Wallet") == pytest.approx(15.98)
+
+    store.remove_at(1)
+
+    assert store.count("account", "Wallet") == 3
+    assert store.sum_amount("account", "Wallet") == pytest.approx(-23.5)
+
+
+def test_transaction_ids(store):
+    duplicate = {k: v for k, v in EXAMPLE_DATA[0].items() if k != ID_FIELD}
+    position = store.append(duplicate)
+
+    # a new id is assigned and set in the dict
+    assert duplicate[ID_FIELD] == len(EXAMPLE_DATA) + 1
+    assert store.index[duplicate[ID_FIELD]] == position
+
+    with pytest.raises(ValueError):
+        store.append(dict(duplicate))
+
+    # identical transactions are told apart by their id
+    assert store.find(duplicate) == position
+    assert store.find(EXAMPLE_DATA[0]) == 0
+    store.remove_at(position)
+    assert store.find(duplicate) == -1
+    assert store.find(EXAMPLE_DATA[0]) == 0
+
+
+def test_ids_assigned_to_legacy_data():
+    legacy_df = pd.DataFrame(EXAMPLE_DATA).drop(columns=[ID_FIELD])
+    legacy_store = TransactionStore.from_frame(legacy_df)
+
+    assert list(TransactionList(legacy_store)) == EXAMPLE_DATA
+    assert legacy_store.next_id == len(EXAMPLE_DATA) + 1
+
+
+def test_fingerprints_multiset(store):
+    content = {k: v for k, v in EXAMPLE_DATA[2].items() if k != ID_FIELD}
+    fingerprint = store.fingerprint(content)
+    assert store.fingerprints[fingerprint] == [2]
+    assert store.fingerprint({**content, "account": "unknown"}) is None
+
+    # identical rows share a fingerprint, the index follows appends and removes
+    position = store.append(dict(content))
+    assert store.fingerprints[fingerprint] == [2, position]
+    assert store.find(content) == 2
+    store.remove_at(2)
+    assert store.find(content) == position
+    store.remove_at(position)
+    assert fingerprint not in store.fingerprints
+    assert store.find(content) == -1
+
+
+def test_dates_normalized():
+    mixed_df = pd.DataFrame(EXAMPLE_DATA)
+    mixed_df.loc[0, "date"] = "2018/01/02"  # same day as the second row
+    mixed_store = TransactionStore.from_frame(mixed_df)
+
+    assert mixed_store.row(0)["date"] == "2018-01-02"
+    assert mixed_store.levels["date"].count("2018-01-02") == 1
+    assert mixed_store.days[0] == mixed_store.days[1]
+
+    position = mixed_store.append({**EXAMPLE_DATA[3], ID_FIELD: 99, "date": "2018/5/1"})
+    assert mixed_store.row(position)["date"] == "2018-05-01"
+    assert mixed_store.find({**mixed_store.row(position), "date": "2018/05/01"}) == (
+        position
+    )
+
+
+def test_select_and_sort_by_date(store):
+    positions = store.select(date_range=("2018/01/01", "2018-01-31"))
+    assert [store.row(position)["date"] for position in positions] == [
+        "2018-01-03",
+        "2018-01-02",
+    ]
+    assert list(store.sort_by_date(positions)) == [1, 0]
+    assert list(store.sort_by_date(positions, descending=True)) == [0, 1]
@@ -2,6 +2,7 @@
 import os
 import sys
 
+import pandas as pd
 import pytest
 
 # Get the directory containing your module
@@ -10,13 +11,25 @@ module_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # sys.path.append('../')
 sys.path.insert(0, module_directory)
 # pylint: disable=C0116, W0621
-from core.data_manager import DataManager  # pylint: disable=C0413,E0401
+from core.data_manager import EXAMPLE_DATA, DataManager  # pylint: disable=C0413,E0401
 from core.utils.validator import (  # pylint: disable=C0413,E0401
     is_used,
     validate_input,
     validate_transaction,
+    validate_transactions,
 )
 
+METADATA = {
+    "accounts": {"N26", "Wallet"},
+    "categories": {"salary", "bar"},
+    "sub_categories": {"evotec", "beer"},
+}
+# first example transaction, without id and with a date in the validated format
+VALID_ROW = {
+    **{key: value for key, value in EXAMPLE_DATA[0].items() if key != "id"},
+    "date": "2018/01/03",
+}
+
 
 @pytest.mark.parametrize(
     "item, item_list, item_type, mode, expected_exception, expected_message",
@@ -142,6 +155,30 @@ def test_is_used(item, key, my_dict_list, expected_result):
             },
             ValueError,
         ),
+        (
+            {
+                "date": "2018/01/03",
+                "type": "income",
+                "amount": "12.75",
+                "account": "N26",
+                "category": "salary",
+                "subcategory": "evotec",
+                "note": "may",
+            },
+            None,
+        ),
+        (
+            {
+                "date": "2018/01/03",
+                "type": "income",
+                "amount": "nan",
+                "account": "N26",
+                "category": "salary",
+                "subcategory": "evotec",
+                "note": "may",
+            },
+            ValueError,
+        ),
         (
             {
                 "date": "2018/01/03",
@@ -202,3 +239,49 @@ def test_validate_transaction(create_empty_folder, item, expected_exception):
             )
             is None
         )
+
+
+def test_validate_transactions():
+    data_df = pd.DataFrame(
+        [
+            VALID_ROW,
+            {**VALID_ROW, "type": "invalid_type"},
+            {**VALID_ROW, "amount": "invalid_amount"},
+            {**VALID_ROW, "amount": -1},
+            {**VALID_ROW, "account": "unknown", "date": "03.01.2018"},
+            {**VALID_ROW, "date": "03.01.2018"},
+        ]
+    )
+    invalid, messages = validate_transactions(data_df, **METADATA)
+
+    assert list(invalid) == [False, True, True, True, True, True]
+    assert list(messages) == [
+        "",
+        "Transaction Error: Unknown transaction type: invalid_type.",
+        "Transaction Error: Amount must be float or int: invalid_amount",
+        "Transaction Error: Amount must be a positive number: -1",
+        # only the first error of a row is reported
+        "Transaction Error: Unknown account:unknown.",
+        "Transaction Error: Invalid date format. Must be in %Y-%m-%d or %Y/%m/%d.",
+    ]
+
+    # the same rows fail with validate_transaction
+    for row, is_invalid in zip(data_df.to_dict("records"), invalid):
+        if is_invalid:
+            with pytest.raises(ValueError):
+                validate_transaction(row, **METADATA)
+
+
+def test_validate_transactions_columns():
+    data_df = pd.DataFrame([VALID_ROW]).drop(columns=["note"])
+    invalid, messages = validate_transactions(data_df, **METADATA)
+    assert list(invalid) == [True]
+    assert messages[0] == "Transaction Error: dict key missing or extra."
+
+
+def test_validate_transactions_large():
+    data_df = pd.DataFrame([VALID_ROW] * 1_000_000 + [{**VALID_ROW, "amount": "x"}])
+    invalid, messages = validate_transactions(data_df, **METADATA)
+    assert invalid.sum() == 1
+    assert invalid[-1]
+    assert messages[-1] == "Transaction Error: Amount must be float or int: x"